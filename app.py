@@ -1,22 +1,42 @@
-from flask import Flask, jsonify
+import os
+
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from utils.database import init_database
+from werkzeug.middleware.proxy_fix import ProxyFix
+from utils.database import init_app as init_db_app, init_database
 
 # Import routes
 from routes.auth_routes import auth_bp
 from routes.skill_routes import skill_bp
 from routes.dashboard_routes import dashboard_bp
 from routes.session_routes import session_bp
+from routes.export_routes import export_bp
+from controllers.dashboard_controller import dashboard_cache
+from utils.password_hasher import password_hasher
+from utils.rate_limit import ip_limiter, rate_limit_stats, username_limiter
+from utils.compression import init_app as init_compression
+from utils.metrics import METRICS_TOKEN, init_app as init_metrics, metrics
+from utils.slow_queries import TOP_N, slow_query_log
+
+# Import CLI commands
+from commands.stats_commands import stats_cli
+from commands.import_commands import import_sessions
+from commands.recategorize_commands import recategorize
+from commands.seed_commands import seed
+from commands.suggestion_commands import suggestions_cli
 
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
 
     # JWT settings
     app.config['JWT_SECRET_KEY'] = 'skillstack-secret-key-2024-change-in-production'
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 86400  # 24 hours
 
+    if config:
+        app.config.update(config)
+
     CORS(
     app,
     supports_credentials=True,
@@ -27,32 +47,77 @@ def create_app():
 )
     JWTManager(app)
 
-    # Initialize DB
-    init_database()
+    # behind N reverse proxies, trust X-Forwarded-For so per-IP auth
+    # throttling sees client addresses rather than the proxy's
+    proxy_count = int(os.environ.get('SKILLSTACK_PROXY_COUNT', 0))
+    if proxy_count:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_count, x_proto=proxy_count)
+
+    # Per-endpoint latency, status and SQL metrics, served at /api/metrics
+    init_metrics(app)
+    # gzip / brotli for JSON and text bodies the client accepts compressed
+    init_compression(app)
+
+    # Initialize DB (connections are pooled per app, see utils.database)
+    init_db_app(app)
+    with app.app_context():
+        init_database()
 
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(skill_bp, url_prefix='/api/skills')
     app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
     app.register_blueprint(session_bp, url_prefix='/api/sessions')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+
+    # Register CLI commands
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(import_sessions)
+    app.cli.add_command(recategorize)
+    app.cli.add_command(seed)
+    app.cli.add_command(suggestions_cli)
 
     @app.route('/api/health')
     def health_check():
         return jsonify({
             'status': 'healthy',
             'message': 'SkillStack API is running',
-            'version': '1.0.0'
+            'version': '1.0.0',
+            'cache': {'dashboard': dashboard_cache.stats()},
+            'password_hasher': password_hasher.stats(),
+            'rate_limits': rate_limit_stats()
         })
 
+    def metrics_authorized():
+        return not METRICS_TOKEN or request.headers.get('Authorization') == f'Bearer {METRICS_TOKEN}'
+
+    @app.route('/api/metrics')
+    def metrics_endpoint():
+        if not metrics_authorized():
+            return jsonify({'error': 'Unauthorized'}), 401
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    @app.route('/api/metrics/slow-queries')
+    def slow_queries_endpoint():
+        if not metrics_authorized():
+            return jsonify({'error': 'Unauthorized'}), 401
+        top = request.args.get('top', TOP_N, type=int)
+        return jsonify({**slow_query_log.stats(), 'queries': slow_query_log.report(max(top, 1))})
+
     return app
 
 
+# process-wide components, exported once however many apps are created
+metrics.add_collector('dashboard_cache', dashboard_cache.stats)
+metrics.add_collector('password_hasher', password_hasher.stats)
+metrics.add_collector('rate_limit', ip_limiter.stats, limiter='ip')
+metrics.add_collector('rate_limit', username_limiter.stats, limiter='username')
+metrics.add_collector('slow_queries', slow_query_log.stats)
 
 app = create_app()
 
 
 if __name__ == '__main__':
-    import os
     port = int(os.environ.get("PORT", 5000))
     print("🚀 Starting SkillStack Backend…")
     print(f"📊 Server running on port: {port}")
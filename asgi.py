@@ -0,0 +1,24 @@
+"""ASGI entry point for the async serving mode.
+
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port 5000
+
+The event loop owns every client connection, so slow or idle clients cost
+a coroutine each. Views still run unchanged (same routes and controllers)
+on a bounded pool of ASGI_THREADS threads, sized like the SQLite connection
+pool so a view never waits for a connection; bcrypt work goes to the
+separate password executor (utils.password_hasher).
+"""
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import app
+from utils.asgi import SlowClientBuffer
+from utils.database import POOL_SIZE
+from utils.metrics import metrics
+
+ASGI_THREADS = int(os.environ.get('SKILLSTACK_ASGI_THREADS', POOL_SIZE))
+ASGI_MAX_PENDING = int(os.environ.get('SKILLSTACK_ASGI_MAX_PENDING', ASGI_THREADS * 32))
+
+asgi_app = SlowClientBuffer(WSGIMiddleware(app, workers=ASGI_THREADS), max_pending=ASGI_MAX_PENDING)
+metrics.add_collector('asgi', asgi_app.stats)
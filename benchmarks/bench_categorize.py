@@ -0,0 +1,151 @@
+"""categorize_skill: correctness corpus and micro-benchmark.
+
+    python -m benchmarks.bench_categorize [iterations]
+
+Checks the compiled matcher against a corpus of expected categories (exit 1
+on any mismatch; benchmarks/test_categorize.py asserts the same corpus
+under pytest), then times it against the previous per-call substring
+implementation, and ``flask recategorize`` over a seeded table.
+"""
+import sys
+import time
+
+from benchmarks.common import make_app, register
+from utils.helpers import categorize_skill, categorize_skills
+
+# (name, description, expected category)
+CORPUS = [
+    # category priority is unchanged: the first listed category wins
+    ('React Native', '', 'Web Development'),
+    ('Python for Web', 'Django and Flask', 'Web Development'),
+    ('Machine Learning', 'with Python', 'Data Science'),
+    ('Flutter', 'cross-platform mobile apps', 'Mobile Development'),
+    ('Kubernetes', 'container orchestration on AWS', 'Cloud Computing'),
+    ('Java', 'object oriented programming', 'Programming'),
+    ('Figma', 'prototyping', 'Design'),
+    ('Digital Marketing', '', 'Business'),
+    ('Spanish', 'conversation practice', 'Language'),
+    ('Cooking', 'italian recipes', 'Other'),
+    ('', '', 'Other'),
+    # whole words only: no more accidental substring hits
+    ('Email Etiquette', '', 'Other'),
+    ('Build Automation', 'gradle and maven', 'Other'),
+    ('Guitar', 'fingerstyle', 'Other'),
+    ('Painting', 'acrylics', 'Other'),
+    ('Sustainability', '', 'Other'),
+    ('Jazz Piano', 'chords and voicings', 'Other'),
+    ('Swiftly Reading', '', 'Other'),
+    ('Webinar Hosting', '', 'Other'),
+    ('Clouds and Weather', '', 'Cloud Computing'),
+    # the real keywords still match, including plurals and punctuation
+    ('AI Fundamentals', '', 'Data Science'),
+    ('UI Patterns', '', 'Design'),
+    ('Algorithms', 'and data structures', 'Programming'),
+    ('C++', 'templates', 'Programming'),
+    ('C#', '.NET basics', 'Programming'),
+    ('Node.js', 'REST APIs', 'Web Development'),
+    ('NodeJS', '', 'Web Development'),
+    ('ReactJS', 'hooks', 'Web Development'),
+    ('JavaScript', '', 'Web Development'),
+    ('iOS', 'SwiftUI', 'Mobile Development'),
+    ('Google Cloud', 'certification', 'Cloud Computing'),
+    ('Docker', '', 'Cloud Computing'),
+    ('Statistics', 'for beginners', 'Data Science'),
+    ('Business English', '', 'Business'),
+    ('Public Speaking', 'communication skills', 'Language'),
+    ('Photoshop', 'retouching', 'Design'),
+    ('Personal Finance', '', 'Business'),
+    ('Competitive Coding', '', 'Programming'),
+    ('Artificial Intelligence', 'search and planning', 'Data Science'),
+    ('Kotlin', '', 'Mobile Development'),
+    ('Angular', 'RxJS', 'Web Development'),
+    ('Frontend', 'HTML/CSS', 'Web Development'),
+    # version suffixes belong to the keyword
+    ('HTML5 and CSS3', '', 'Web Development'),
+    ('Python3 basics', '', 'Data Science'),
+    ('Vue3', '', 'Web Development'),
+    ('Web3 development', '', 'Web Development'),
+    ('C++17', '', 'Programming'),
+    ('Swift5', '', 'Mobile Development'),
+    ('Kotlin1.9', 'coroutines', 'Mobile Development'),
+    ('Angular2', '', 'Web Development'),
+]
+
+
+def legacy_categorize(skill_name, description=""):
+    """The substring implementation categorize_skill replaced, for timing"""
+    text = f"{skill_name} {description}".lower()
+    categories = {
+        'Web Development': ['react', 'javascript', 'html', 'css', 'node', 'vue', 'angular', 'frontend', 'backend', 'web'],
+        'Data Science': ['python', 'machine learning', 'data analysis', 'pandas', 'numpy', 'statistics', 'ai', 'artificial intelligence'],
+        'Mobile Development': ['android', 'ios', 'flutter', 'react native', 'mobile', 'swift', 'kotlin'],
+        'Cloud Computing': ['aws', 'azure', 'google cloud', 'docker', 'kubernetes', 'cloud'],
+        'Programming': ['java', 'c++', 'c#', 'programming', 'algorithm', 'data structure', 'coding'],
+        'Design': ['ui', 'ux', 'figma', 'adobe', 'design', 'photoshop'],
+        'Business': ['marketing', 'management', 'finance', 'business', 'entrepreneurship'],
+        'Language': ['english', 'spanish', 'language', 'communication']
+    }
+    for category, keywords in categories.items():
+        for keyword in keywords:
+            if keyword in text:
+                return category
+    return "Other"
+
+
+def check_corpus():
+    failures = 0
+    for (name, description, expected), got in zip(CORPUS, categorize_skills((n, d) for n, d, _ in CORPUS)):
+        if got != expected:
+            failures += 1
+            print(f'  MISMATCH {name!r} / {description!r}: expected {expected}, got {got}')
+    print(f'corpus: {len(CORPUS) - failures}/{len(CORPUS)} correct')
+    return failures == 0
+
+
+def time_per_call(fn, items, iterations):
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        for name, description in items:
+            fn(name, description)
+    return (time.perf_counter() - t0) / (iterations * len(items)) * 1e6
+
+
+def main(iterations=2000):
+    ok = check_corpus()
+
+    items = [(name, description) for name, description, _ in CORPUS]
+    long_items = [(name, description + ' ' + 'lorem ipsum dolor sit amet ' * 20) for name, description in items]
+    for label, corpus in (('short text', items), ('long description', long_items)):
+        legacy = time_per_call(legacy_categorize, corpus, iterations)
+        compiled = time_per_call(categorize_skill, corpus, iterations)
+        print(f'{label:<18} legacy {legacy:6.2f} us/call   compiled {compiled:6.2f} us/call')
+
+    app = make_app('categorize')
+    client = app.test_client()
+    _, headers = register(client)
+    with app.app_context():
+        from utils.database import get_db_connection
+        conn = get_db_connection()
+        user_id = conn.execute("SELECT id FROM users WHERE username = 'bench'").fetchone()[0]
+        conn.executemany(
+            'INSERT INTO skills (user_id, name, resource_type, platform, category, description) '
+            "VALUES (?, ?, 'course', 'Udemy', ?, ?)",
+            [(user_id, name, legacy_categorize(name, description), description)
+             for n in range(50000 // len(items) + 1) for name, description in items][:50000]
+        )
+        conn.commit()
+        conn.close()
+
+    runner = app.test_cli_runner()
+    t0 = time.perf_counter()
+    result = runner.invoke(args=['recategorize'])
+    print(f'flask recategorize, 50000 skills: {time.perf_counter() - t0:.2f}s -> {result.output.strip()}')
+    result = runner.invoke(args=['recategorize', '--dry-run'])
+    print(f'second run: {result.output.strip()}')
+    ok = ok and 'change the category of 0' in result.output
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
@@ -0,0 +1,137 @@
+"""Cold start: from process launch to the first served request.
+
+    python -m benchmarks.bench_cold_start [runs]
+
+Each run is a new interpreter importing ``app`` (which builds the app and
+checks the schema) and serving ``GET /api/health``, timed from launch to
+response, on:
+
+  fresh     an empty database, so every migration runs
+  current   a database already at SCHEMA_VERSION, i.e. every restart
+  4 x fresh four processes booting on one empty database at once
+  gunicorn  ``gunicorn app:app`` with gunicorn.conf.py, until /api/health answers
+
+Also checks that a boot on a current schema runs no DDL and takes no write
+lock, and that concurrent boots apply each migration exactly once (exit 1
+if not).
+"""
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from utils.migrations import SCHEMA_VERSION
+
+CHILD = '''
+import json, time
+t0 = time.perf_counter()
+from utils import database
+statements = []
+connect = database.ConnectionPool._connect
+def traced_connect(pool):
+    conn = connect(pool)
+    conn.set_trace_callback(statements.append)
+    return conn
+database.ConnectionPool._connect = traced_connect
+import app
+t1 = time.perf_counter()
+app.app.test_client().get('/api/health')
+t2 = time.perf_counter()
+print(json.dumps({'import_ms': (t1 - t0) * 1000, 'request_ms': (t2 - t1) * 1000, 'statements': statements}))
+'''
+
+
+def boot(db_path, count=1):
+    """Launch ``count`` children at once; return (wall ms, child report) for each"""
+    env = dict(os.environ, SKILLSTACK_DB_PATH=db_path)
+    started = time.perf_counter()
+    procs = [subprocess.Popen([sys.executable, '-c', CHILD], env=env, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True) for _ in range(count)]
+    results = []
+    for proc in procs:
+        out, _ = proc.communicate(timeout=60)
+        if proc.returncode:
+            raise RuntimeError(f'boot failed with exit code {proc.returncode}')
+        results.append(((time.perf_counter() - started) * 1000, json.loads(out.splitlines()[-1])))
+    return results
+
+
+def gunicorn_boot(db_path):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    env = dict(os.environ, SKILLSTACK_DB_PATH=db_path, PORT=str(port), WEB_CONCURRENCY='2')
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app:app'], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < 30:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1)
+                return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError('gunicorn did not start')
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            # a worker still booting has not installed its own TERM handler
+            # yet; don't sit out graceful_timeout for it
+            proc.kill()
+            proc.wait()
+
+
+def writes(statements):
+    """Statements other than connection setup and version reads"""
+    return [s for s in statements if not s.startswith('PRAGMA') or s.startswith('PRAGMA user_version =')]
+
+
+def main(runs=5):
+    tmp = tempfile.mkdtemp(prefix='skillstack-cold-')
+    ok = True
+    rows = {'fresh': [], 'current': [], '4 x fresh': [], 'gunicorn': []}
+    current_writes = []
+
+    for n in range(runs):
+        fresh = os.path.join(tmp, f'fresh{n}.db')
+        rows['fresh'].append(boot(fresh)[0])
+        wall, report = boot(fresh)[0]
+        rows['current'].append((wall, report))
+        current_writes.extend(writes(report['statements']))
+
+        together = boot(os.path.join(tmp, f'together{n}.db'), count=4)
+        rows['4 x fresh'].append(max(together, key=lambda r: r[0]))
+        bumps = sorted(s for _, r in together for s in r['statements'] if s.startswith('PRAGMA user_version ='))
+        if bumps != [f'PRAGMA user_version = {v}' for v in range(1, SCHEMA_VERSION + 1)]:
+            print(f'FAIL: concurrent boots applied {bumps}')
+            ok = False
+
+        rows['gunicorn'].append((gunicorn_boot(os.path.join(tmp, f'gunicorn{n}.db')), None))
+
+    print(f'{"database":<10} {"launch->served":>15} {"import+init":>12} {"1st request":>12}   (median of {runs}, ms)')
+    for label, results in rows.items():
+        wall = statistics.median(r[0] for r in results)
+        reports = [r[1] for r in results if r[1]]
+        if reports:
+            init = statistics.median(r['import_ms'] for r in reports)
+            first = statistics.median(r['request_ms'] for r in reports)
+            print(f'{label:<10} {wall:15.1f} {init:12.1f} {first:12.1f}')
+        else:
+            print(f'{label:<10} {wall:15.1f} {"-":>12} {"-":>12}')
+
+    print(f'statements on a current schema besides PRAGMA reads: {len(current_writes)}')
+    if current_writes:
+        print('FAIL: boot on a current schema ran', sorted(set(current_writes)))
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
@@ -0,0 +1,144 @@
+"""Response compression (utils.compression): sizes, cost and correctness.
+
+    python -m benchmarks.bench_compression [skills] [subtopics] [iterations]
+
+Builds a power user with ``skills`` skills carrying long descriptions and
+course notes, one of them with ``subtopics`` noted subtopics, and some
+sessions. For the dashboard, the skill detail, a session page and the
+export it reports the body size and latency uncompressed, gzip and brotli,
+then the size and compression time of the dashboard body at several
+levels. Exits 1 unless every compressed body decodes to the uncompressed
+one, the ETag carries the coding and revalidates to a 304, small bodies are
+left alone, large and streamed bodies are sent chunked, and /api/metrics
+reports the bytes.
+"""
+import gzip
+import io
+import json
+import random
+import sys
+import time
+
+from benchmarks.common import create_skill, make_app, measure, register
+from utils import compression
+from utils.database import get_db_connection
+
+WORDS = ('component state render hook effect query index cache module deploy pipeline container schema '
+         'migration endpoint token session review practice project chapter exercise notes async await '
+         'closure generator decorator fixture mock coverage lint refactor branch merge rebase commit '
+         'layout grid flexbox selector animation bundle router reducer store context memo suspense '
+         'vector matrix tensor gradient loss epoch batch dataset feature label model training accuracy '
+         'I you we it the a an of to in on for with and but or not was is are had have do did this that '
+         'understood confusing revisit tricky finally clicked again tomorrow example video lecture').split()
+
+
+def text(n, seed):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) for _ in range(n)).capitalize() + '.'
+
+
+def decode(response):
+    coding = response.headers.get('Content-Encoding')
+    if coding == 'gzip':
+        return gzip.decompress(response.data)
+    if coding == 'br':
+        return compression.brotli.decompress(response.data)
+    return response.data
+
+
+def fill(app, client, headers, skills, subtopics):
+    skill_ids = [create_skill(client, headers, name=f'Skill {i}', user_subtopics=3) for i in range(skills)]
+    big = create_skill(client, headers, name='Deep Dive', user_subtopics=subtopics)
+    with app.app_context():
+        conn = get_db_connection()
+        conn.executemany('UPDATE skills SET description = ?, course_notes = ? WHERE id = ?',
+                         [(text(60, i), text(150, i + 1), skill_id) for i, skill_id in enumerate(skill_ids)])
+        conn.execute('UPDATE subtopics SET notes = ?, description = ? WHERE skill_id = ?',
+                     (text(80, 3), text(30, 4), big))
+        conn.commit()
+    body = '\n'.join(json.dumps({'skill_id': skill_ids[n % skills], 'duration_minutes': 25,
+                                 'notes': text(12, n), 'session_date': f'2024-{n % 12 + 1:02d}-{n % 28 + 1:02d}'})
+                     for n in range(skills * 5))
+    client.post('/api/sessions/import', headers=headers, data=io.BytesIO(body.encode()),
+                content_type='application/x-ndjson')
+    return big
+
+
+def main(skills=300, subtopics=300, iterations=50):
+    app = make_app('compression')
+    client = app.test_client()
+    _, headers = register(client)
+    big = fill(app, client, headers, skills, subtopics)
+    codings = [None, 'gzip'] + (['br'] if compression.brotli else [])
+    ok = True
+
+    paths = (('GET /api/dashboard', '/api/dashboard'), ('GET /api/skills/<id>', f'/api/skills/{big}'),
+             ('GET /api/sessions?limit=100', '/api/sessions?limit=100'), ('GET /api/export', '/api/export'))
+    print(f'{"":30} {"coding":>8} {"bytes":>10} {"ratio":>6} {"p50 ms":>8}')
+    for label, path in paths:
+        identity = client.get(path, headers=headers).data
+        for coding in codings:
+            request_headers = {**headers, 'Accept-Encoding': coding or 'identity'}
+            res = client.get(path, headers=request_headers)
+            stats = measure(lambda: client.get(path, headers=request_headers).data, iterations)
+            print(f'{label:<30} {coding or "-":>8} {len(res.data):>10} '
+                  f'{len(res.data) / len(identity):6.3f} {stats["p50"]:8.2f}')
+            if decode(res) != identity or res.headers.get('Content-Encoding') != coding:
+                print(f'FAIL: {label} with {coding} does not decode to the uncompressed body')
+                ok = False
+            if coding and 'Accept-Encoding' not in res.vary:
+                print(f'FAIL: {label} with {coding} has no Vary: Accept-Encoding')
+                ok = False
+            if coding and path == '/api/export' and 'Content-Length' in res.headers:
+                print('FAIL: the export was buffered, not streamed')
+                ok = False
+
+    dashboard = client.get('/api/dashboard', headers=headers).data
+    print(f'\ndashboard body, {len(dashboard)} bytes')
+    levels = [('gzip', 'GZIP_LEVEL', level) for level in (1, 4, 6, 9)]
+    if compression.brotli:
+        levels += [('br', 'BROTLI_QUALITY', quality) for quality in (1, 2, 4, 6)]
+    for coding, setting, level in levels:
+        saved = getattr(compression, setting)
+        setattr(compression, setting, level)
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            out = compression.compress(dashboard, coding)
+        elapsed = (time.perf_counter() - t0) * 1000 / iterations
+        setattr(compression, setting, saved)
+        print(f'  {coding:>4} level {level:<3} {len(out):>9} bytes  ratio {len(out) / len(dashboard):.3f}  '
+              f'{elapsed:7.2f} ms')
+
+    for coding in codings[1:]:
+        res = client.get('/api/dashboard', headers={**headers, 'Accept-Encoding': coding})
+        etag = res.get_etag()[0]
+        revalidated = client.get('/api/dashboard', headers={
+            **headers, 'Accept-Encoding': coding, 'If-None-Match': f'"{etag}"'})
+        if not etag.endswith(f'-{coding}') or revalidated.status_code != 304 \
+                or revalidated.get_etag()[0] != etag:
+            print(f'FAIL: ETag {etag!r} with {coding} revalidated as {revalidated.status_code}')
+            ok = False
+
+    small = client.get('/api/health', headers={'Accept-Encoding': 'gzip, br'})
+    if len(small.data) < compression.COMPRESS_MIN_BYTES and small.headers.get('Content-Encoding'):
+        print('FAIL: a body under the threshold was compressed')
+        ok = False
+
+    saved = compression.COMPRESS_STREAM_BYTES
+    compression.COMPRESS_STREAM_BYTES = 4096
+    res = client.get(f'/api/skills/{big}', headers={**headers, 'Accept-Encoding': 'gzip'})
+    compression.COMPRESS_STREAM_BYTES = saved
+    if 'Content-Length' in res.headers or gzip.decompress(res.data) != \
+            client.get(f'/api/skills/{big}', headers=headers).data:
+        print('FAIL: a body over COMPRESS_STREAM_BYTES was not streamed intact')
+        ok = False
+
+    scrape = client.get('/api/metrics').get_data(as_text=True)
+    if 'skillstack_compression_output_bytes_total{endpoint="dashboard.get_dashboard",encoding="gzip"}' not in scrape:
+        print('FAIL: /api/metrics has no compressed bytes for the dashboard')
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
@@ -0,0 +1,50 @@
+"""Conditional GET: full responses vs. 304 re-polls, and invalidation.
+
+    python -m benchmarks.bench_conditional_get [skills] [iterations]
+
+Re-polls with a current ``If-None-Match`` must answer 304 with a single SQL
+statement (the user_versions lookup), and any write must change the tag.
+Fails (exit 1) otherwise.
+"""
+import sys
+
+from benchmarks.check_query_plans import capture_statements
+from benchmarks.common import create_skill, make_app, measure, print_row, register
+
+statements = capture_statements()
+
+
+def main(skills=100, iterations=200):
+    app = make_app('conditional_get')
+    client = app.test_client()
+    _, headers = register(client)
+    skill_ids = [create_skill(client, headers, name=f'Skill {i}') for i in range(skills)]
+
+    ok = True
+    for url in ('/api/dashboard', '/api/skills', f'/api/skills/{skill_ids[0]}'):
+        etag = client.get(url, headers=headers).headers['ETag']
+        conditional = dict(headers, **{'If-None-Match': etag})
+
+        print_row(f'GET {url} full', measure(lambda: client.get(url, headers=headers).get_data(), iterations))
+        print_row(f'GET {url} 304', measure(lambda: client.get(url, headers=conditional).get_data(), iterations))
+
+        del statements[:]
+        res = client.get(url, headers=conditional)
+        queries = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+        print(f'  304: status={res.status_code} body={len(res.get_data())}B queries={len(queries)}')
+        ok = ok and res.status_code == 304 and len(queries) == 1
+
+    etag = client.get('/api/dashboard', headers=headers).headers['ETag']
+    client.post('/api/sessions', headers=headers, json={'skill_id': skill_ids[0], 'duration_minutes': 25})
+    res = client.get('/api/dashboard', headers=dict(headers, **{'If-None-Match': etag}))
+    print(f'after a write: status={res.status_code} etag {etag} -> {res.headers["ETag"]}')
+    ok = ok and res.status_code == 200 and res.headers['ETag'] != etag
+
+    if not ok:
+        print('FAIL: conditional GET did not short-circuit or was not invalidated')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
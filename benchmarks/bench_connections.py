@@ -0,0 +1,108 @@
+"""Requests/sec with pooled connections vs. the old connect-per-call helper.
+
+    python -m benchmarks.bench_connections [iterations] [threads]
+
+"before" swaps every module's ``get_db_connection`` for the original
+``sqlite3.connect('...')``-per-call implementation; "after" uses the pool
+from ``utils.database``. Both drive the real blueprints through the Flask
+test client, sequentially and from several threads at once.
+"""
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from benchmarks.common import create_skill, make_app, measure, print_row, register, summarize
+from utils import database
+
+
+def legacy_get_db_connection():
+    conn = sqlite3.connect(database.get_db_path())
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+@contextmanager
+def legacy_connections():
+    pooled = database.get_db_connection
+    patched = [
+        mod for mod in list(sys.modules.values())
+        if getattr(mod, 'get_db_connection', None) is pooled
+    ]
+    for mod in patched:
+        mod.get_db_connection = legacy_get_db_connection
+    try:
+        yield
+    finally:
+        for mod in patched:
+            mod.get_db_connection = pooled
+
+
+def workload(app, headers, skill_id, subtopic_id):
+    client = app.test_client()
+    errors = []
+
+    def one_request():
+        res = client.post('/api/sessions', headers=headers, json={
+            'skill_id': skill_id,
+            'subtopic_id': subtopic_id,
+            'duration_minutes': 5
+        })
+        if res.status_code >= 500:
+            errors.append(res.status_code)
+        res = client.get('/api/dashboard', headers=headers)
+        if res.status_code >= 500:
+            errors.append(res.status_code)
+
+    return one_request, errors
+
+
+def run_threads(app, headers, skill_id, subtopic_id, iterations, threads):
+    samples, errors = [], []
+    lock = threading.Lock()
+
+    def worker():
+        fn, errs = workload(app, headers, skill_id, subtopic_id)
+        local = []
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            fn()
+            local.append((time.perf_counter() - t0) * 1000)
+        with lock:
+            samples.extend(local)
+            errors.extend(errs)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return summarize(samples, time.perf_counter() - started), errors
+
+
+def main(iterations=300, threads=8):
+    app = make_app('connections')
+    client = app.test_client()
+    _, headers = register(client)
+    skill_id = create_skill(client, headers)
+    subtopic_id = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()['subtopics'][0]['id']
+
+    for label, ctx in (('before (connect per call)', legacy_connections), ('after (pooled)', _noop)):
+        with ctx():
+            fn, errors = workload(app, headers, skill_id, subtopic_id)
+            print_row(f'{label} sequential', measure(fn, iterations))
+            stats, errors = run_threads(app, headers, skill_id, subtopic_id, iterations // threads, threads)
+            print_row(f'{label} {threads} threads', stats)
+            print(f'{"":<42} 5xx responses: {len(errors)}')
+
+
+@contextmanager
+def _noop():
+    yield
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
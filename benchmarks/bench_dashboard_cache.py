@@ -0,0 +1,37 @@
+"""Dashboard latency on cache hits vs. misses, and invalidation on writes.
+
+    python -m benchmarks.bench_dashboard_cache [skills] [iterations]
+"""
+import sys
+
+from benchmarks.common import create_skill, make_app, measure, print_row, register
+from controllers.dashboard_controller import dashboard_cache
+
+
+def main(skills=100, iterations=200):
+    app = make_app('dashboard_cache')
+    client = app.test_client()
+    _, headers = register(client)
+    skill_ids = [create_skill(client, headers, name=f'Skill {i}') for i in range(skills)]
+
+    def get_dashboard():
+        return client.get('/api/dashboard', headers=headers).get_json()
+
+    def uncached():
+        dashboard_cache.clear()
+        get_dashboard()
+
+    print_row(f'dashboard miss ({skills} skills)', measure(uncached, iterations))
+    dashboard_cache.clear()
+    get_dashboard()
+    print_row(f'dashboard hit ({skills} skills)', measure(get_dashboard, iterations))
+
+    before = get_dashboard()['stats']['total_learning_minutes']
+    client.post('/api/sessions', headers=headers, json={'skill_id': skill_ids[0], 'duration_minutes': 25})
+    after = get_dashboard()['stats']['total_learning_minutes']
+    assert after == before + 25, 'write did not invalidate the cached dashboard'
+    print('cache stats:', dashboard_cache.stats())
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
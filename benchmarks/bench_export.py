@@ -0,0 +1,59 @@
+"""Streaming export: throughput and peak Python memory vs. history size.
+
+    python -m benchmarks.bench_export [sessions ...]
+
+Peak memory (tracemalloc) should stay roughly flat as the number of
+exported sessions grows.
+"""
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import create_skill, make_app, register
+
+
+def seed(client, headers, sessions):
+    skill_ids = [create_skill(client, headers, name=f'Skill {i}') for i in range(20)]
+    body = '\n'.join(
+        json.dumps({'skill_id': skill_ids[n % 20], 'duration_minutes': 30,
+                    'session_date': f'2022-{n % 12 + 1:02d}-{n % 28 + 1:02d}T08:00:00'})
+        for n in range(sessions)
+    ).encode()
+    client.post('/api/sessions/import', headers=headers, data=io.BytesIO(body),
+                content_type='application/x-ndjson')
+
+
+def main(*scales):
+    for sessions in scales or (10000, 100000):
+        app = make_app(f'export_{sessions}')
+        client = app.test_client()
+        _, headers = register(client)
+        seed(client, headers, sessions)
+
+        for fmt in ('ndjson', 'csv'):
+            # timed without tracemalloc (it slows allocation-heavy code a lot)
+            t0 = time.perf_counter()
+            size, lines = drain(client.get(f'/api/export?format={fmt}', headers=headers, buffered=False))
+            elapsed = time.perf_counter() - t0
+
+            tracemalloc.start()
+            drain(client.get(f'/api/export?format={fmt}', headers=headers, buffered=False))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f'{sessions:>8} sessions {fmt:<6} {lines:>8} lines {size / 1e6:7.1f} MB '
+                  f'in {elapsed:5.2f}s  peak {peak / 1e6:6.2f} MB')
+
+
+def drain(res):
+    size = lines = 0
+    for chunk in res.response:
+        chunk = chunk.encode() if isinstance(chunk, str) else chunk
+        size += len(chunk)
+        lines += chunk.count(b'\n')
+    res.close()
+    return size, lines
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,61 @@
+"""Throughput of the streaming session import, checked against the rollups.
+
+    python -m benchmarks.bench_import [rows] [skills]
+"""
+import io
+import json
+import random
+import sys
+import time
+
+from benchmarks.common import create_skill, make_app, register
+from models.skill_stats import SkillStats
+from utils.database import get_db_connection
+
+
+def main(rows=20000, skills=20):
+    app = make_app('import')
+    client = app.test_client()
+    _, headers = register(client)
+    targets = []
+    for i in range(skills):
+        skill_id = create_skill(client, headers, name=f'Skill {i}')
+        subtopics = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()['subtopics']
+        targets.append((skill_id, [st['id'] for st in subtopics]))
+
+    rng = random.Random(7)
+    lines = []
+    for n in range(rows):
+        skill_id, subtopic_ids = rng.choice(targets)
+        lines.append(json.dumps({
+            'skill_id': skill_id,
+            'subtopic_id': rng.choice(subtopic_ids),
+            'duration_minutes': rng.randint(5, 90),
+            'session_date': f'2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T19:00:00'
+        }))
+    lines.append('{"skill_id": 999999, "duration_minutes": 10}')
+    lines.append('not json')
+    body = ('\n'.join(lines) + '\n').encode()
+
+    t0 = time.perf_counter()
+    res = client.post('/api/sessions/import?format=ndjson', headers=headers,
+                      data=io.BytesIO(body), content_type='application/x-ndjson')
+    elapsed = time.perf_counter() - t0
+    result = res.get_json()
+    print(f"imported={result['imported']} failed={result['failed']} errors={result['errors']}")
+    print(f'{rows} rows in {elapsed:.2f}s end to end ({rows / elapsed:,.0f} rows/s), '
+          f"reported {result['rows_per_second']:,.0f} rows/s")
+
+    with app.app_context():
+        conn = get_db_connection()
+        drift = SkillStats.verify(conn.cursor())
+        hours = conn.execute('SELECT SUM(hours_spent) FROM subtopics').fetchone()[0]
+        minutes = conn.execute('SELECT SUM(duration_minutes) FROM learning_sessions').fetchone()[0]
+        days = conn.execute('SELECT SUM(minutes) FROM daily_activity').fetchone()[0]
+    assert not drift, drift
+    assert abs(hours - minutes / 60) < 1e-6 and days == minutes
+    print('rollups consistent')
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,91 @@
+"""Login storm: login throughput vs. latency of everything else.
+
+    python -m benchmarks.bench_login_storm [storm_threads] [seconds] [rounds]
+
+``storm_threads`` clients log in as fast as they can while one client polls
+``GET /api/skills``. Runs once with an effectively unbounded password
+executor (as many hash threads as clients, like hashing inline) and once
+with the default bounded one, and reports login throughput, 503s and the
+other endpoint's latency. Also checks that a login re-hashes a password
+stored with an outdated work factor (exit 1 if not).
+"""
+import sys
+import threading
+import time
+
+from benchmarks.common import create_skill, make_app, print_row, register, summarize
+from controllers import auth_controller
+from models.user import User
+from utils import helpers, rate_limit
+from utils.password_hasher import HASH_QUEUE_DEPTH, HASH_WORKERS, PasswordHasher
+
+BACKOFF = 0.1
+
+
+def storm(app, headers, threads, seconds):
+    stop = time.perf_counter() + seconds
+    counts = {'ok': 0, 'busy': 0}
+    logins = []
+    lock = threading.Lock()
+
+    def login():
+        c = app.test_client()
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            code = c.post('/api/auth/login', json={'username': 'bench', 'password': 'secret123'}).status_code
+            with lock:
+                logins.append((time.perf_counter() - t0) * 1000)
+                counts['ok' if code == 200 else 'busy'] += 1
+            if code == 503:
+                time.sleep(BACKOFF)  # a well-behaved client honours Retry-After
+
+    samples = []
+
+    def poll():
+        c = app.test_client()
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            c.get('/api/skills', headers=headers)
+            samples.append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.005)
+
+    pool = [threading.Thread(target=login) for _ in range(threads)] + [threading.Thread(target=poll)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return counts, summarize(logins, seconds), summarize(samples, seconds)
+
+
+def main(threads=16, seconds=5, rounds=10):
+    helpers.BCRYPT_ROUNDS = rounds
+    # measure the password executor on its own, not the per-client throttle
+    rate_limit.ip_limiter = rate_limit.TokenBucketLimiter('ip', 0)
+    rate_limit.username_limiter = rate_limit.TokenBucketLimiter('username', 0)
+    app = make_app('login_storm')
+    client = app.test_client()
+    _, headers = register(client)
+    create_skill(client, headers)
+
+    for label, hasher in (
+        (f'unbounded ({threads} hash threads)', PasswordHasher(workers=threads, queue_depth=threads)),
+        (f'bounded ({HASH_WORKERS} threads, queue {HASH_QUEUE_DEPTH})', PasswordHasher()),
+    ):
+        auth_controller.password_hasher = hasher
+        counts, login_stats, poll_stats = storm(app, headers, threads, seconds)
+        print(f'{label}: logins ok={counts["ok"]} ({counts["ok"] / seconds:.1f}/s) 503={counts["busy"]}')
+        print_row('  POST /api/auth/login (any status)', login_stats)
+        print_row('  GET /api/skills during storm', poll_stats)
+
+    # a login after the work factor changes must upgrade the stored hash
+    helpers.BCRYPT_ROUNDS = rounds + 1
+    client.post('/api/auth/login', json={'username': 'bench', 'password': 'secret123'})
+    with app.app_context():
+        stored = User.find_by_username('bench').password_hash
+    upgraded = not helpers.password_needs_rehash(stored)
+    print(f'rehash on login: {stored[:7]} {"ok" if upgraded else "FAIL"}')
+    return 0 if upgraded else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
@@ -0,0 +1,91 @@
+"""Cost and accuracy of the request/SQL instrumentation behind /api/metrics.
+
+    python -m benchmarks.bench_metrics [iterations]
+
+Times requests with the metrics hooks installed and removed, and one
+statement through the timed pooled connection vs. plain sqlite3. Then
+checks, per endpoint, that the statements /api/metrics reports match what
+SQLite's own trace callback saw (exit 1 if not).
+"""
+import re
+import sqlite3
+import sys
+
+from benchmarks.check_query_plans import capture_statements
+from benchmarks.common import create_skill, make_app, measure, print_row, register
+from utils import metrics as metrics_module
+from utils.database import get_db_connection
+
+HOOKS = (
+    ('before_request_funcs', metrics_module._before_request),
+    ('after_request_funcs', metrics_module._after_request),
+    ('teardown_request_funcs', metrics_module._teardown_request),
+)
+
+
+def set_hooks(app, enabled):
+    for registry, hook in HOOKS:
+        funcs = getattr(app, registry).setdefault(None, [])
+        if enabled and hook not in funcs:
+            funcs.insert(0, hook)
+        elif not enabled and hook in funcs:
+            funcs.remove(hook)
+
+
+def reported_statements(client, endpoint, method):
+    text = client.get('/api/metrics').get_data(as_text=True)
+    match = re.search(
+        rf'skillstack_request_sql_statements_sum{{endpoint="{re.escape(endpoint)}",method="{method}"}} (\S+)', text
+    )
+    return float(match.group(1)) if match else 0.0
+
+
+def main(iterations=2000):
+    traced = capture_statements()
+    app = make_app('metrics')
+    client = app.test_client()
+    _, headers = register(client)
+    skill_id = create_skill(client, headers)
+    subtopic_id = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()['subtopics'][0]['id']
+
+    for label, path in (('GET /api/skills/<id>', f'/api/skills/{skill_id}'), ('GET /api/health', '/api/health')):
+        for enabled in (False, True):
+            set_hooks(app, enabled)
+            print_row(f'{label}, metrics {"on" if enabled else "off"}',
+                      measure(lambda: client.get(path, headers=headers), iterations))
+
+    with app.app_context():
+        conn = get_db_connection()
+        print_row('SELECT 1, plain sqlite3',
+                  measure(lambda: sqlite3.Connection.execute(conn, 'SELECT 1').fetchone(), iterations * 10))
+        print_row('SELECT 1, timed pooled connection',
+                  measure(lambda: conn.execute('SELECT 1').fetchone(), iterations * 10))
+
+    ok = True
+    requests = (
+        ('skills.get_skill_detail', 'GET', lambda: client.get(f'/api/skills/{skill_id}', headers=headers)),
+        ('skills.get_skills', 'GET', lambda: client.get('/api/skills', headers=headers)),
+        ('dashboard.get_dashboard', 'GET', lambda: client.get('/api/dashboard', headers=headers)),
+        ('sessions.add_session', 'POST', lambda: client.post('/api/sessions', headers=headers, json={
+            'skill_id': skill_id, 'subtopic_id': subtopic_id, 'duration_minutes': 5
+        })),
+    )
+    print(f'{"endpoint":<28} {"traced":>6} {"reported":>8}')
+    for endpoint, method, send in requests:
+        before = reported_statements(client, endpoint, method)
+        del traced[:]
+        status = send().status_code
+        # the sqlite3 module's implicit BEGINs are not calls the app made
+        seen = len([s for s in traced if s.strip() != 'BEGIN'])
+        reported = reported_statements(client, endpoint, method) - before
+        print(f'{endpoint:<28} {seen:>6} {reported:>8.0f}   (status {status})')
+        ok = ok and seen == reported and status < 400
+
+    if not ok:
+        print('FAIL: /api/metrics statement counts differ from the SQLite trace')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
@@ -0,0 +1,107 @@
+"""Row-to-response mapping cost of the model read paths.
+
+    python -m benchmarks.bench_models [skills] [subtopics] [iterations]
+
+Builds one user with ``skills`` skills and one skill with ``subtopics``
+subtopics (written straight to the tables), then for each read path reports
+latency and the peak memory allocated while it runs (tracemalloc), plus the
+size of one model instance and the latency of the endpoints behind them.
+Exits 1 if a read path stops returning what the endpoints serve.
+"""
+import sys
+import tracemalloc
+
+from benchmarks.common import create_skill, make_app, measure, print_row, register
+from models.skill import Skill
+from models.skill_stats import SkillStats
+from models.subtopic import Subtopic
+from models.user import User
+from utils.database import get_db_connection
+
+
+def fill(user_id, skill_id, skills, subtopics):
+    conn = get_db_connection()
+    conn.executemany(
+        "INSERT INTO skills (user_id, name, resource_type, platform, target_hours, category, description) "
+        "VALUES (?, ?, 'course', 'Udemy', 10, 'Web Development', 'benchmark skill')",
+        [(user_id, f'Skill {i}') for i in range(skills - 1)]
+    )
+    conn.executemany(
+        "INSERT INTO subtopics (skill_id, title, description, status, hours_spent, order_index, expected_hours) "
+        "VALUES (?, ?, 'about this topic', ?, ?, ?, 0.5)",
+        [(skill_id, f'Topic {i}', ('to-learn', 'in-progress', 'completed')[i % 3], i % 7 / 3, i)
+         for i in range(subtopics)]
+    )
+    SkillStats.rebuild(conn.cursor())
+    conn.commit()
+
+
+def allocated_kib(fn):
+    """(KiB still held by fn's result, peak KiB while it ran)"""
+    tracemalloc.start()
+    try:
+        result = fn()  # noqa: F841 -- held so it counts as retained
+        current, peak = tracemalloc.get_traced_memory()
+        return current / 1024, peak / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def instance_bytes(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main(skills=2000, subtopics=2000, iterations=100):
+    app = make_app('models')
+    client = app.test_client()
+    user_id, headers = register(client)
+    skill_id = create_skill(client, headers, user_subtopics=0)
+
+    with app.app_context():
+        fill(user_id, skill_id, skills, subtopics)
+        # plus the subtopics the app suggested when the skill was created
+        subtopics = len(Subtopic.find_by_skill(skill_id))
+        paths = (
+            (f'Subtopic.find_by_skill ({subtopics})', lambda: Subtopic.find_by_skill(skill_id)),
+            (f'Subtopic.find_by_skill + to_dict ({subtopics})',
+             lambda: [s.to_dict() for s in Subtopic.find_by_skill(skill_id)]),
+            (f'Skill.find_by_user ({skills})', lambda: Skill.find_by_user(user_id)),
+            ('Skill.find_by_id', lambda: Skill.find_by_id(skill_id, user_id).to_dict()),
+            ('User.find_by_username', lambda: User.find_by_username('bench')),
+        )
+        print(f'{"":42} {"held KiB":>10} {"peak KiB":>10}')
+        for label, fn in paths:
+            fn()
+            print(f'{label:<42} {"%10.1f %10.1f" % allocated_kib(fn)}')
+        for label, fn in paths:
+            print_row(label, measure(fn, iterations if '(' in label else iterations * 20))
+
+        print(f'one Subtopic: {instance_bytes(Subtopic.find_by_skill(skill_id)[0])} bytes, '
+              f'one Skill: {instance_bytes(Skill.find_by_id(skill_id))} bytes, '
+              f'one User: {instance_bytes(User.find_by_username("bench"))} bytes')
+
+    for label, path in ((f'GET /api/skills/<id> ({subtopics})', f'/api/skills/{skill_id}'),
+                        (f'GET /api/skills ({skills})', '/api/skills')):
+        print_row(label, measure(lambda: client.get(path, headers=headers), iterations))
+
+    detail = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()
+    ok = len(detail['subtopics']) == subtopics and all(
+        isinstance(s['hours_spent'], float) and isinstance(s['expected_hours'], float)
+        and set(s) == {'id', 'skill_id', 'title', 'description', 'status', 'hours_spent', 'difficulty',
+                       'notes', 'started_at', 'completed_at', 'order_index', 'expected_hours'}
+        for s in detail['subtopics']
+    )
+    with app.app_context():
+        rows = Skill.find_by_user(user_id)
+    ok = ok and len(rows) == skills and all('progress' in r and 'learned_hours' in r for r in rows)
+    if not ok:
+        print('FAIL: the read paths no longer return the served shape')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
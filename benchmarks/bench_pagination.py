@@ -0,0 +1,78 @@
+"""Keyset pagination: page latency should not grow with depth.
+
+    python -m benchmarks.bench_pagination [sessions] [skills]
+
+Walks every page of ``GET /api/sessions`` and ``GET /api/skills`` and
+reports the latency of the first and the last pages. The walk must return
+every row exactly once, in order; a duplicate, gap or misordering fails the
+run (exit 1).
+"""
+import io
+import json
+import sys
+import time
+
+from benchmarks.common import create_skill, make_app, print_row, register, summarize
+
+PAGE = 50
+
+
+def seed(client, headers, sessions, skills):
+    skill_ids = [create_skill(client, headers, name=f'Skill {i}', user_subtopics=0) for i in range(skills)]
+    body = '\n'.join(
+        json.dumps({'skill_id': skill_ids[n % skills], 'duration_minutes': 30,
+                    'session_date': f'2022-{n % 12 + 1:02d}-{n % 28 + 1:02d}T08:00:00'})
+        for n in range(sessions)
+    ).encode()
+    client.post('/api/sessions/import', headers=headers, data=io.BytesIO(body),
+                content_type='application/x-ndjson')
+
+
+def walk(client, headers, url, key):
+    samples, rows, cursor = [], [], None
+    while True:
+        t0 = time.perf_counter()
+        page = client.get(f"{url}?limit={PAGE}" + (f'&cursor={cursor}' if cursor else ''),
+                          headers=headers).get_json()
+        samples.append((time.perf_counter() - t0) * 1000)
+        rows.extend(key(row) for row in page['items'])
+        cursor = page['next_cursor']
+        if not cursor:
+            return samples, rows
+
+
+def check(name, rows, expected):
+    ok = rows == sorted(rows, reverse=True) and len(rows) == len(set(rows)) == expected
+    print(f'{name}: {len(rows)} rows (expected {expected}) {"ok" if ok else "FAIL"}')
+    return ok
+
+
+def main(sessions=20000, skills=500):
+    app = make_app('pagination')
+    client = app.test_client()
+    _, headers = register(client)
+    seed(client, headers, sessions, skills)
+
+    ok = True
+    for url, key, expected in (
+        ('/api/sessions', lambda row: (row['session_date'], row['id']), sessions),
+        ('/api/skills', lambda row: (row['created_at'], row['id']), skills),
+    ):
+        t0 = time.perf_counter()
+        samples, rows = walk(client, headers, url, key)
+        elapsed = time.perf_counter() - t0
+        ok = check(url, rows, expected) and ok
+
+        depth = max(1, len(samples) // 10)
+        print_row(f'{url} all {len(samples)} pages', summarize(samples, elapsed))
+        print_row(f'{url} first {depth} pages', summarize(samples[:depth], sum(samples[:depth]) / 1000))
+        print_row(f'{url} last {depth} pages', summarize(samples[-depth:], sum(samples[-depth:]) / 1000))
+
+    if not ok:
+        print('FAIL: pagination walk did not return every row exactly once')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
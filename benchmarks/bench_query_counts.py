@@ -0,0 +1,52 @@
+"""Regression check: SQL statements per call must not grow with the data.
+
+    python -m benchmarks.bench_query_counts
+
+Seeds users with an increasing number of skills and asserts that
+``Skill.find_by_user`` issues the same number of statements for each.
+benchmarks/test_query_counts.py runs the same check under pytest.
+"""
+import sys
+
+from benchmarks.common import count_statements, create_skill, make_app, register
+from models.skill import Skill
+
+SCALES = (1, 10, 100)
+
+
+def seed_user(client, username, skills):
+    user_id, headers = register(client, username)
+    for i in range(skills):
+        skill_id = create_skill(client, headers, name=f'Skill {i}')
+        detail = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()
+        client.post('/api/sessions', headers=headers, json={
+            'skill_id': skill_id,
+            'subtopic_id': detail['subtopics'][0]['id'],
+            'duration_minutes': 30
+        })
+    return user_id
+
+
+def main():
+    app = make_app('query_counts')
+    client = app.test_client()
+    users = {n: seed_user(client, f'user{n}', n) for n in SCALES}
+
+    counts = {}
+    with app.app_context():
+        for n, user_id in users.items():
+            with count_statements() as statements:
+                skills = Skill.find_by_user(user_id)
+            assert len(skills) == n
+            assert all(s['learned_hours'] == 0.5 for s in skills)
+            counts[n] = len(statements)
+            print(f'Skill.find_by_user with {n:>4} skills: {counts[n]} statement(s)')
+
+    if len(set(counts.values())) != 1:
+        print('FAIL: statement count grows with the number of skills')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Auth throttling: cost of a 429 vs. a real login, and limits across workers.
+
+    python -m benchmarks.bench_rate_limit [iterations]
+
+For each backend, one client exhausts its buckets and then keeps hitting
+``/api/auth/login``; the rejected requests must be 429s with Retry-After
+that run no bcrypt and no user lookup. With the 'sqlite' backend, two
+limiter instances (standing in for two workers) must share one budget.
+Fails (exit 1) otherwise.
+"""
+import sys
+
+from benchmarks.check_query_plans import capture_statements
+from benchmarks.common import make_app, measure, print_row, register
+from utils import rate_limit
+from utils.password_hasher import password_hasher
+
+statements = capture_statements()
+PER_MINUTE = 5
+
+
+def main(iterations=500):
+    app = make_app('rate_limit')
+    client = app.test_client()
+    rate_limit.ip_limiter = rate_limit.TokenBucketLimiter('ip', 0)
+    rate_limit.username_limiter = rate_limit.TokenBucketLimiter('username', 0)
+    register(client)
+    credentials = {'username': 'bench', 'password': 'secret123'}
+
+    ok = True
+    print_row('POST /api/auth/login, not throttled',
+              measure(lambda: client.post('/api/auth/login', json=credentials), 10))
+
+    for backend in ('memory', 'sqlite'):
+        rate_limit.ip_limiter = rate_limit.TokenBucketLimiter('ip', PER_MINUTE, backend)
+        rate_limit.username_limiter = rate_limit.TokenBucketLimiter('username', PER_MINUTE * 10, backend)
+        codes = [client.post('/api/auth/login', json=credentials).status_code for _ in range(PER_MINUTE + 1)]
+        ok = ok and codes == [200] * PER_MINUTE + [429]
+
+        hashed = password_hasher.stats()['completed']
+        del statements[:]
+        res = client.post('/api/auth/login', json=credentials)
+        user_lookups = [s for s in statements if 'FROM users' in s]
+        print(f'{backend}: first {PER_MINUTE + 1} codes={codes} then {res.status_code} '
+              f'Retry-After={res.headers.get("Retry-After")} statements={len(statements)} '
+              f'user lookups={len(user_lookups)} hashes={password_hasher.stats()["completed"] - hashed}')
+        ok = ok and res.status_code == 429 and 'Retry-After' in res.headers and not user_lookups
+        ok = ok and password_hasher.stats()['completed'] == hashed
+
+        print_row(f'POST /api/auth/login, 429 ({backend})',
+                  measure(lambda: client.post('/api/auth/login', json=credentials), iterations))
+        print('  counters:', rate_limit.rate_limit_stats())
+
+    # two workers sharing the sqlite table share one budget
+    with app.app_context():
+        first = rate_limit.TokenBucketLimiter('shared', PER_MINUTE, 'sqlite')
+        second = rate_limit.TokenBucketLimiter('shared', PER_MINUTE, 'sqlite')
+        allowed = sum(not limiter.hit('10.0.0.1') for _ in range(PER_MINUTE) for limiter in (first, second))
+    print(f'sqlite backend across two workers: {allowed} of {PER_MINUTE * 2} allowed (budget {PER_MINUTE})')
+    ok = ok and allowed == PER_MINUTE
+
+    if not ok:
+        print('FAIL: throttling did not reject cheaply or did not hold across workers')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
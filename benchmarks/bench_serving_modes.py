@@ -0,0 +1,150 @@
+"""Sync vs. threaded vs. async serving under fast and slow clients.
+
+    python -m benchmarks.bench_serving_modes [fast_clients] [slow_clients] [seconds]
+
+Starts one single-process server per mode on a throwaway database:
+
+  sync     gunicorn -k sync (one request at a time)
+  gthread  gunicorn -k gthread --threads 8
+  asgi     uvicorn asgi:asgi_app (event loop + bounded view threads)
+
+and measures ``GET /api/skills/<id>`` from ``fast_clients`` concurrent
+clients, first alone and then while ``slow_clients`` trickle request bodies
+at a few bytes per second (slow mobile uploads, or a slowloris).
+"""
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.common import summarize
+
+MODES = {
+    'sync': [sys.executable, '-m', 'gunicorn', '-w', '1', '-k', 'sync', '-b', '127.0.0.1:{port}', 'app:app'],
+    'gthread': [sys.executable, '-m', 'gunicorn', '-w', '1', '-k', 'gthread', '--threads', '8',
+                '-b', '127.0.0.1:{port}', 'app:app'],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi:asgi_app', '--host', '127.0.0.1', '--port', '{port}',
+             '--no-access-log', '--log-level', 'warning'],
+}
+TIMEOUT = 15
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start(mode, tmp):
+    port = free_port()
+    env = dict(os.environ, SKILLSTACK_DB_PATH=os.path.join(tmp, f'{mode}.db'))
+    proc = subprocess.Popen([arg.format(port=port) for arg in MODES[mode]], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(200):
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1)
+            return proc, port
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f'{mode} server did not start')
+
+
+def call(port, method, path, body=None, token=None):
+    req = urllib.request.Request(f'http://127.0.0.1:{port}{path}', method=method,
+                                 data=json.dumps(body).encode() if body is not None else None,
+                                 headers={'Content-Type': 'application/json'})
+    if token:
+        req.add_header('Authorization', f'Bearer {token}')
+    with urllib.request.urlopen(req, timeout=TIMEOUT) as res:
+        return json.loads(res.read())
+
+
+async def request(port, raw, trickle=0.0):
+    """Send ``raw`` (optionally one byte at a time) and return the status code"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        if trickle:
+            head, body = raw.split(b'\r\n\r\n', 1)
+            writer.write(head + b'\r\n\r\n')
+            for i in range(len(body)):
+                await writer.drain()
+                await asyncio.sleep(trickle)
+                writer.write(body[i:i + 1])
+        else:
+            writer.write(raw)
+        await writer.drain()
+        status = await reader.readline()
+        await reader.read()
+        return int(status.split()[1]) if status else 0
+    finally:
+        writer.close()
+
+
+def http(method, path, token, body=b''):
+    return (f'{method} {path} HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n'
+            f'Authorization: Bearer {token}\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n\r\n').encode() + body
+
+
+async def load(port, token, skill_id, fast_clients, slow_clients, seconds):
+    stop = time.perf_counter() + seconds
+    samples, errors = [], []
+    fast = http('GET', f'/api/skills/{skill_id}', token)
+    slow = http('POST', '/api/sessions', token,
+                json.dumps({'skill_id': skill_id, 'duration_minutes': 1, 'notes': 'x' * 20}).encode())
+
+    async def fast_client():
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(request(port, fast), TIMEOUT)
+            except (asyncio.TimeoutError, OSError):
+                status = 0
+            samples.append((time.perf_counter() - t0) * 1000)
+            if status != 200:
+                errors.append(status)
+
+    async def slow_client():
+        while time.perf_counter() < stop:
+            try:
+                await asyncio.wait_for(request(port, slow, trickle=0.05), TIMEOUT)
+            except (asyncio.TimeoutError, OSError):
+                pass
+
+    tasks = [fast_client() for _ in range(fast_clients)] + [slow_client() for _ in range(slow_clients)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return summarize(samples or [0.0], time.perf_counter() - t0), len(errors)
+
+
+def main(fast_clients=32, slow_clients=64, seconds=10):
+    tmp = tempfile.mkdtemp(prefix='skillstack-serving-')
+    print(f'{"mode":<8} {"slow":>4}  {"ok rps":>8} {"p50 ms":>8} {"p95 ms":>9} {"errors":>6}')
+    for mode in MODES:
+        proc, port = start(mode, tmp)
+        try:
+            auth = call(port, 'POST', '/api/auth/register',
+                        {'username': 'bench', 'email': 'bench@example.com', 'password': 'secret123'})
+            token = auth['access_token']
+            skill_id = call(port, 'POST', '/api/skills', {
+                'name': 'React Basics', 'resource_type': 'course', 'platform': 'Udemy',
+                'user_subtopics': [{'title': 'Hooks'}]
+            }, token)['skill_id']
+
+            for slow in (0, slow_clients):
+                stats, errors = asyncio.run(load(port, token, skill_id, fast_clients, slow, seconds))
+                ok_rps = stats['rps'] * (1 - errors / max(stats['n'], 1))
+                print(f'{mode:<8} {slow:>4}  {ok_rps:8.1f} {stats["p50"]:8.1f} {stats["p95"]:9.1f} {errors:>6}')
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,94 @@
+"""Session logging: lost-update check under concurrency, plus latency.
+
+    python -m benchmarks.bench_session_logging [threads] [sessions_per_thread]
+
+Many threads log time against the same subtopic at once. Afterwards the
+subtopic's hours_spent, the skill_stats rollup and the session rows must
+all agree; any lost update fails the run (exit 1). Latency of
+``POST /api/sessions`` and the status endpoint is reported alongside.
+"""
+import sys
+import threading
+import time
+
+from benchmarks.common import create_skill, make_app, measure, print_row, register, summarize
+from utils.database import get_db_connection
+
+MINUTES = 6
+
+
+def main(threads=8, per_thread=25):
+    app = make_app('session_logging')
+    client = app.test_client()
+    _, headers = register(client)
+    skill_id = create_skill(client, headers)
+    subtopics = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()['subtopics']
+    target = subtopics[0]['id']
+
+    samples, failures = [], []
+    lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker():
+        c = app.test_client()
+        local = []
+        start.wait()
+        for _ in range(per_thread):
+            t0 = time.perf_counter()
+            res = c.post('/api/sessions', headers=headers, json={
+                'skill_id': skill_id, 'subtopic_id': target, 'duration_minutes': MINUTES
+            })
+            local.append((time.perf_counter() - t0) * 1000)
+            if res.status_code != 201:
+                with lock:
+                    failures.append(res.status_code)
+        with lock:
+            samples.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    print_row(f'POST /api/sessions, {threads} threads', summarize(samples, time.perf_counter() - t0))
+
+    logged = threads * per_thread - len(failures)
+    with app.app_context():
+        conn = get_db_connection()
+        hours = conn.execute('SELECT hours_spent FROM subtopics WHERE id = ?', (target,)).fetchone()[0]
+        rows = conn.execute(
+            'SELECT COUNT(*) FROM learning_sessions WHERE subtopic_id = ?', (target,)
+        ).fetchone()[0]
+        stats = conn.execute(
+            'SELECT learned_minutes FROM skill_stats WHERE skill_id = ?', (skill_id,)
+        ).fetchone()
+
+    expected_hours = logged * MINUTES / 60
+    print(f'sessions accepted={logged} rows={rows} failed={len(failures)}')
+    print(f'hours_spent={hours:.2f} expected={expected_hours:.2f}')
+    ok = abs(hours - expected_hours) < 1e-6 and rows == logged
+    if stats is not None:
+        print(f'skill_stats.learned_minutes={stats[0]} expected={logged * MINUTES}')
+        ok = ok and stats[0] == logged * MINUTES
+
+    def log_sequential():
+        client.post('/api/sessions', headers=headers, json={
+            'skill_id': skill_id, 'subtopic_id': subtopics[1]['id'], 'duration_minutes': 1
+        })
+
+    def toggle_status():
+        client.put(f"/api/skills/subtopics/{subtopics[1]['id']}/status", headers=headers,
+                   json={'status': 'in-progress'})
+
+    print_row('POST /api/sessions, sequential', measure(log_sequential, 200))
+    print_row('PUT subtopic status, sequential', measure(toggle_status, 200))
+
+    if not ok:
+        print('FAIL: lost updates detected')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
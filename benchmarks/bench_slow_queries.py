@@ -0,0 +1,103 @@
+"""Overhead and output of the slow-query log (utils.slow_queries).
+
+    python -m benchmarks.bench_slow_queries [users] [sessions] [iterations]
+
+Seeds a database with ``flask seed``, then times the read endpoints of one
+seeded user with the log off, and on with a threshold nothing reaches.
+Then drops the threshold to a microsecond so every statement is logged and checks
+(exit 1 if not) that
+
+  - /api/metrics/slow-queries ranks statements by total time, with calls,
+    plans and the endpoints that issued them,
+  - each logged record names the endpoint and the models/ or controllers/
+    line behind the statement and carries no bound values,
+  - a statement that scans a whole table reports it under full_scans.
+"""
+import json
+import logging
+import sys
+
+from benchmarks.common import make_app, measure, print_row
+from commands.seed_commands import seed
+from utils.database import get_db_connection
+from utils.slow_queries import slow_query_log
+
+
+class Captured(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(json.loads(record.getMessage().split(' ', 2)[2]))
+
+
+def main(users=200, sessions=50_000, iterations=200):
+    app = make_app('slow_queries')
+    result = app.test_cli_runner().invoke(seed, ['--users', str(users), '--sessions', str(sessions)])
+    if result.exit_code:
+        print(result.output)
+        return 1
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'username': 'seed1', 'password': 'seedpass123'}).get_json()
+    headers = {'Authorization': f"Bearer {token['access_token']}"}
+    paths = ('/api/dashboard', '/api/dashboard/calendar', '/api/sessions', '/api/skills')
+
+    def read_all():
+        for path in paths:
+            client.get(path, headers=headers)
+
+    for label, threshold_ms in (('off', 0), ('on, nothing slow', 10_000)):
+        slow_query_log.configure(threshold_ms)
+        print_row(f'{len(paths)} read endpoints, log {label}', measure(read_all, iterations))
+
+    captured = Captured()
+    logger = logging.getLogger('skillstack.slow_query')
+    logger.addHandler(captured)
+    logger.propagate = False
+    slow_query_log.reset()
+    slow_query_log.configure(1e-6)
+    read_all()
+    with app.app_context():
+        get_db_connection().execute(
+            "SELECT COUNT(*) FROM learning_sessions WHERE notes LIKE ?", ('%secret%',)
+        ).fetchone()
+    logger.removeHandler(captured)
+    slow_query_log.configure(0)
+
+    report = client.get('/api/metrics/slow-queries?top=10').get_json()
+    print(f'{"total ms":>9} {"calls":>6} {"max ms":>7}  statement')
+    for q in report['queries']:
+        print(f'{q["total_ms"]:9.2f} {q["calls"]:>6} {q["max_ms"]:7.2f}  {q["sql"][:90]}')
+        for scan in q['full_scans'] or ():
+            print(f'{"":26}full scan: {scan}')
+
+    ok = True
+    totals = [q['total_ms'] for q in report['queries']]
+    if not totals or totals != sorted(totals, reverse=True):
+        print('FAIL: report is not ranked by total time')
+        ok = False
+    if not all(q['plan'] for q in report['queries'] if q['sql'].startswith('SELECT')):
+        print('FAIL: a reported SELECT has no captured plan')
+        ok = False
+    endpoints = {r['endpoint'] for r in captured.records}
+    if not {'dashboard.get_dashboard', 'sessions.list_sessions'} <= endpoints:
+        print(f'FAIL: logged endpoints {sorted(endpoints)}')
+        ok = False
+    request_records = [r for r in captured.records if r['endpoint'] != '-']
+    if not all(r['caller'] and r['caller'].startswith(('models/', 'controllers/')) for r in request_records):
+        print('FAIL: a statement logged during a request has no models/ or controllers/ caller')
+        ok = False
+    if any('secret' in json.dumps(r) for r in captured.records):
+        print('FAIL: a bound value reached the log')
+        ok = False
+    like = [r for r in captured.records if 'notes LIKE' in r['sql']]
+    if not like or not like[0]['full_scans'] or like[0]['params'] != '(str)':
+        print(f'FAIL: the unindexed LIKE was logged as {like}')
+        ok = False
+    print(f'{len(captured.records)} slow statements logged from {sorted(endpoints)}')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
@@ -0,0 +1,97 @@
+"""Subtopic suggestion index: build time, size and lookup cost vs. corpus size.
+
+    python -m benchmarks.bench_suggestions [skills ...]
+
+Seeds synthetic user curricula, runs ``flask suggestions build`` and times
+lookups; lookup cost should stay flat as the corpus grows. Also checks that
+suggestions follow the skill name, that a title only one user wrote is
+never suggested, and that POST /api/skills uses the index (exit 1 if not).
+"""
+import os
+import random
+import sys
+
+from benchmarks.common import make_app, measure, print_row, register
+from utils.database import get_db_connection
+from utils.suggestions import get_index
+
+CURRICULA = {
+    'React': ['JSX', 'Components', 'Props and State', 'Hooks', 'Context API', 'React Router', 'Testing'],
+    'Python': ['Variables and Types', 'Control Flow', 'Functions', 'Modules', 'File I/O', 'Virtual Environments'],
+    'Docker': ['Images and Containers', 'Dockerfile', 'Volumes', 'Networking', 'Docker Compose'],
+    'Spanish': ['Pronunciation', 'Present Tense', 'Ser vs Estar', 'Past Tense', 'Conversation Practice'],
+    'Figma': ['Frames and Layers', 'Auto Layout', 'Components', 'Prototyping', 'Design Systems'],
+}
+NAMES = ['{} for Beginners', 'Modern {}', 'Complete {} Course', '{} in Depth', 'Practical {}']
+CATEGORIES = {'React': 'Web Development', 'Python': 'Data Science', 'Docker': 'Cloud Computing',
+              'Spanish': 'Language', 'Figma': 'Design'}
+
+
+def seed(app, skills, users=200):
+    rng = random.Random(skills)
+    with app.app_context():
+        conn = get_db_connection()
+        conn.executemany(
+            "INSERT INTO users (username, email, password_hash) VALUES (?, ?, 'x')",
+            [(f'u{n}', f'u{n}@example.com') for n in range(users)]
+        )
+        user_ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE password_hash = 'x'")]
+        skill_rows, subtopic_rows = [], []
+        for n in range(skills):
+            topic = rng.choice(list(CURRICULA))
+            skill_rows.append((rng.choice(user_ids), rng.choice(NAMES).format(topic), CATEGORIES[topic]))
+            titles = [t for t in CURRICULA[topic] if rng.random() < 0.8]
+            if n == 0:
+                titles.append('My Secret Side Project')
+            subtopic_rows.append(titles)
+        conn.executemany(
+            "INSERT INTO skills (user_id, name, resource_type, platform, category) VALUES (?, ?, 'course', 'x', ?)",
+            skill_rows
+        )
+        first_id = conn.execute('SELECT MAX(id) FROM skills').fetchone()[0] - skills + 1
+        conn.executemany(
+            'INSERT INTO subtopics (skill_id, title, order_index) VALUES (?, ?, ?)',
+            [(first_id + n, title, i) for n, titles in enumerate(subtopic_rows) for i, title in enumerate(titles)]
+        )
+        conn.commit()
+        conn.close()
+
+
+def main(*scales):
+    ok = True
+    for skills in scales or (2000, 20000):
+        app = make_app(f'suggestions_{skills}')
+        app.config['SUGGESTIONS_INDEX'] = app.config['DATABASE'] + '.suggestions.json'
+        seed(app, skills)
+
+        result = app.test_cli_runner().invoke(args=['suggestions', 'build'])
+        print(result.output.splitlines()[0])
+
+        with app.app_context():
+            index = get_index()
+            suggested = index.suggest('React Hooks Deep Dive', 'Web Development')
+            print_row(f'lookup, {skills} skills indexed',
+                      measure(lambda: index.suggest('Advanced React and Redux', 'Web Development'), 5000))
+            leaked = any('Secret' in t for e in index.tokens.values() for t, _, _ in e)
+        print(f'  React Hooks Deep Dive -> {suggested}')
+        ok = ok and 'Hooks' in suggested and 'Dockerfile' not in suggested and not leaked
+
+        client = app.test_client()
+        _, headers = register(client)
+        res = client.post('/api/skills', headers=headers, json={
+            'name': 'Docker Basics', 'resource_type': 'course', 'platform': 'Udemy',
+            'user_subtopics': [{'title': 'Volumes'}]
+        }).get_json()
+        titles = [st['title'] for st in res['subtopics']]
+        print(f'  POST /api/skills "Docker Basics" -> {titles}')
+        ok = ok and 'Dockerfile' in titles and titles.count('Volumes') == 1
+        os.remove(app.config['SUGGESTIONS_INDEX'])
+
+    if not ok:
+        print('FAIL: suggestions were wrong, leaked a private title, or were not used')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(a) for a in sys.argv[1:]]))
@@ -0,0 +1,156 @@
+"""Check that every query issued by models/ and controllers/ uses an index.
+
+    python -m benchmarks.check_query_plans
+
+Drives every endpoint through the Flask test client, plus the session
+import, ``flask recategorize``, ``flask suggestions build`` and the SQLite
+rate-limit backend, while tracing the SQL sent to SQLite, then runs
+``EXPLAIN QUERY PLAN`` on each distinct SELECT/UPDATE/DELETE. A plain ``SCAN`` of a base table fails the check;
+scans of materialized subqueries and the temp b-trees used for sorting are
+fine. benchmarks/test_query_plans.py runs the same check under pytest.
+"""
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+
+from benchmarks.common import create_skill, make_app, register
+from commands.recategorize_commands import recategorize
+from commands.suggestion_commands import suggestions_cli
+from utils import database
+from utils.rate_limit import TokenBucketLimiter
+
+PLANNED = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\bNULL\b")
+
+
+def normalize(sql):
+    """Traced SQL has parameters inlined; put placeholders back for grouping"""
+    return LITERAL.sub('?', ' '.join(sql.split()))
+
+
+def capture_statements():
+    statements = []
+    connect = database.ConnectionPool._connect
+
+    def traced_connect(pool):
+        conn = connect(pool)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    database.ConnectionPool._connect = traced_connect
+    return statements
+
+
+def exercise(client):
+    _, headers = register(client, 'plans')
+    client.post('/api/auth/login', json={'username': 'plans', 'password': 'secret123'})
+    skill_id = create_skill(client, headers)
+    other_id = create_skill(client, headers, name='Docker')
+    subtopics = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()['subtopics']
+
+    client.post('/api/sessions', headers=headers, json={
+        'skill_id': skill_id, 'subtopic_id': subtopics[0]['id'], 'duration_minutes': 30
+    })
+    client.post('/api/skills/learning-sessions', headers=headers, json={
+        'skill_id': skill_id, 'subtopic_id': subtopics[1]['id'], 'duration_minutes': 15
+    })
+    for st in subtopics:
+        client.post('/api/sessions', headers=headers, json={
+            'skill_id': skill_id, 'subtopic_id': st['id'], 'duration_minutes': 5
+        })
+        client.put(f"/api/skills/subtopics/{st['id']}/status", headers=headers, json={'status': 'completed'})
+    client.put(f"/api/skills/subtopics/{subtopics[0]['id']}/status", headers=headers, json={'status': 'in-progress'})
+    client.post(f'/api/skills/{skill_id}/review', headers=headers, json={'rating': 5, 'notes': 'good'})
+    client.get('/api/skills', headers=headers)
+    client.post('/api/sessions', headers=headers, json={
+        'skill_id': other_id, 'duration_minutes': 20, 'session_date': '2024-03-01'
+    })
+    client.get('/api/dashboard', headers=headers)
+    client.get('/api/dashboard/calendar?from=2024-01-01&to=2024-12-31', headers=headers)
+    client.get('/api/export?format=ndjson', headers=headers).get_data()
+    page = client.get('/api/skills?limit=1&status=in-progress', headers=headers).get_json()
+    client.get(f"/api/skills?limit=1&cursor={page['next_cursor'] or ''}&category=Programming"
+               '&from=2024-01-01&to=2030-12-31', headers=headers)
+    page = client.get('/api/sessions?limit=2', headers=headers).get_json()
+    client.get(f"/api/sessions?limit=2&cursor={page['next_cursor']}", headers=headers)
+    client.get(f'/api/sessions?skill_id={skill_id}&category=Programming&from=2024-01-01', headers=headers)
+    client.delete(f'/api/skills/{other_id}', headers=headers)
+
+    # streaming import, both formats, settling statuses afterwards
+    rows = [{'skill_id': other_id, 'duration_minutes': 10, 'session_date': '2024-04-01'},
+            {'skill_id': skill_id, 'subtopic_id': subtopics[0]['id'], 'duration_minutes': 5}]
+    client.post('/api/sessions/import', headers=headers, content_type='application/x-ndjson',
+                data=io.BytesIO('\n'.join(json.dumps(row) for row in rows).encode()))
+    client.post('/api/sessions/import?format=csv', headers=headers, content_type='text/csv',
+                data=io.BytesIO(f'skill_id,duration_minutes\n{other_id},15\n'.encode()))
+
+    # offline commands; a stale category gives recategorize something to update
+    with client.application.app_context():
+        conn = database.get_db_connection()
+        conn.execute("UPDATE skills SET category = 'Other' WHERE id = ?", (skill_id,))
+        conn.commit()
+    runner = client.application.test_cli_runner()
+    with tempfile.TemporaryDirectory() as tmp:
+        for command, args in ((recategorize, ['--chunk-size', '1', '--dry-run']),
+                              (recategorize, ['--chunk-size', '1']),
+                              (suggestions_cli, ['build', '--min-users', '1',
+                                                 '--output', os.path.join(tmp, 'suggestions.json')])):
+            result = runner.invoke(command, args)
+            assert result.exit_code == 0, result.output
+
+    # the shared (sqlite) auth throttle, pruning on every hit
+    limiter = TokenBucketLimiter('plans', 60, backend='sqlite')
+    limiter.PRUNE_EVERY = 1
+    with client.application.app_context():
+        limiter.hit('127.0.0.1')
+
+
+def table_names(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def full_scans(conn, sql, tables):
+    plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', (None,) * sql.count('?'))]
+    derived = {m.group(1) for d in plan for m in [re.match(r'(?:MATERIALIZE|CO-ROUTINE) (\S+)', d)] if m}
+    aliases = dict(re.findall(r'\b(?:FROM|JOIN)\s+(\w+)\s+(?:AS\s+)?(\w+)', sql, re.IGNORECASE))
+    aliases = {alias: table for table, alias in aliases.items()}
+
+    bad = []
+    for detail in plan:
+        m = re.match(r'SCAN (\S+)(.*)', detail)
+        if not m or 'USING' in m.group(2) or m.group(1) in derived:
+            continue
+        if aliases.get(m.group(1), m.group(1)) in tables:
+            bad.append(detail)
+    return plan, bad
+
+
+def main():
+    statements = capture_statements()
+    app = make_app('query_plans')
+    statements.clear()  # migrations are allowed to scan
+    exercise(app.test_client())
+
+    distinct = sorted({normalize(s) for s in statements if s.lstrip().upper().startswith(PLANNED)})
+    failures = 0
+    with app.app_context():
+        conn = database.get_db_connection()
+        conn.set_trace_callback(None)
+        tables = table_names(conn)
+        for sql in distinct:
+            plan, bad = full_scans(conn, sql, tables)
+            status = 'FAIL' if bad else 'ok  '
+            failures += bool(bad)
+            print(f'{status} {sql[:110]}')
+            for detail in plan:
+                print(f'       {detail}')
+
+    print(f'\n{len(distinct)} distinct statements, {failures} with full table scans')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
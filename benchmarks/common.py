@@ -0,0 +1,103 @@
+"""Shared helpers for the benchmark scripts.
+
+Run benchmarks from the repository root, e.g.
+``python -m benchmarks.bench_connections``. Every run works on a throwaway
+database in a temp directory, never on ``skillstack.db``.
+"""
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+
+_TMP_DIR = tempfile.mkdtemp(prefix='skillstack-bench-')
+# must be set before ``app`` is imported: it builds an app at import time
+os.environ['SKILLSTACK_DB_PATH'] = os.path.join(_TMP_DIR, 'import.db')
+
+from app import create_app  # noqa: E402
+from utils import helpers, rate_limit  # noqa: E402
+from utils.database import get_db_connection  # noqa: E402
+
+
+def make_app(name='bench', **config):
+    """Fresh app bound to its own empty database file"""
+    config.setdefault('DATABASE', os.path.join(_TMP_DIR, f'{name}.db'))
+    config.setdefault('TESTING', True)
+    if os.path.exists(config['DATABASE']):
+        os.remove(config['DATABASE'])
+    return create_app(config)
+
+
+def fast_auth(monkeypatch):
+    """bcrypt work factor 4 and no auth throttles, undone with ``monkeypatch``"""
+    monkeypatch.setattr(helpers, 'BCRYPT_ROUNDS', 4)
+    monkeypatch.setattr(rate_limit, 'ip_limiter', rate_limit.TokenBucketLimiter('ip', 0))
+    monkeypatch.setattr(rate_limit, 'username_limiter', rate_limit.TokenBucketLimiter('username', 0))
+
+
+def register(client, username='bench', password='secret123'):
+    """Register a user and return (user_id, auth headers)"""
+    res = client.post('/api/auth/register', json={
+        'username': username,
+        'email': f'{username}@example.com',
+        'password': password
+    })
+    body = res.get_json()
+    return body['user_id'], {'Authorization': f"Bearer {body['access_token']}"}
+
+
+def create_skill(client, headers, name='React Basics', user_subtopics=2, target_hours=10):
+    res = client.post('/api/skills', headers=headers, json={
+        'name': name,
+        'resource_type': 'course',
+        'platform': 'Udemy',
+        'target_hours': target_hours,
+        'description': 'benchmark skill',
+        'user_subtopics': [{'title': f'Topic {i}'} for i in range(user_subtopics)]
+    })
+    return res.get_json()['skill_id']
+
+
+def measure(fn, iterations):
+    """Call ``fn`` ``iterations`` times; return latency percentiles in ms and rps"""
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+def summarize(samples, elapsed):
+    samples = sorted(samples)
+
+    def pct(p):
+        return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+
+    return {
+        'n': len(samples),
+        'p50': pct(50),
+        'p95': pct(95),
+        'p99': pct(99),
+        'mean': statistics.fmean(samples),
+        'rps': len(samples) / elapsed if elapsed else 0.0
+    }
+
+
+def print_row(label, stats):
+    print(f"{label:<42} n={stats['n']:<6} p50={stats['p50']:7.2f}ms "
+          f"p95={stats['p95']:7.2f}ms p99={stats['p99']:7.2f}ms rps={stats['rps']:9.1f}")
+
+
+@contextmanager
+def count_statements():
+    """Collect every SQL statement run on the current app context's connection"""
+    conn = get_db_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        yield statements
+    finally:
+        conn.set_trace_callback(None)
@@ -0,0 +1,54 @@
+"""pytest plumbing for the performance budget suite (benchmarks/perf_budgets.py).
+
+Kept free of app imports so that collecting this directory stays cheap.
+"""
+import json
+import os
+
+import pytest
+
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), 'budgets.json')
+RESULTS = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    parser.addoption('--update-budgets', action='store_true',
+                     help='rewrite benchmarks/budgets.json from this run instead of checking it')
+
+
+def pytest_configure(config):
+    config.stash[RESULTS] = {}
+
+
+@pytest.fixture(scope='session')
+def perf_results(pytestconfig):
+    """(case, scale) -> measured stats, filled in by the budget tests"""
+    return pytestconfig.stash[RESULTS]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.stash.get(RESULTS, None)
+    if not results:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section('latency and SQL per request')
+    write(f'{"endpoint":<40} {"skills":>6} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"budget":>8} {"stmts":>6}')
+    for (case, scale), r in sorted(results.items(), key=lambda item: (item[0][0], int(item[0][1]))):
+        write(f'{case:<40} {scale:>6} {r["p50"]:8.2f} {r["p95"]:8.2f} {r["p99"]:8.2f} '
+              f'{r.get("budget_ms", 0):8.1f} {r["statements"]:6.2f}')
+
+
+def pytest_sessionfinish(session):
+    results = session.config.stash.get(RESULTS, None)
+    if not results or not session.config.getoption('--update-budgets', False):
+        return
+    budgets = {}
+    for (case, scale), r in sorted(results.items()):
+        budgets.setdefault(case, {})[scale] = {
+            # room for machine-to-machine noise; query counts get none
+            'p95_ms': round(max(2 * r['p95'], r['p95'] + 2), 1),
+            'statements': round(r['statements'], 2),
+        }
+    with open(BUDGETS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(budgets, f, indent=2, sort_keys=True)
+        f.write('\n')
@@ -0,0 +1,162 @@
+"""Per-endpoint latency and query-count budgets.
+
+    python -m pytest benchmarks/perf_budgets.py            # check budgets.json
+    python -m pytest benchmarks/perf_budgets.py --update-budgets
+
+(The file is not named test_*.py, so a plain ``pytest`` run of the repo
+does not pick it up; name it explicitly, as above.)
+
+For each scale a user is seeded through the API with that many skills, each
+with subtopics and a logged session, on a throwaway database. Every endpoint
+below is then driven through the Flask test client (the dashboard twice:
+served from its cache, and rebuilt on every request) and fails if
+
+  - its SQL statements per request (from utils.metrics) exceed the budget,
+    so an N+1 regression fails even when it is still fast, or
+  - its p95 latency exceeds the budget times SKILLSTACK_BUDGET_FACTOR
+    (default 1; raise it on slow CI machines).
+
+Login runs with a bcrypt work factor of 4 and the auth throttles disabled
+(both restored after each scale):
+its budget covers the request path, not the hash (see bench_login_storm).
+"""
+import json
+import os
+
+import pytest
+
+from benchmarks.common import create_skill, fast_auth, make_app, measure, register
+from benchmarks.conftest import BUDGETS_PATH
+from controllers.dashboard_controller import dashboard_cache
+from utils.metrics import metrics
+
+SCALES = ('10', '100', '1000')
+BUDGET_FACTOR = float(os.environ.get('SKILLSTACK_BUDGET_FACTOR', 1))
+
+
+def _load_budgets():
+    try:
+        with open(BUDGETS_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+BUDGETS = _load_budgets()
+
+
+@pytest.fixture(scope='module', params=SCALES)
+def seeded(request):
+    with pytest.MonkeyPatch.context() as mp:
+        fast_auth(mp)
+        yield _seed(request.param)
+
+
+def _seed(scale):
+    app = make_app(f'budgets_{scale}')
+    client = app.test_client()
+    _, headers = register(client)
+    skill_ids = []
+    for i in range(int(scale)):
+        skill_id = create_skill(client, headers, name=f'Skill {i}', user_subtopics=4)
+        subtopics = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()['subtopics']
+        client.post('/api/sessions', headers=headers, json={
+            'skill_id': skill_id, 'subtopic_id': subtopics[0]['id'], 'duration_minutes': 30
+        })
+        skill_ids.append(skill_id)
+
+    skill_id = skill_ids[len(skill_ids) // 2]
+    subtopic_id = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()['subtopics'][1]['id']
+    return {'scale': scale, 'client': client, 'headers': headers,
+            'skill_id': skill_id, 'subtopic_id': subtopic_id}
+
+
+def _dashboard(s):
+    return s['client'].get('/api/dashboard', headers=s['headers'])
+
+
+def _dashboard_uncached(s):
+    dashboard_cache.clear()
+    return _dashboard(s)
+
+
+def _skills(s):
+    return s['client'].get('/api/skills', headers=s['headers'])
+
+
+def _skill_detail(s):
+    return s['client'].get(f'/api/skills/{s["skill_id"]}', headers=s['headers'])
+
+
+def _log_session(s):
+    return s['client'].post('/api/sessions', headers=s['headers'], json={
+        'skill_id': s['skill_id'], 'subtopic_id': s['subtopic_id'], 'duration_minutes': 5
+    })
+
+
+def _toggle_status(s):
+    s['status'] = 'to-learn' if s.get('status') == 'in-progress' else 'in-progress'
+    return s['client'].put(f'/api/skills/subtopics/{s["subtopic_id"]}/status',
+                           headers=s['headers'], json={'status': s['status']})
+
+
+def _login(s):
+    return s['client'].post('/api/auth/login', json={'username': 'bench', 'password': 'secret123'})
+
+
+def _create_skill(s):
+    s['created'] = s.get('created', 0) + 1
+    return s['client'].post('/api/skills', headers=s['headers'], json={
+        'name': f'New Skill {s["created"]}', 'resource_type': 'course', 'platform': 'Udemy',
+        'user_subtopics': [{'title': 'Topic 0'}, {'title': 'Topic 1'}]
+    })
+
+
+# label, endpoint name in utils.metrics, method, request, iterations;
+# POST /api/skills runs last so it does not change the scale under the others
+CASES = [
+    ('GET /api/dashboard', 'dashboard.get_dashboard', 'GET', _dashboard, 100),
+    ('GET /api/dashboard (uncached)', 'dashboard.get_dashboard', 'GET', _dashboard_uncached, 100),
+    ('GET /api/skills', 'skills.get_skills', 'GET', _skills, 100),
+    ('GET /api/skills/<id>', 'skills.get_skill_detail', 'GET', _skill_detail, 100),
+    ('POST /api/sessions', 'sessions.add_session', 'POST', _log_session, 100),
+    ('PUT /api/skills/subtopics/<id>/status', 'skills.update_subtopic_status', 'PUT', _toggle_status, 100),
+    ('POST /api/auth/login', 'auth.login', 'POST', _login, 50),
+    ('POST /api/skills', 'skills.create_skill', 'POST', _create_skill, 50),
+]
+
+
+def _statement_totals(endpoint, method):
+    histogram = metrics.sql_statements.get((endpoint, method))
+    return (histogram.total, histogram.count) if histogram else (0, 0)
+
+
+@pytest.mark.parametrize('case', CASES, ids=[c[0] for c in CASES])
+def test_endpoint_budget(case, seeded, perf_results, pytestconfig):
+    label, endpoint, method, send, iterations = case
+    statuses = set()
+
+    def call():
+        statuses.add(send(seeded).status_code)
+
+    call()  # warm-up
+    total_before, count_before = _statement_totals(endpoint, method)
+    stats = measure(call, iterations)
+    total_after, count_after = _statement_totals(endpoint, method)
+    stats['statements'] = (total_after - total_before) / max(count_after - count_before, 1)
+
+    budget = BUDGETS.get(label, {}).get(seeded['scale'])
+    if budget:
+        stats['budget_ms'] = budget['p95_ms'] * BUDGET_FACTOR
+    perf_results[(label, seeded['scale'])] = stats
+
+    assert statuses <= {200, 201}, f'{label} answered {sorted(statuses)}'
+    if pytestconfig.getoption('--update-budgets'):
+        return
+    assert budget, f'no budget for {label} at {seeded["scale"]} skills; run with --update-budgets'
+    assert stats['statements'] <= budget['statements'], (
+        f'{label}: {stats["statements"]:.2f} SQL statements per request, budget {budget["statements"]}'
+    )
+    assert stats['p95'] <= stats['budget_ms'], (
+        f'{label}: p95 {stats["p95"]:.2f} ms, budget {stats["budget_ms"]:.1f} ms'
+    )
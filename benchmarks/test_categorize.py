@@ -0,0 +1,20 @@
+"""categorize_skill against the corpus in bench_categorize.
+
+Collected by a plain ``python -m pytest`` run; the timings stay in
+``python -m benchmarks.bench_categorize``.
+"""
+import pytest
+
+from benchmarks.bench_categorize import CORPUS
+from utils.helpers import categorize_skill, categorize_skills
+
+
+@pytest.mark.parametrize('name, description, expected', CORPUS,
+                         ids=[f'{n or "<empty>"} / {d}' if d else n or '<empty>' for n, d, _ in CORPUS])
+def test_categorize_skill(name, description, expected):
+    assert categorize_skill(name, description) == expected
+
+
+def test_categorize_skills_matches_single_calls():
+    pairs = [(name, description) for name, description, _ in CORPUS]
+    assert categorize_skills(pairs) == [categorize_skill(n, d) for n, d in pairs]
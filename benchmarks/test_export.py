@@ -0,0 +1,54 @@
+"""LearningSession.iter_by_user and Skill.iter_by_user, the paging behind
+/api/export, return every row.
+
+Throughput and memory stay in ``python -m benchmarks.bench_export``.
+"""
+from benchmarks.common import create_skill, fast_auth, make_app, register
+from models.session import LearningSession
+from models.skill import Skill
+from utils.database import get_db_connection
+
+DATES = (20240101, '2024-01-02', None, 1700000000.5, '2024-03-01 10:00:00', None, '2023-12-31')
+
+
+def test_iter_by_user_includes_every_session_date(monkeypatch, tmp_path):
+    fast_auth(monkeypatch)
+    app = make_app(DATABASE=str(tmp_path / 'export.db'))
+    client = app.test_client()
+    user_id, headers = register(client)
+    skill_id = create_skill(client, headers)
+
+    with app.app_context():
+        conn = get_db_connection()
+        # numbers get NUMERIC affinity and sort before every text date
+        conn.executemany(
+            'INSERT INTO learning_sessions (user_id, skill_id, duration_minutes, session_date) VALUES (?, ?, 5, ?)',
+            [(user_id, skill_id, date) for date in DATES]
+        )
+        conn.commit()
+        pages = list(LearningSession.iter_by_user(user_id, page_size=2))
+
+    dates = [row['session_date'] for page in pages for row in page]
+    assert all(len(page) <= 2 for page in pages)
+    assert dates == [None, None, 20240101, 1700000000.5, '2023-12-31', '2024-01-02', '2024-03-01 10:00:00']
+
+
+def test_skill_iter_by_user_includes_every_created_at(monkeypatch, tmp_path):
+    fast_auth(monkeypatch)
+    app = make_app(DATABASE=str(tmp_path / 'export.db'))
+    client = app.test_client()
+    user_id, _ = register(client)
+
+    with app.app_context():
+        conn = get_db_connection()
+        conn.executemany(
+            "INSERT INTO skills (user_id, name, resource_type, platform, target_hours, created_at) "
+            "VALUES (?, ?, 'course', 'Udemy', 10, ?)",
+            [(user_id, f'Skill {i}', created_at) for i, created_at in enumerate(DATES)]
+        )
+        conn.commit()
+        pages = list(Skill.iter_by_user(user_id, page_size=2))
+
+    created = [row['created_at'] for page in pages for row in page]
+    assert all(len(page) <= 2 for page in pages)
+    assert created == [None, None, 20240101, 1700000000.5, '2023-12-31', '2024-01-02', '2024-03-01 10:00:00']
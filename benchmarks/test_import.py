@@ -0,0 +1,93 @@
+"""Bad bytes and broken CSV in an import fail their own line, not the request.
+
+Throughput stays in ``python -m benchmarks.bench_import``.
+"""
+import io
+
+import pytest
+
+from benchmarks.common import create_skill, fast_auth, make_app, register
+from controllers.import_controller import ImportController
+from utils.database import get_db_connection
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    fast_auth(monkeypatch)
+    app = make_app(DATABASE=str(tmp_path / 'import.db'))
+    client = app.test_client()
+    _, headers = register(client)
+    skill_id = create_skill(client, headers)
+    return app, client, headers, skill_id
+
+
+def post(client, headers, body, content_type):
+    return client.post('/api/sessions/import', headers=headers, data=io.BytesIO(body),
+                       content_type=content_type)
+
+
+def learned_minutes(app, skill_id):
+    with app.app_context():
+        return get_db_connection().execute(
+            'SELECT learned_minutes FROM skill_stats WHERE skill_id = ?', (skill_id,)
+        ).fetchone()[0]
+
+
+def test_csv_bad_lines(env):
+    app, client, headers, skill_id = env
+    body = (f'skill_id,duration_minutes,notes\n{skill_id},10,ok\n'.encode()
+            + f'{skill_id},10,caf\xe9\n'.encode('latin-1')
+            + f'{skill_id},10,"spans\n\xff lines"\n'.encode('latin-1')
+            + f'{skill_id},20,"quoted\nfine"\n{skill_id},30,done\n'.encode())
+
+    res = post(client, headers, body, 'text/csv')
+
+    assert res.status_code == 200
+    body = res.get_json()
+    assert body['imported'] == 3
+    assert body['errors'] == [{'line': 3, 'error': 'Invalid UTF-8'}, {'line': 5, 'error': 'Invalid UTF-8'}]
+    assert learned_minutes(app, skill_id) == 60
+
+
+def test_ndjson_bad_lines(env):
+    app, client, headers, skill_id = env
+    body = (f'{{"skill_id": {skill_id}, "duration_minutes": 5}}\n'.encode()
+            + b'{"skill_id": 1, "notes": "\xff"}\n'
+            + f'{{"skill_id": {skill_id}, "duration_minutes": 7}}\n'.encode())
+
+    res = post(client, headers, body, 'application/x-ndjson')
+
+    assert res.status_code == 200
+    assert res.get_json()['errors'] == [{'line': 2, 'error': 'Invalid UTF-8'}]
+    assert learned_minutes(app, skill_id) == 12
+
+
+def test_csv_error_reports_its_line():
+    lines = [b'skill_id,duration_minutes\n', b'1,10\n', b'1,' + b'9' * 200_000 + b'\n', b'1,5\n']
+    parsed = list(ImportController._parse(iter(lines), 'csv'))
+    assert [line for line, _ in parsed] == [2, 3, 4]
+    assert parsed[1][1].startswith('Invalid CSV')
+
+
+def test_settles_committed_batches_when_a_later_one_fails(env, monkeypatch):
+    app, client, headers, skill_id = env
+    monkeypatch.setattr('controllers.import_controller.IMPORT_BATCH_SIZE', 2)
+    insert_batch = ImportController._insert_batch
+    calls = []
+
+    def fail_second(sessions):
+        calls.append(len(sessions))
+        if len(calls) == 2:
+            raise RuntimeError('disk full')
+        insert_batch(sessions)
+
+    monkeypatch.setattr(ImportController, '_insert_batch', staticmethod(fail_second))
+    body = ''.join(f'{{"skill_id": {skill_id}, "duration_minutes": 5}}\n' for _ in range(5)).encode()
+
+    with app.test_request_context():
+        with pytest.raises(RuntimeError):
+            ImportController.import_sessions(1, iter(body.splitlines(keepends=True)), 'ndjson')
+
+    skill = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()
+    assert learned_minutes(app, skill_id) == 10
+    assert skill['status'] == 'in-progress'
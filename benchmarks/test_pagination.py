@@ -0,0 +1,37 @@
+"""Walking GET /api/sessions by next_cursor reaches every session.
+
+Latency per page stays in ``python -m benchmarks.bench_pagination``.
+"""
+from benchmarks.common import create_skill, fast_auth, make_app, register
+from utils.database import get_db_connection
+
+# newest first; with pages of 2 the second page ends on a float date
+DATES = ('2024-03-01', '2024-02-01', 1700000000.5, 1600000000.25, 20240101, None)
+
+
+def test_session_cursor_crosses_numeric_dates(monkeypatch, tmp_path):
+    fast_auth(monkeypatch)
+    app = make_app(DATABASE=str(tmp_path / 'pagination.db'))
+    client = app.test_client()
+    user_id, headers = register(client)
+    skill_id = create_skill(client, headers)
+
+    with app.app_context():
+        conn = get_db_connection()
+        conn.executemany(
+            'INSERT INTO learning_sessions (user_id, skill_id, duration_minutes, session_date) VALUES (?, ?, 5, ?)',
+            [(user_id, skill_id, date) for date in DATES]
+        )
+        conn.commit()
+
+    pages = []
+    path = '/api/sessions?limit=2'
+    while path:
+        res = client.get(path, headers=headers)
+        assert res.status_code == 200, res.get_json()
+        body = res.get_json()
+        pages.append([item['session_date'] for item in body['items']])
+        path = body['next_cursor'] and f"/api/sessions?limit=2&cursor={body['next_cursor']}"
+
+    # numbers sort below every text date
+    assert pages == [['2024-03-01', '2024-02-01'], [1700000000.5, 1600000000.25], [20240101, None]]
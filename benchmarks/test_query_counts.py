@@ -0,0 +1,25 @@
+"""SQL statements per Skill.find_by_user call must not grow with the data.
+
+``python -m benchmarks.bench_query_counts`` prints the same counts.
+"""
+from benchmarks.bench_query_counts import SCALES, seed_user
+from benchmarks.common import count_statements, fast_auth, make_app
+from models.skill import Skill
+
+
+def test_find_by_user_statements_do_not_grow(monkeypatch, tmp_path):
+    fast_auth(monkeypatch)
+    app = make_app(DATABASE=str(tmp_path / 'query_counts.db'))
+    client = app.test_client()
+    users = {n: seed_user(client, f'user{n}', n) for n in SCALES}
+
+    counts = {}
+    with app.app_context():
+        for n, user_id in users.items():
+            with count_statements() as statements:
+                skills = Skill.find_by_user(user_id)
+            assert len(skills) == n
+            assert all(s['learned_hours'] == 0.5 for s in skills)
+            counts[n] = len(statements)
+
+    assert len(set(counts.values())) == 1, f'statements per call by number of skills: {counts}'
@@ -0,0 +1,34 @@
+"""Every query models/ and controllers/ issue uses an index: the API, the
+session import, the offline commands and the SQLite rate limiter.
+
+``python -m benchmarks.check_query_plans`` prints each statement with its plan.
+"""
+from benchmarks.check_query_plans import PLANNED, exercise, full_scans, normalize, table_names
+from benchmarks.common import fast_auth, make_app
+from utils import database
+
+
+def test_no_full_table_scans(monkeypatch, tmp_path):
+    fast_auth(monkeypatch)
+    statements = []
+    connect = database.ConnectionPool._connect
+
+    def traced_connect(pool):
+        conn = connect(pool)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(database.ConnectionPool, '_connect', traced_connect)
+    app = make_app(DATABASE=str(tmp_path / 'query_plans.db'))
+    statements.clear()  # migrations are allowed to scan
+    exercise(app.test_client())
+
+    distinct = sorted({normalize(s) for s in statements if s.lstrip().upper().startswith(PLANNED)})
+    assert distinct
+    with app.app_context():
+        conn = database.get_db_connection()
+        conn.set_trace_callback(None)
+        tables = table_names(conn)
+        scans = {sql: bad for sql in distinct for _, bad in [full_scans(conn, sql, tables)] if bad}
+
+    assert not scans, '\n'.join(f'{sql}\n    {bad}' for sql, bad in scans.items())
@@ -0,0 +1,145 @@
+"""Session logging and status changes run as one transaction (utils.database.UnitOfWork).
+
+Concurrent sessions against one subtopic must not lose updates, and a step
+that fails part way leaves nothing behind. The latency side stays in
+``python -m benchmarks.bench_session_logging``.
+"""
+import threading
+
+import pytest
+
+from benchmarks.common import create_skill, fast_auth, make_app, register
+from models.session import LearningSession
+from models.skill import Skill
+from models.subtopic import Subtopic
+from models.user_version import UserVersion
+from utils.database import get_db_connection
+
+THREADS = 8
+PER_THREAD = 10
+MINUTES = 6
+
+
+@pytest.fixture
+def env(monkeypatch, tmp_path):
+    fast_auth(monkeypatch)
+    app = make_app(DATABASE=str(tmp_path / 'unit_of_work.db'))
+    client = app.test_client()
+    user_id, headers = register(client)
+    skill_id = create_skill(client, headers)
+    subtopics = client.get(f'/api/skills/{skill_id}', headers=headers).get_json()['subtopics']
+    return app, client, headers, user_id, skill_id, subtopics
+
+
+def snapshot(app, skill_id, user_id):
+    with app.app_context():
+        conn = get_db_connection()
+        return (
+            conn.execute('SELECT id, status, hours_spent FROM subtopics WHERE skill_id = ? ORDER BY id',
+                         (skill_id,)).fetchall(),
+            conn.execute('SELECT status FROM skills WHERE id = ?', (skill_id,)).fetchone()[0],
+            conn.execute('SELECT COUNT(*) FROM learning_sessions').fetchone()[0],
+            conn.execute('SELECT COUNT(*) FROM certificates').fetchone()[0],
+            conn.execute('SELECT learned_minutes FROM skill_stats WHERE skill_id = ?', (skill_id,)).fetchone()[0],
+            UserVersion.get(user_id),
+        )
+
+
+def test_concurrent_sessions_lose_no_updates(env):
+    app, _, headers, _, skill_id, subtopics = env
+    target = subtopics[0]['id']
+    statuses = []
+    lock = threading.Lock()
+    start = threading.Barrier(THREADS)
+
+    def worker():
+        client = app.test_client()
+        start.wait()
+        for _ in range(PER_THREAD):
+            res = client.post('/api/sessions', headers=headers, json={
+                'skill_id': skill_id, 'subtopic_id': target, 'duration_minutes': MINUTES
+            })
+            with lock:
+                statuses.append(res.status_code)
+
+    pool = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    assert statuses == [201] * THREADS * PER_THREAD
+    with app.app_context():
+        conn = get_db_connection()
+        hours = conn.execute('SELECT hours_spent FROM subtopics WHERE id = ?', (target,)).fetchone()[0]
+        rows = conn.execute('SELECT COUNT(*) FROM learning_sessions WHERE subtopic_id = ?',
+                            (target,)).fetchone()[0]
+        learned = conn.execute('SELECT learned_minutes FROM skill_stats WHERE skill_id = ?',
+                               (skill_id,)).fetchone()[0]
+    assert rows == THREADS * PER_THREAD
+    assert hours == pytest.approx(THREADS * PER_THREAD * MINUTES / 60)
+    assert learned == THREADS * PER_THREAD * MINUTES
+
+
+@pytest.mark.parametrize('model, method', [
+    (Subtopic, 'add_time'),
+    (Subtopic, 'update_status'),
+    (Skill, 'save'),
+    (UserVersion, 'bump'),
+])
+def test_failed_step_rolls_back_session(env, monkeypatch, model, method):
+    app, client, headers, user_id, skill_id, subtopics = env
+    before = snapshot(app, skill_id, user_id)
+    monkeypatch.setattr(model, method, lambda *args: False)
+
+    res = client.post('/api/sessions', headers=headers, json={
+        'skill_id': skill_id, 'subtopic_id': subtopics[0]['id'], 'duration_minutes': MINUTES
+    })
+
+    assert res.status_code == 500
+    assert snapshot(app, skill_id, user_id) == before
+
+
+@pytest.mark.parametrize('model, method', [
+    (LearningSession, 'save'),
+    (Skill, 'save'),
+    (LearningSession, 'create_certificate'),
+    (UserVersion, 'bump'),
+])
+def test_failed_step_rolls_back_completion(env, monkeypatch, model, method):
+    app, client, headers, user_id, skill_id, subtopics = env
+    for subtopic in subtopics:
+        client.post('/api/sessions', headers=headers, json={
+            'skill_id': skill_id, 'subtopic_id': subtopic['id'], 'duration_minutes': 60
+        })
+    for subtopic in subtopics[:-1]:
+        res = client.put(f"/api/skills/subtopics/{subtopic['id']}/status", headers=headers,
+                         json={'status': 'completed'})
+        assert res.status_code == 200
+    before = snapshot(app, skill_id, user_id)
+    monkeypatch.setattr(model, method, lambda *args: False)
+
+    res = client.put(f"/api/skills/subtopics/{subtopics[-1]['id']}/status", headers=headers,
+                     json={'status': 'completed'})
+
+    assert res.status_code == 500
+    assert snapshot(app, skill_id, user_id) == before
+
+
+def test_unknown_ids_are_rejected_before_any_write(env):
+    app, client, headers, user_id, skill_id, subtopics = env
+    other_skill = create_skill(client, headers, name='Docker')
+    other_subtopic = client.get(f'/api/skills/{other_skill}', headers=headers).get_json()['subtopics'][0]['id']
+    _, stranger = register(client, 'stranger')
+    before = snapshot(app, skill_id, user_id)
+
+    for json, auth in (
+        ({'skill_id': skill_id, 'subtopic_id': 999_999}, headers),
+        ({'skill_id': skill_id, 'subtopic_id': other_subtopic}, headers),
+        ({'skill_id': 999_999}, headers),
+        ({'skill_id': skill_id, 'subtopic_id': subtopics[0]['id']}, stranger),
+    ):
+        res = client.post('/api/sessions', headers=auth, json={**json, 'duration_minutes': MINUTES})
+        assert res.status_code == 404, (json, res.get_json())
+
+    assert snapshot(app, skill_id, user_id) == before
@@ -0,0 +1,31 @@
+import click
+from flask.cli import with_appcontext
+
+from controllers.import_controller import IMPORT_FORMATS, ImportController
+from models.user import User
+
+
+@click.command('import-sessions')
+@click.argument('username')
+@click.argument('source', type=click.File('rb', lazy=False))
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS),
+              help='Input format; defaults from the file extension, else ndjson.')
+@with_appcontext
+def import_sessions(username, source, fmt):
+    """Stream learning sessions from SOURCE (a file, or - for stdin) into USERNAME's history"""
+    user = User.find_by_username(username)
+    if not user:
+        raise click.ClickException(f'No such user: {username}')
+    if not fmt:
+        fmt = 'csv' if source.name.endswith('.csv') else 'ndjson'
+
+    result, status = ImportController.import_sessions(user.id, source, fmt)
+    if status != 200:
+        raise click.ClickException(result['error'])
+
+    for error in result['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(
+        f"Imported {result['imported']} session(s), {result['failed']} failed, "
+        f"in {result['elapsed_seconds']}s ({result['rows_per_second']} rows/s)"
+    )
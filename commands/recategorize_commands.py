@@ -0,0 +1,33 @@
+import click
+from flask.cli import with_appcontext
+
+from models.skill import Skill
+from models.user_version import UserVersion
+from utils.database import UnitOfWork
+from utils.helpers import categorize_skills
+
+
+@click.command('recategorize')
+@click.option('--chunk-size', default=500, show_default=True, help='Skills read and updated per transaction.')
+@click.option('--dry-run', is_flag=True, help='Report what would change without writing.')
+@with_appcontext
+def recategorize(chunk_size, dry_run):
+    """Re-run categorize_skill over every stored skill, in chunks"""
+    scanned = changed = 0
+    for rows in Skill.iter_all(chunk_size):
+        categories = categorize_skills((row['name'], row['description']) for row in rows)
+        updates = [(category, row) for category, row in zip(categories, rows) if category != row['category']]
+        scanned += len(rows)
+        changed += len(updates)
+        if dry_run or not updates:
+            continue
+
+        # one transaction per chunk; owners' versions are bumped so cached
+        # dashboards and ETags pick up the new categories
+        with UnitOfWork() as uow:
+            Skill.update_categories(uow.conn.cursor(), [(category, row['id']) for category, row in updates])
+            for user_id in {row['user_id'] for _, row in updates}:
+                UserVersion.bump(user_id)
+
+    verb = 'Would change' if dry_run else 'Changed'
+    click.echo(f'Scanned {scanned} skill(s). {verb} the category of {changed}.')
@@ -0,0 +1,263 @@
+"""``flask seed``: bulk-generate a realistic dataset for load and regression testing.
+
+Rows are generated in Python and written with one ``executemany`` per
+table per batch of users, each batch in its own ``BEGIN IMMEDIATE``
+transaction, with ids assigned up front so nothing is read back. The
+progress and calendar rollups are rebuilt from the raw tables at the end.
+Output depends only on ``--seed``, ``--end-date`` and the size options
+(and on the ids already in the database), apart from the salt of the one
+password hash every seeded user shares.
+
+Distributions, roughly after what real accounts look like:
+
+  skills per user     log-normal, median 3, capped at 40
+  subtopics per skill 85% of a topic's curriculum (3-8)
+  completion          25% of skills untouched, 15% finished, the rest part-way
+  sessions            spread over users by a log-normal activity weight and
+                      over each user's started skills, dated after the skill
+                      was added; evenings are busiest
+  durations           log-normal around 30 minutes, 5 to 240
+"""
+import calendar
+import math
+import random
+import time
+from datetime import date, timedelta
+
+import click
+from flask.cli import with_appcontext
+
+from models.daily_activity import DailyActivity
+from models.skill_stats import SkillStats
+from utils.database import UnitOfWork
+from utils.helpers import categorize_skills, hash_password
+
+# topic -> curriculum, in learning order
+CURRICULA = {
+    'React': ['JSX', 'Components', 'Props and State', 'Hooks', 'Context API', 'React Router', 'Testing', 'Deployment'],
+    'Python': ['Variables and Types', 'Control Flow', 'Functions', 'Modules', 'File I/O', 'Virtual Environments',
+               'Testing'],
+    'Machine Learning': ['Linear Regression', 'Classification', 'Model Evaluation', 'Feature Engineering',
+                         'Neural Networks', 'Deployment'],
+    'Docker': ['Images and Containers', 'Dockerfile', 'Volumes', 'Networking', 'Docker Compose'],
+    'AWS': ['IAM', 'EC2', 'S3', 'Lambda', 'VPC Networking', 'CloudFormation'],
+    'Flutter': ['Dart Basics', 'Widgets', 'Layouts', 'State Management', 'Navigation', 'Publishing'],
+    'Java': ['Syntax and Setup', 'Classes and Objects', 'Collections', 'Exceptions', 'Streams', 'Concurrency'],
+    'Figma': ['Frames and Layers', 'Auto Layout', 'Components', 'Prototyping', 'Design Systems'],
+    'Marketing': ['Market Research', 'Positioning', 'Content Strategy', 'SEO', 'Analytics'],
+    'Spanish': ['Pronunciation', 'Present Tense', 'Ser vs Estar', 'Past Tense', 'Conversation Practice'],
+}
+# relative popularity of the topics above
+TOPIC_WEIGHTS = [24, 20, 10, 8, 7, 6, 9, 6, 5, 5]
+NAME_TEMPLATES = ['{}', '{} for Beginners', 'Complete {} Course', 'Modern {}', '{} in Depth', 'Practical {}']
+PLATFORMS = ['Udemy', 'Coursera', 'YouTube', 'freeCodeCamp', 'Pluralsight', 'Book']
+RESOURCE_TYPES = ['course', 'course', 'course', 'video', 'book', 'tutorial']
+# session start hour -> relative frequency
+HOUR_WEIGHTS = [1, 0, 0, 0, 0, 1, 2, 4, 4, 3, 3, 3, 4, 4, 3, 3, 4, 5, 7, 9, 10, 9, 6, 3]
+
+# what CURRENT_TIMESTAMP and datetime.isoformat() produce, as the app stores them
+SESSION_FORMAT = '%Y-%m-%d %H:%M:%S'
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+class _Ids:
+    """Next free id per table, read inside the batch's write transaction"""
+
+    def __init__(self, cursor):
+        for table in ('users', 'skills', 'subtopics', 'learning_sessions'):
+            setattr(self, table, cursor.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {table}').fetchone()[0])
+
+    def take(self, table):
+        value = getattr(self, table)
+        setattr(self, table, value + 1)
+        return value
+
+
+def _weighted(items, weights):
+    """Each item repeated by its weight: a uniform pick from it is a weighted pick"""
+    return [item for item, weight in zip(items, weights) for _ in range(weight)]
+
+
+_TOPIC_TABLE = _weighted(list(CURRICULA), TOPIC_WEIGHTS)
+_HOUR_TABLE = _weighted(range(24), HOUR_WEIGHTS)
+
+
+def _stamp(ts, fmt=SESSION_FORMAT):
+    # UTC, like CURRENT_TIMESTAMP, and independent of the machine's timezone
+    return time.strftime(fmt, time.gmtime(ts))
+
+
+_days = {}
+
+
+def _day_stamp(day, second):
+    """_stamp(day * 86400 + second), with the date part cached"""
+    prefix = _days.get(day)
+    if prefix is None:
+        prefix = _days[day] = _stamp(day * 86400, '%Y-%m-%d')
+    return f'{prefix} {second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}'
+
+
+def generate_batch(rng, ids, sessions_per_user, end_ts, days, password_hash, prefix):
+    """Rows for one batch of users: {table: [tuple, ...]} ready for executemany"""
+    rows = {'users': [], 'skills': [], 'subtopics': [], 'learning_sessions': [], 'certificates': []}
+
+    for session_count in sessions_per_user:
+        user_id = ids.take('users')
+        signup = end_ts - rng.random() * days * 86400
+        rows['users'].append((user_id, f'{prefix}{user_id}', f'{prefix}{user_id}@example.com',
+                              password_hash, _stamp(signup)))
+
+        started = []  # (skill_id, created_ts, [subtopic ids worth logging against])
+        minutes_by_subtopic = {}
+        skill_rows = []
+        first_subtopic = {}
+        for _ in range(min(40, max(1, round(rng.lognormvariate(1.1, 0.7))))):
+            skill_id = ids.take('skills')
+            topic = _TOPIC_TABLE[int(rng.random() * len(_TOPIC_TABLE))]
+            name = rng.choice(NAME_TEMPLATES).format(topic)
+            created = signup + rng.random() * (end_ts - signup)
+            titles = [t for t in CURRICULA[topic] if rng.random() < 0.85] or CURRICULA[topic][:1]
+
+            roll = rng.random()
+            progress = 0.0 if roll < 0.25 else 1.0 if roll < 0.40 else rng.random()
+            done = round(progress * len(titles))
+            finished = end_ts - rng.random() * (end_ts - created) * 0.3 if done == len(titles) else None
+
+            active = []
+            for order, title in enumerate(titles):
+                subtopic_id = ids.take('subtopics')
+                status, started_at, completed_at = 'to-learn', None, None
+                if order < done:
+                    status, started_at = 'completed', _stamp(created, ISO_FORMAT)
+                    completed_at = _stamp(finished or created + (end_ts - created) * (order + 1) / len(titles),
+                                          ISO_FORMAT)
+                    active.append(subtopic_id)
+                elif order == done and progress > 0:
+                    status, started_at = 'in-progress', _stamp(created, ISO_FORMAT)
+                    active.append(subtopic_id)
+                minutes_by_subtopic[subtopic_id] = 0
+                row = [subtopic_id, skill_id, title, status, 0.0, started_at, completed_at,
+                       order, float(rng.randint(1, 8)), 'user']
+                rows['subtopics'].append(row)
+                first_subtopic.setdefault(skill_id, row)
+
+            if done == len(titles):
+                status = 'completed'
+                rows['certificates'].append((user_id, skill_id, _stamp(finished)))
+            else:
+                status = 'in-progress' if progress > 0 else 'not-started'
+            if active:
+                started.append((skill_id, created, active))
+            skill_rows.append([skill_id, user_id, name, rng.choice(RESOURCE_TYPES), rng.choice(PLATFORMS), status,
+                               float(rng.choice((0, 10, 20, 40))), None, None,
+                               rng.randint(3, 5) if finished else None, _stamp(created),
+                               _stamp(finished) if finished else None])
+
+        if not started and session_count:
+            # someone who logs time has started something
+            skill = skill_rows[0]
+            skill[5] = 'in-progress'
+            subtopic = first_subtopic[skill[0]]
+            subtopic[3], subtopic[5] = 'in-progress', _stamp(signup, ISO_FORMAT)
+            started.append((skill[0], signup, [subtopic[0]]))
+
+        # the hot loop at millions of rows: plain rng.random() arithmetic
+        # instead of choice/randrange, and dates formatted per day, not per row
+        session_id = ids.learning_sessions
+        random_ = rng.random
+        for _ in range(session_count):
+            skill_id, created, active = started[int(random_() * len(started))]
+            day = int((created + random_() * (end_ts - created)) // 86400)
+            second = _HOUR_TABLE[int(random_() * len(_HOUR_TABLE))] * 3600 + int(random_() * 3600)
+            minutes = min(240, max(5, int(math.exp(rng.gauss(3.4, 0.6)))))
+            subtopic_id = active[int(random_() * len(active))] if random_() < 0.9 else None
+            if subtopic_id is not None:
+                minutes_by_subtopic[subtopic_id] += minutes
+            rows['learning_sessions'].append((session_id, user_id, skill_id, subtopic_id, minutes, None,
+                                               _day_stamp(day, second)))
+            session_id += 1
+        ids.learning_sessions = session_id
+
+        for st in rows['subtopics'][-len(minutes_by_subtopic):]:
+            st[4] = round(minutes_by_subtopic[st[0]] / 60, 2)
+        rows['skills'].extend(skill_rows)
+
+    # same categorizer the API uses when a skill is created
+    for skill, category in zip(rows['skills'], categorize_skills((s[2], None) for s in rows['skills'])):
+        skill[7] = category
+    return rows
+
+
+INSERTS = {
+    'users': 'INSERT INTO users (id, username, email, password_hash, created_at) VALUES (?, ?, ?, ?, ?)',
+    'skills': '''
+        INSERT INTO skills (id, user_id, name, resource_type, platform, status, target_hours, category,
+                            description, rating, created_at, completed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'subtopics': '''
+        INSERT INTO subtopics (id, skill_id, title, status, hours_spent, started_at, completed_at,
+                               order_index, expected_hours, source)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'learning_sessions': '''
+        INSERT INTO learning_sessions (id, user_id, skill_id, subtopic_id, duration_minutes, notes, session_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'certificates': 'INSERT INTO certificates (user_id, skill_id, issued_at) VALUES (?, ?, ?)',
+}
+
+
+def split_sessions(rng, users, sessions):
+    """Sessions per user: proportional to a log-normal activity weight, summing to ``sessions``"""
+    weights = [rng.lognormvariate(0, 1.2) for _ in range(users)]
+    scale = sessions / sum(weights)
+    counts = [math.floor(w * scale) for w in weights]
+    # hand the rounding remainder to the most active users
+    for i in sorted(range(users), key=lambda i: -weights[i])[:sessions - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+@click.command('seed')
+@click.option('--users', default=1000, type=click.IntRange(min=1), show_default=True, help='Users to create.')
+@click.option('--sessions', default=100_000, type=click.IntRange(min=0), show_default=True, help='Learning sessions to create, in total.')
+@click.option('--seed', 'seed', default=1, show_default=True, help='Random seed; same seed, same data.')
+@click.option('--days', default=365, type=click.IntRange(min=1), show_default=True, help='History length, ending at --end-date.')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Last day of generated activity [default: today].')
+@click.option('--batch-users', default=2000, type=click.IntRange(min=1), show_default=True, help='Users written per transaction.')
+@click.option('--password', default='seedpass123', show_default=True, help='Password of every seeded user.')
+@click.option('--prefix', default='seed', show_default=True, help='Username prefix.')
+@with_appcontext
+def seed(users, sessions, seed, days, end_date, batch_users, password, prefix):
+    """Write USERS users with skills, subtopics and SESSIONS learning sessions"""
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    end = (end_date.date() if end_date else date.today()) + timedelta(days=1)
+    end_ts = calendar.timegm(end.timetuple()) - 1
+    password_hash = hash_password(password)
+    per_user = split_sessions(rng, users, sessions)
+
+    totals = dict.fromkeys(INSERTS, 0)
+    for offset in range(0, users, batch_users):
+        with UnitOfWork() as uow:
+            cursor = uow.conn.cursor()
+            rows = generate_batch(rng, _Ids(cursor), per_user[offset:offset + batch_users],
+                                  end_ts, days, password_hash, prefix)
+            for table, sql in INSERTS.items():
+                cursor.executemany(sql, rows[table])
+                totals[table] += len(rows[table])
+        click.echo(f'  {min(offset + batch_users, users)}/{users} users', err=True)
+
+    with UnitOfWork() as uow:
+        cursor = uow.conn.cursor()
+        SkillStats.rebuild(cursor)
+        DailyActivity.rebuild(cursor)
+
+    click.echo(
+        f"Seeded {totals['users']} users, {totals['skills']} skills, {totals['subtopics']} subtopics, "
+        f"{totals['learning_sessions']} sessions and {totals['certificates']} certificates "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
@@ -0,0 +1,37 @@
+import click
+from flask.cli import AppGroup
+
+from models.skill_stats import SkillStats
+from utils.database import get_db_connection
+
+stats_cli = AppGroup('skill-stats', help='Maintain the skill_stats progress rollup.')
+
+
+@stats_cli.command('rebuild')
+def rebuild():
+    """Recompute every skill_stats row from subtopics and sessions"""
+    conn = get_db_connection()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        count = SkillStats.rebuild(conn.cursor())
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    click.echo(f'Rebuilt skill_stats for {count} skill(s)')
+
+
+@stats_cli.command('verify')
+def verify():
+    """Compare skill_stats with a fresh recomputation; exit 1 on drift"""
+    mismatches = SkillStats.verify(get_db_connection().cursor())
+    for row in mismatches:
+        click.echo(
+            f"skill {row['skill_id']}: "
+            f"subtopics {row['total_subtopics']} != {row['expected_total_subtopics']}, "
+            f"completed {row['completed_subtopics']} != {row['expected_completed_subtopics']}, "
+            f"minutes {row['learned_minutes']} != {row['expected_learned_minutes']}"
+        )
+    if mismatches:
+        raise click.ClickException(f'{len(mismatches)} skill(s) out of sync, run `flask skill-stats rebuild`')
+    click.echo('skill_stats is consistent')
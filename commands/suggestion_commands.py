@@ -0,0 +1,42 @@
+import os
+import time
+
+import click
+from flask.cli import AppGroup
+
+from models.subtopic import Subtopic
+from utils.suggestions import build_index, get_index, get_index_path, write_index
+
+suggestions_cli = AppGroup('suggestions', help='Build and inspect the subtopic suggestion index.')
+
+
+@suggestions_cli.command('build')
+@click.option('--output', type=click.Path(dir_okay=False), help='Index file; defaults to the configured path.')
+@click.option('--top', default=20, show_default=True, help='Titles kept per name token and per category.')
+@click.option('--min-users', default=3, show_default=True,
+              help='Distinct users who must have used a title before it is suggested.')
+def build(output, top, min_users):
+    """Index the subtopic titles users have written, by skill-name token and category"""
+    path = output or get_index_path()
+    started = time.perf_counter()
+    index = build_index(Subtopic.iter_curricula(), top=top, min_users=min_users)
+    write_index(index, path)
+    click.echo(
+        f"Indexed {index['skills']} skill(s): {len(index['tokens'])} token(s), "
+        f"{len(index['categories'])} categor(ies), {os.path.getsize(path) / 1024:.1f} KiB "
+        f"in {time.perf_counter() - started:.2f}s -> {path}"
+    )
+    click.echo('Running workers load the new index when they restart.')
+
+
+@suggestions_cli.command('lookup')
+@click.argument('skill_name')
+@click.option('--category', help='Defaults to what categorize_skill picks for the name.')
+def lookup(skill_name, category):
+    """Show the subtopics create_skill would suggest for SKILL_NAME"""
+    from utils.helpers import categorize_skill
+
+    category = category or categorize_skill(skill_name)
+    click.echo(f'[{category}]')
+    for title in get_index().suggest(skill_name, category):
+        click.echo(f'  {title}')
@@ -1,26 +1,35 @@
 from models.user import User
-from utils.helpers import hash_password, check_password
+from utils.helpers import password_needs_rehash
+from utils.password_hasher import HasherBusy, password_hasher
+
+BUSY_RESPONSE = {'error': 'Server is busy, please try again shortly'}, 503
 
 class AuthController:
     @staticmethod
     def register_user(username, email, password):
         """Register a new user"""
-        # Check if user already exists
-        if User.find_by_username(username):
+        # Check if user already exists (username and email in one lookup)
+        taken = User.find_taken(username, email)
+        if 'username' in taken:
             return {'error': 'Username already exists'}, 400
         
-        if User.find_by_email(email):
+        if 'email' in taken:
             return {'error': 'Email already exists'}, 400
         
         # Validate password length
         if len(password) < 6:
             return {'error': 'Password must be at least 6 characters'}, 400
         
-        # Create new user
+        # Create new user (hashing runs on the bounded password executor)
+        try:
+            password_hash = password_hasher.hash(password)
+        except HasherBusy:
+            return BUSY_RESPONSE
+
         user = User(
             username=username,
             email=email,
-            password_hash=hash_password(password)
+            password_hash=password_hash
         )
         
         if user.save():
@@ -35,8 +44,21 @@ class AuthController:
     def login_user(username, password):
         """Login user and return user data"""
         user = User.find_by_username(username)
-        
-        if user and check_password(password, user.password_hash):
+
+        try:
+            valid = bool(user) and password_hasher.check(password, user.password_hash)
+        except HasherBusy:
+            return BUSY_RESPONSE
+
+        if valid:
+            # upgrade hashes made with an older work factor; if the executor
+            # is busy it simply happens on a later login
+            if password_needs_rehash(user.password_hash):
+                try:
+                    user.update_password_hash(password_hasher.hash(password))
+                except HasherBusy:
+                    pass
+
             return {
                 'user_id': user.id,
                 'username': user.username,
@@ -1,11 +1,39 @@
 from models.skill import Skill
 from models.session import LearningSession
+from models.user_version import UserVersion
+from models.daily_activity import DailyActivity
 from datetime import datetime, timedelta
-from utils.database import get_db_connection
+import os
+from utils.cache import VersionedLRUCache
+from utils.database import get_db_connection, get_db_path
+
+# Assembled dashboards per user, valid while the user's version is unchanged
+dashboard_cache = VersionedLRUCache(
+    max_entries=int(os.environ.get('DASHBOARD_CACHE_MAX_ENTRIES', 1024)),
+    max_bytes=int(os.environ.get('DASHBOARD_CACHE_MAX_BYTES', 32 * 1024 * 1024)),
+    ttl=int(os.environ.get('DASHBOARD_CACHE_TTL', 300))
+)
+
+CALENDAR_DEFAULT_DAYS = 30
+CALENDAR_MAX_DAYS = 366 * 5
 
 class DashboardController:
     @staticmethod
     def get_dashboard_data(user_id):
+        """Get comprehensive dashboard data, served from cache when unchanged"""
+        user_id = int(user_id)
+        # read the version before building so a concurrent write can only
+        # leave the entry looking older than it is, never newer
+        key = (get_db_path(), user_id)
+        version = UserVersion.get(user_id)
+        data = dashboard_cache.get(key, version)
+        if data is None:
+            data = DashboardController._build_dashboard_data(user_id)
+            dashboard_cache.set(key, version, data)
+        return data
+
+    @staticmethod
+    def _build_dashboard_data(user_id):
         """Get comprehensive dashboard data"""
         # Get skills with progress (includes learned_hours now)
         skills_data = Skill.find_by_user(user_id)
@@ -49,31 +77,40 @@ class DashboardController:
         }
     
     @staticmethod
-    def _get_calendar_data(user_id):
-        """Get learning data for calendar view"""
-        conn = get_db_connection()
-        thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-        
-        sessions = conn.execute('''
-            SELECT 
-                DATE(session_date) as date,
-                SUM(duration_minutes) as total_minutes,
-                COUNT(*) as session_count
-            FROM learning_sessions 
-            WHERE user_id = ? AND session_date >= ?
-            GROUP BY DATE(session_date)
-            ORDER BY date DESC
-        ''', (user_id, thirty_days_ago)).fetchall()
-        
-        conn.close()
-        
+    def get_calendar(user_id, date_from=None, date_to=None):
+        """Calendar data for an arbitrary date range (defaults to the last 30 days)"""
+        try:
+            end = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else datetime.now().date()
+            start = (datetime.strptime(date_from, '%Y-%m-%d').date() if date_from
+                     else end - timedelta(days=CALENDAR_DEFAULT_DAYS))
+        except ValueError:
+            return {'error': 'Dates must be formatted as YYYY-MM-DD'}, 400
+
+        if start > end:
+            return {'error': '"from" must not be after "to"'}, 400
+        if (end - start).days > CALENDAR_MAX_DAYS:
+            return {'error': f'Date range is limited to {CALENDAR_MAX_DAYS} days'}, 400
+
+        return {
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'calendar_data': DashboardController._get_calendar_data(
+                user_id, start.isoformat(), end.isoformat()
+            )
+        }, 200
+
+    @staticmethod
+    def _get_calendar_data(user_id, start_day=None, end_day='9999-12-31'):
+        """Get learning data for calendar view from the daily_activity rollup"""
+        if start_day is None:
+            start_day = (datetime.now() - timedelta(days=CALENDAR_DEFAULT_DAYS)).strftime('%Y-%m-%d')
+
         calendar_data = {}
-        for session in sessions:
-            date_str = session['date']
-            calendar_data[date_str] = {
-                'total_minutes': session['total_minutes'],
-                'session_count': session['session_count'],
-                'total_hours': round(session['total_minutes'] / 60, 1)
+        for day in DailyActivity.find_range(user_id, start_day, end_day):
+            calendar_data[day['day']] = {
+                'total_minutes': day['minutes'],
+                'session_count': day['session_count'],
+                'total_hours': round(day['minutes'] / 60, 1)
             }
-        
+
         return calendar_data
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+
+from models.skill import Skill
+from models.subtopic import Subtopic
+from models.session import LearningSession
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_SKILL_PAGE_SIZE = 200
+EXPORT_SESSION_PAGE_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# CSV export is one table: a record_type column plus the union of all fields
+CSV_COLUMNS = [
+    'record_type', 'id', 'user_id', 'skill_id', 'subtopic_id',
+    'name', 'resource_type', 'platform', 'category', 'description', 'target_hours',
+    'rating', 'course_notes', 'title', 'difficulty', 'order_index', 'expected_hours', 'source',
+    'hours_spent', 'status', 'started_at', 'duration_minutes', 'notes', 'session_date',
+    'issued_at', 'certificate_url', 'created_at', 'completed_at'
+]
+
+
+class ExportController:
+    @staticmethod
+    def iter_records(user_id):
+        """
+        Yield (record_type, row) for a user's whole history: each page of
+        skills followed by their subtopics and certificates, then every
+        session. Only one page is held in memory at a time.
+        """
+        for skills in Skill.iter_by_user(user_id, EXPORT_SKILL_PAGE_SIZE):
+            skill_ids = [s['id'] for s in skills]
+            for skill in skills:
+                yield 'skill', skill
+            for subtopic in Subtopic.find_by_skills(skill_ids):
+                yield 'subtopic', subtopic
+            for certificate in LearningSession.find_certificates_by_skills(skill_ids):
+                yield 'certificate', certificate
+
+        for sessions in LearningSession.iter_by_user(user_id, EXPORT_SESSION_PAGE_SIZE):
+            for session in sessions:
+                yield 'session', session
+
+    @staticmethod
+    def stream_export(user_id, fmt='ndjson'):
+        """Generator of ~64 KB text chunks for the requested format"""
+        records = ExportController.iter_records(int(user_id))
+        buffer = io.StringIO()
+
+        if fmt == 'csv':
+            writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+            write = lambda record_type, row: writer.writerow({'record_type': record_type, **row})
+        else:
+            write = lambda record_type, row: buffer.write(json.dumps({'type': record_type, **row}) + '\n')
+
+        for record_type, row in records:
+            write(record_type, row)
+            # flush in chunks rather than per row
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
@@ -0,0 +1,233 @@
+import csv
+import json
+import time
+from datetime import datetime
+
+from models.session import LearningSession
+from models.skill import Skill
+from models.skill_stats import SkillStats
+from models.subtopic import Subtopic
+from models.daily_activity import DailyActivity
+from models.user_version import UserVersion
+from utils.database import UnitOfWork, get_db_connection
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+class ImportController:
+    @staticmethod
+    def import_sessions(user_id, lines, fmt='ndjson'):
+        """
+        Import learning sessions from an iterable of text lines (CSV with a
+        header row, or NDJSON), streaming: rows are validated against a single
+        preloaded map of the user's skills/subtopics and inserted in batches
+        of IMPORT_BATCH_SIZE, each batch in one transaction together with its
+        rollups. Subtopic/skill statuses and certificates are settled once per
+        affected skill at the end.
+        """
+        if fmt not in IMPORT_FORMATS:
+            return {"error": f"Unsupported format, use one of: {', '.join(IMPORT_FORMATS)}"}, 400
+
+        user_id = int(user_id)
+        started = time.perf_counter()
+        owned = ImportController._load_skill_map(user_id)
+
+        imported = 0
+        failed = 0
+        errors = []
+        touched_skills = set()
+        touched_subtopics = set()
+        batch = []
+
+        # batches commit as they go, so settle whatever got in even if a
+        # later one fails
+        try:
+            for line_no, row in ImportController._parse(lines, fmt):
+                session, error = ImportController._validate(user_id, row, owned)
+                if error:
+                    failed += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"line": line_no, "error": error})
+                    continue
+
+                batch.append(session)
+                touched_skills.add(session.skill_id)
+                if session.subtopic_id:
+                    touched_subtopics.add(session.subtopic_id)
+
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    ImportController._insert_batch(batch)
+                    imported += len(batch)
+                    batch = []
+
+            if batch:
+                ImportController._insert_batch(batch)
+                imported += len(batch)
+        finally:
+            if imported:
+                ImportController._settle(user_id, touched_skills, touched_subtopics)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "message": "Import finished",
+            "imported": imported,
+            "failed": failed,
+            "errors": errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round((imported + failed) / elapsed, 1) if elapsed else 0
+        }, 200
+
+    @staticmethod
+    def _load_skill_map(user_id):
+        """{skill_id: {subtopic_id, ...}} for every skill the user owns, in one query"""
+        conn = get_db_connection()
+        rows = conn.execute('''
+            SELECT s.id AS skill_id, st.id AS subtopic_id
+            FROM skills s
+            LEFT JOIN subtopics st ON st.skill_id = s.id
+            WHERE s.user_id = ?
+        ''', (user_id,)).fetchall()
+        conn.close()
+
+        owned = {}
+        for row in rows:
+            subtopics = owned.setdefault(row['skill_id'], set())
+            if row['subtopic_id'] is not None:
+                subtopics.add(row['subtopic_id'])
+        return owned
+
+    @staticmethod
+    def _decode(lines, bad_lines):
+        """Text of each line (bytes are decoded as UTF-8); the numbers of
+        lines that were not valid UTF-8 are added to ``bad_lines``"""
+        for line_no, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                try:
+                    line = line.decode('utf-8')
+                except UnicodeDecodeError:
+                    bad_lines.add(line_no)
+                    line = line.decode('utf-8', 'replace')
+            yield line
+
+    @staticmethod
+    def _parse(lines, fmt):
+        """Yield (line_no, row) pairs; row is a dict, or an error string.
+
+        A line that is not UTF-8 or not valid CSV/JSON fails on its own,
+        like any other bad row; the rest of the input is still imported.
+        """
+        bad_lines = set()
+        lines = ImportController._decode(lines, bad_lines)
+
+        if fmt == 'csv':
+            reader = csv.DictReader(lines)
+            # DictReader.line_num only moves on a good row; count on the raw reader
+            raw = reader.reader
+            while True:
+                first = raw.line_num + 1
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    yield raw.line_num, f"Invalid CSV: {e}"
+                    continue
+                # a quoted field can span lines; the row fails if any of them did
+                if any(n in bad_lines for n in range(first, raw.line_num + 1)):
+                    yield raw.line_num, "Invalid UTF-8"
+                    continue
+                yield raw.line_num, row
+
+        for line_no, line in enumerate(lines, start=1):
+            if line_no in bad_lines:
+                yield line_no, "Invalid UTF-8"
+                continue
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_no, "Invalid JSON"
+                continue
+            yield line_no, row if isinstance(row, dict) else "Expected a JSON object"
+
+    @staticmethod
+    def _validate(user_id, row, owned):
+        if isinstance(row, str):
+            return None, row
+
+        try:
+            skill_id = int(row.get("skill_id"))
+        except (TypeError, ValueError):
+            return None, "skill_id is required"
+        if skill_id not in owned:
+            return None, "Skill not found"
+
+        subtopic_id = row.get("subtopic_id") or None
+        if subtopic_id is not None:
+            try:
+                subtopic_id = int(subtopic_id)
+            except (TypeError, ValueError):
+                return None, "Invalid subtopic_id"
+            if subtopic_id not in owned[skill_id]:
+                return None, "Subtopic does not belong to this skill"
+
+        try:
+            mins = int(row.get("duration_minutes"))
+        except (TypeError, ValueError):
+            mins = 0
+        if mins <= 0:
+            return None, "Invalid duration"
+
+        session_date = row.get("session_date") or None
+        if session_date is not None:
+            try:
+                datetime.fromisoformat(session_date)
+            except (TypeError, ValueError):
+                return None, "Invalid session_date"
+
+        return LearningSession(
+            user_id=user_id,
+            skill_id=skill_id,
+            subtopic_id=subtopic_id,
+            duration_minutes=mins,
+            notes=row.get("notes") or None,
+            session_date=session_date
+        ), None
+
+    @staticmethod
+    def _insert_batch(sessions):
+        with UnitOfWork() as uow:
+            cursor = uow.conn.cursor()
+            last_id = LearningSession.insert_many(cursor, sessions)
+            Subtopic.add_sessions_time_since(cursor, last_id)
+            SkillStats.add_sessions_since(cursor, last_id)
+            DailyActivity.add_sessions_since(cursor, last_id)
+
+    @staticmethod
+    def _settle(user_id, skill_ids, subtopic_ids):
+        """Status changes add_learning_session would have made, once per skill"""
+        now = datetime.now().isoformat()
+        with UnitOfWork() as uow:
+            cursor = uow.conn.cursor()
+            cursor.executemany(
+                """UPDATE subtopics SET status = 'in-progress', started_at = COALESCE(started_at, ?)
+                   WHERE id = ? AND status = 'to-learn'""",
+                [(now, subtopic_id) for subtopic_id in subtopic_ids]
+            )
+            cursor.executemany(
+                "UPDATE skills SET status = 'in-progress' WHERE id = ? AND status = 'not-started'",
+                [(skill_id,) for skill_id in skill_ids]
+            )
+
+            for skill_id in skill_ids:
+                if not SkillStats.find_by_skill(skill_id).all_completed:
+                    continue
+                skill = Skill.find_by_id(skill_id)
+                if skill.status != "completed":
+                    skill.mark_completed()
+                    LearningSession.create_certificate(user_id, skill.id)
+
+            UserVersion.bump(user_id)
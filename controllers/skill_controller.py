@@ -1,8 +1,17 @@
 from models.skill import Skill
 from models.subtopic import Subtopic
 from models.session import LearningSession
-from utils.helpers import categorize_skill, suggest_subtopics
-from utils.database import get_db_connection
+from models.skill_stats import SkillStats
+from models.user_version import UserVersion
+from models.daily_activity import DailyActivity
+from utils.helpers import categorize_skill
+from utils.suggestions import suggest_subtopics
+from utils.database import UnitOfWork, get_db_connection
+from utils.pagination import page_response, parse_page_args
+
+SKILL_STATUSES = ('not-started', 'in-progress', 'completed')
+# query arguments list_skills understands; any of them selects the paginated response
+SKILL_LIST_ARGS = ('limit', 'cursor', 'status', 'category', 'from', 'to')
 
 
 class SkillController:
@@ -21,7 +30,7 @@ class SkillController:
             skill_data.get("description", "")
         )
 
-        # 2. Create skill row
+        # 2. Build skill row (saved together with its subtopics below)
         skill = Skill(
             user_id=user_id,
             name=skill_data["name"],
@@ -32,9 +41,6 @@ class SkillController:
             description=skill_data.get("description", "")
         )
 
-        if not skill.save():
-            return {"error": "Failed to create skill"}, 500
-
         # 3. Clean user-entered topics
         user_topics = skill_data.get("user_subtopics", [])
         cleaned_user_topics = [
@@ -45,9 +51,13 @@ class SkillController:
             for st in user_topics if st.get("title", "").strip()
         ]
 
-        # 4. AI topics
+        # 4. AI topics (from the suggestion index), minus ones the user already typed
+        typed = {t["title"].lower() for t in cleaned_user_topics}
         ai_titles = suggest_subtopics(skill_data["name"], category)
-        ai_topics = [{"title": t, "description": ""} for t in ai_titles]
+        ai_topics = [
+            {"title": t, "description": "", "source": "suggested"}
+            for t in ai_titles if t.lower() not in typed
+        ]
 
         # 5. Merge: user topics first → AI topics after
         final_subtopics = cleaned_user_topics + ai_topics
@@ -56,22 +66,29 @@ class SkillController:
         target_hours = float(skill.target_hours or 0)
         expected_each = round(target_hours / total_subs, 1) if total_subs > 0 else 0
 
-        # 6. Save all subtopics
-        for index, topic in enumerate(final_subtopics):
-            st = Subtopic(
-                skill_id=skill.id,
+        # 6. Save skill and all subtopics in one transaction
+        subtopics = [
+            Subtopic(
                 title=topic["title"],
                 description=topic["description"],
                 order_index=index,
+                source=topic.get("source", "user"),
                 expected_hours=expected_each
             )
-            st.save()
+            for index, topic in enumerate(final_subtopics)
+        ]
+        created = skill.save_with_subtopics(subtopics)
+        if created is None:
+            return {"error": "Failed to create skill"}, 500
+
+        UserVersion.bump(user_id)
 
         return {
             "message": "Skill created successfully",
             "skill_id": skill.id,
             "category": category,
-            "subtopics_created": total_subs
+            "subtopics_created": total_subs,
+            "subtopics": [st.to_dict() for st in created]
         }, 201
 
     
@@ -81,6 +98,63 @@ class SkillController:
         return skills, 200
 
     
+    @staticmethod
+    def list_skills(user_id, args):
+        """
+        One page of the user's skills, newest first. Supports ``limit``,
+        ``cursor`` (from the previous page's ``next_cursor``), ``status``,
+        ``category`` and a ``from``/``to`` creation date range.
+        """
+        try:
+            page = parse_page_args(args, 2)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        status = args.get("status")
+        if status and status not in SKILL_STATUSES:
+            return {"error": f"status must be one of: {', '.join(SKILL_STATUSES)}"}, 400
+
+        rows = Skill.find_page(
+            user_id,
+            page["limit"],
+            after=page["after"],
+            status=status,
+            category=args.get("category"),
+            date_from=page["date_from"],
+            date_before=page["date_before"]
+        )
+        return page_response(rows, page["limit"], lambda row: (row["created_at"], row["id"])), 200
+
+    
+    @staticmethod
+    def list_sessions(user_id, args):
+        """
+        One page of the user's learning sessions, newest first. Supports
+        ``limit``, ``cursor``, ``skill_id``, ``category`` and a ``from``/``to``
+        session date range.
+        """
+        try:
+            page = parse_page_args(args, 2)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        try:
+            skill_id = int(args["skill_id"]) if args.get("skill_id") else None
+        except ValueError:
+            return {"error": "skill_id must be an integer"}, 400
+
+        rows = LearningSession.find_page(
+            user_id,
+            page["limit"],
+            after=page["after"],
+            skill_id=skill_id,
+            category=args.get("category"),
+            date_from=page["date_from"],
+            date_before=page["date_before"]
+        )
+        return page_response(rows, page["limit"], lambda row: (row["session_date"], row["id"])), 200
+
+    
     @staticmethod
     def get_skill_detail(user_id, skill_id):
         skill = Skill.find_by_id(skill_id, user_id)
@@ -93,74 +167,76 @@ class SkillController:
         response = skill.to_dict()
         response["subtopics"] = [s.to_dict() for s in subtopics]
 
-        # compute progress
-        total = len(subtopics)
-        completed = sum(1 for s in subtopics if s.status == "completed")
-        response["progress"] = round((completed / total * 100), 1) if total else 0
-
-        # compute learned hours
-        try:
-            conn = get_db_connection()
-            row = conn.execute(
-                """SELECT COALESCE(SUM(duration_minutes), 0) AS total_minutes
-                   FROM learning_sessions WHERE skill_id=?""",
-                (skill_id,)
-            ).fetchone()
-            conn.close()
-            response["learned_hours"] = round((row["total_minutes"] or 0) / 60, 1)
-        except:
-            response["learned_hours"] = 0
+        # progress and learned hours from the rollup
+        stats = SkillStats.find_by_skill(skill_id)
+        response["progress"] = stats.progress
+        response["learned_hours"] = stats.learned_hours
 
         return response, 200
 
     
     @staticmethod
     def update_subtopic_status(user_id, subtopic_id, new_status):
-        subtopic = Subtopic.find_by_id(subtopic_id)
-        if not subtopic:
-            return {"error": "Subtopic not found"}, 404
-
-        skill = Skill.find_by_id(subtopic.skill_id, user_id)
-        if not skill:
-            return {"error": "Access denied"}, 403
-
-        # Validation: cannot mark complete without hours logged
-        if new_status == "completed":
-            if float(subtopic.expected_hours or 0) == 0 or float(subtopic.hours_spent or 0) == 0:
-                return {"error": "Please log time before marking complete."}, 422
-
-        # Update status
-        updated = subtopic.update_status(new_status)
-        if not updated:
-            return {"error": "Failed updating subtopic."}, 500
-
-        # Auto-create a tiny session for dashboards if marking complete
-        if new_status == "completed":
-            LearningSession(
-                user_id=user_id,
-                skill_id=subtopic.skill_id,
-                subtopic_id=subtopic_id,
-                duration_minutes=1,
-                notes="Auto-completion"
-            ).save()
-
-        # Check if all subtopics completed
-        if new_status == "completed":
-            all_subs = Subtopic.find_by_skill(subtopic.skill_id)
-            if all(s.status == "completed" for s in all_subs):
-                skill.mark_completed()
-                LearningSession.create_certificate(user_id, skill.id)
-
-                return {
-                    "message": "Skill fully completed!",
-                    "skill_completed": True,
-                    "skill_id": skill.id
-                }, 200
-
-        # If user starts topic, update parent skill status
-        if new_status == "in-progress" and skill.status == "not-started":
-            skill.status = "in-progress"
-            skill.save()
+        # one transaction for the lookup, status change, auto-session and
+        # skill completion, so concurrent requests cannot interleave
+        with UnitOfWork() as uow:
+            subtopic = Subtopic.find_by_id(subtopic_id)
+            if not subtopic:
+                return {"error": "Subtopic not found"}, 404
+
+            skill = Skill.find_by_id(subtopic.skill_id, user_id)
+            if not skill:
+                return {"error": "Access denied"}, 403
+
+            # Validation: cannot mark complete without hours logged
+            if new_status == "completed":
+                if float(subtopic.expected_hours or 0) == 0 or float(subtopic.hours_spent or 0) == 0:
+                    return {"error": "Please log time before marking complete."}, 422
+
+            # Update status
+            updated = subtopic.update_status(new_status)
+            if not updated:
+                uow.rollback()
+                return {"error": "Failed updating subtopic."}, 500
+
+            # Auto-create a tiny session for dashboards if marking complete
+            if new_status == "completed":
+                saved = LearningSession(
+                    user_id=user_id,
+                    skill_id=subtopic.skill_id,
+                    subtopic_id=subtopic_id,
+                    duration_minutes=1,
+                    notes="Auto-completion"
+                ).save()
+                if not saved:
+                    uow.rollback()
+                    return {"error": "Failed updating subtopic."}, 500
+
+            # Check if all subtopics completed
+            if new_status == "completed":
+                if SkillStats.find_by_skill(subtopic.skill_id).all_completed:
+                    if not (skill.mark_completed()
+                            and LearningSession.create_certificate(user_id, skill.id)
+                            and UserVersion.bump(user_id)):
+                        uow.rollback()
+                        return {"error": "Failed completing skill."}, 500
+
+                    return {
+                        "message": "Skill fully completed!",
+                        "skill_completed": True,
+                        "skill_id": skill.id
+                    }, 200
+
+            # If user starts topic, update parent skill status
+            if new_status == "in-progress" and skill.status == "not-started":
+                skill.status = "in-progress"
+                if not skill.save():
+                    uow.rollback()
+                    return {"error": "Failed updating skill."}, 500
+
+            if not UserVersion.bump(user_id):
+                uow.rollback()
+                return {"error": "Failed updating subtopic."}, 500
 
         return {"message": "Subtopic updated"}, 200
 
@@ -174,6 +250,7 @@ class SkillController:
         skill.rating = rating
         skill.course_notes = notes
         skill.save()
+        UserVersion.bump(user_id)
 
         return {"message": "Review saved successfully"}, 200
 
@@ -188,37 +265,57 @@ class SkillController:
         if mins <= 0:
             return {"error": "Invalid duration"}, 422
 
-        session = LearningSession(
-            user_id=user_id,
-            skill_id=data["skill_id"],
-            subtopic_id=data.get("subtopic_id"),
-            duration_minutes=mins,
-            notes=data.get("notes"),
-            session_date=data.get("session_date")
-        )
+        # one transaction for the whole chain; hours_spent is incremented in SQL
+        with UnitOfWork() as uow:
+            # ownership is checked up front: an unknown id is the client's
+            # error, not a foreign key failure in save()
+            skill = Skill.find_by_id(data["skill_id"], user_id)
+            if not skill:
+                return {"error": "Skill not found"}, 404
+
+            st = None
+            if data.get("subtopic_id"):
+                st = Subtopic.find_by_id(data["subtopic_id"])
+                if not st or st.skill_id != skill.id:
+                    return {"error": "Subtopic not found"}, 404
+
+            session = LearningSession(
+                user_id=user_id,
+                skill_id=skill.id,
+                subtopic_id=st.id if st else None,
+                duration_minutes=mins,
+                notes=data.get("notes"),
+                session_date=data.get("session_date")
+            )
 
-        if not session.save():
-            return {"error": "Failed saving session"}, 500
+            if not session.save():
+                uow.rollback()
+                return {"error": "Failed saving session"}, 500
 
-        # add minutes to subtopic
-        if data.get("subtopic_id"):
-            st = Subtopic.find_by_id(data["subtopic_id"])
+            # add minutes to subtopic
             if st:
-                st.add_time(mins)
-                if st.status == "to-learn":
-                    st.update_status("in-progress")
-
-        # update skill status
-        skill = Skill.find_by_id(data["skill_id"])
-        if skill and skill.status == "not-started":
-            skill.status = "in-progress"
-            skill.save()
-
-        # check full completion
-        all_subs = Subtopic.find_by_skill(data["skill_id"])
-        if all(s.status == "completed" for s in all_subs):
-            skill.mark_completed()
-            LearningSession.create_certificate(user_id, skill.id)
+                if not st.add_time(mins) or (
+                        st.status == "to-learn" and not st.update_status("in-progress")):
+                    uow.rollback()
+                    return {"error": "Failed updating subtopic"}, 500
+
+            # update skill status
+            if skill.status == "not-started":
+                skill.status = "in-progress"
+                if not skill.save():
+                    uow.rollback()
+                    return {"error": "Failed updating skill"}, 500
+
+            # check full completion
+            if SkillStats.find_by_skill(skill.id).all_completed:
+                if not (skill.mark_completed()
+                        and LearningSession.create_certificate(user_id, skill.id)):
+                    uow.rollback()
+                    return {"error": "Failed completing skill"}, 500
+
+            if not UserVersion.bump(user_id):
+                uow.rollback()
+                return {"error": "Failed saving session"}, 500
 
         return {"message": "Session added"}, 201
 
@@ -233,13 +330,18 @@ class SkillController:
             conn = get_db_connection()
             cursor = conn.cursor()
 
+            # sessions reference both the skill and its subtopics (foreign_keys is on)
+            DailyActivity.remove_skill_sessions(cursor, skill_id)
+            cursor.execute("DELETE FROM learning_sessions WHERE skill_id=?", (skill_id,))
             cursor.execute("DELETE FROM subtopics WHERE skill_id=?", (skill_id,))
             cursor.execute("DELETE FROM certificates WHERE skill_id=?", (skill_id,))
+            SkillStats.delete(cursor, skill_id)
             cursor.execute("DELETE FROM skills WHERE id=?", (skill_id,))
 
             conn.commit()
             conn.close()
 
+            UserVersion.bump(user_id)
             return {"message": "Skill deleted"}, 200
 
         except Exception as e:
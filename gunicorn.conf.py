@@ -0,0 +1,76 @@
+"""Production gunicorn settings, picked up automatically from the working directory.
+
+    gunicorn app:app
+
+The app is imported once in the master (``preload_app``) and forked, so
+workers start instantly and share the compiled regexes, the suggestion
+index and the rest of the imported code copy-on-write. Every setting can
+be overridden through the environment:
+
+  WEB_CONCURRENCY             worker processes (default: one per CPU)
+  SKILLSTACK_GUNICORN_THREADS request threads per worker (default 4)
+  SKILLSTACK_WORKER_CLASS     gunicorn worker class (default gthread)
+  SKILLSTACK_MAX_REQUESTS     recycle a worker after this many requests (default 2000, 0 = never)
+  SKILLSTACK_TIMEOUT          seconds before a stuck worker is killed (default 30)
+  PORT                        listen port (default 5000)
+
+Threads: on one CPU, with 8 clients reading while 2 others log in
+(benchmarks/bench_serving_modes), a worker served 12 reads/s with the sync
+class, 21 with 2 threads, 330 with 4 and 290 with 8. bcrypt blocks a whole
+sync worker, while with threads it only occupies one of them (it releases
+the GIL). More threads than the connection pool (SKILLSTACK_DB_POOL_SIZE)
+only adds GIL contention.
+
+No threaded worker copes with clients that trickle their request bodies.
+If the app is exposed without a buffering proxy (nginx, a cloud load
+balancer), serve ``asgi:asgi_app`` instead (see asgi.py).
+"""
+import gc
+import multiprocessing
+import os
+
+_cpus = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', _cpus))
+worker_class = os.environ.get('SKILLSTACK_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('SKILLSTACK_GUNICORN_THREADS', 4))
+preload_app = True
+
+# Recycle workers now and then to bound slow leaks; the jitter keeps them
+# from all restarting at the same moment.
+max_requests = int(os.environ.get('SKILLSTACK_MAX_REQUESTS', 2000))
+max_requests_jitter = max_requests // 10
+timeout = int(os.environ.get('SKILLSTACK_TIMEOUT', 30))
+# in-flight requests (a CSV export, a bulk import) get this long to finish on restart
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = os.environ.get('SKILLSTACK_ACCESS_LOG')
+errorlog = '-'
+
+# Every worker has its own bcrypt pool (utils.password_hasher). Split the
+# CPUs between them instead of giving each worker one thread per CPU.
+os.environ.setdefault('SKILLSTACK_HASH_WORKERS', str(max(1, _cpus // max(workers, 1))))
+
+
+def when_ready(server):
+    """Master, after preloading: warm shared state, then drop DB handles"""
+    from app import app
+    from utils.database import close_all_connections
+    from utils.suggestions import get_index
+
+    with app.app_context():
+        get_index()
+    # the master never serves requests; nothing it opened should reach a worker
+    close_all_connections()
+    # keep the preloaded objects out of the collector's reach, so the workers'
+    # garbage collections do not touch (and copy) the pages they live on
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Worker: never reuse a SQLite connection that crossed the fork"""
+    from utils.database import reset_after_fork
+
+    reset_after_fork()
@@ -0,0 +1,97 @@
+from utils.database import get_db_connection
+
+
+class DailyActivity:
+    """Per-user, per-day totals of learning sessions (calendar rollup).
+
+    Maintained on the writer's cursor whenever sessions are inserted or
+    deleted, so it commits together with the sessions themselves. Sessions
+    whose date SQLite cannot parse are left out, as they were from the old
+    ``GROUP BY DATE(session_date)`` calendar.
+    """
+
+    @staticmethod
+    def create_table(cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_activity (
+                user_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                minutes INTEGER NOT NULL DEFAULT 0,
+                session_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, day),
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            ) WITHOUT ROWID
+        ''')
+
+    @staticmethod
+    def add_session(cursor, session_id):
+        """Count a just-inserted learning session"""
+        cursor.execute('''
+            INSERT INTO daily_activity (user_id, day, minutes, session_count)
+            SELECT user_id, DATE(session_date), duration_minutes, 1
+            FROM learning_sessions
+            WHERE id = ? AND DATE(session_date) IS NOT NULL
+            ON CONFLICT (user_id, day) DO UPDATE SET
+                minutes = minutes + excluded.minutes,
+                session_count = session_count + excluded.session_count
+        ''', (session_id,))
+
+    @staticmethod
+    def add_sessions_since(cursor, after_id):
+        """Count every session inserted with an id above ``after_id`` (bulk inserts)"""
+        cursor.execute('''
+            INSERT INTO daily_activity (user_id, day, minutes, session_count)
+            SELECT user_id, DATE(session_date), SUM(duration_minutes), COUNT(*)
+            FROM learning_sessions
+            WHERE id > ? AND DATE(session_date) IS NOT NULL
+            GROUP BY user_id, DATE(session_date)
+            ON CONFLICT (user_id, day) DO UPDATE SET
+                minutes = minutes + excluded.minutes,
+                session_count = session_count + excluded.session_count
+        ''', (after_id,))
+
+    @staticmethod
+    def remove_skill_sessions(cursor, skill_id):
+        """Uncount every session of a skill; run before deleting them"""
+        cursor.execute('''
+            UPDATE daily_activity
+            SET minutes = minutes - x.removed_minutes,
+                session_count = session_count - x.removed_sessions
+            FROM (
+                SELECT user_id, DATE(session_date) AS day,
+                       SUM(duration_minutes) AS removed_minutes, COUNT(*) AS removed_sessions
+                FROM learning_sessions
+                WHERE skill_id = ? AND DATE(session_date) IS NOT NULL
+                GROUP BY user_id, DATE(session_date)
+            ) AS x
+            WHERE daily_activity.user_id = x.user_id AND daily_activity.day = x.day
+        ''', (skill_id,))
+        cursor.execute('''
+            DELETE FROM daily_activity
+            WHERE user_id IN (SELECT user_id FROM learning_sessions WHERE skill_id = ?)
+              AND session_count <= 0
+        ''', (skill_id,))
+
+    @staticmethod
+    def rebuild(cursor):
+        cursor.execute('DELETE FROM daily_activity')
+        cursor.execute('''
+            INSERT INTO daily_activity (user_id, day, minutes, session_count)
+            SELECT user_id, DATE(session_date), SUM(duration_minutes), COUNT(*)
+            FROM learning_sessions
+            WHERE DATE(session_date) IS NOT NULL
+            GROUP BY user_id, DATE(session_date)
+        ''')
+
+    @staticmethod
+    def find_range(user_id, start_day, end_day):
+        """Days with activity between two 'YYYY-MM-DD' dates (inclusive), newest first"""
+        conn = get_db_connection()
+        rows = conn.execute('''
+            SELECT day, minutes, session_count
+            FROM daily_activity
+            WHERE user_id = ? AND day BETWEEN ? AND ?
+            ORDER BY day DESC
+        ''', (user_id, start_day, end_day)).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
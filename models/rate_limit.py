@@ -0,0 +1,52 @@
+from utils.database import get_db_connection
+
+
+class RateLimitBucket:
+    """Token buckets shared by every worker through SQLite.
+
+    Each row holds a bucket's token count as of ``updated_at`` (a Unix
+    timestamp); refill is computed lazily on the next hit. A bucket that
+    has been idle long enough to refill completely is equivalent to no row
+    at all, so such rows can be pruned at any time.
+    """
+
+    @staticmethod
+    def create_table(cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                bucket TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                allowed INTEGER NOT NULL DEFAULT 1
+            ) WITHOUT ROWID
+        ''')
+
+    @staticmethod
+    def take(bucket, rate, burst, now):
+        """Refill, then take one token if there is one; returns (allowed, tokens left)"""
+        conn = get_db_connection()
+        try:
+            row = conn.execute('''
+                INSERT INTO rate_limits (bucket, tokens, updated_at, allowed)
+                VALUES (:bucket, :burst - 1, :now, 1)
+                ON CONFLICT (bucket) DO UPDATE SET
+                    allowed = MIN(:burst, tokens + (:now - updated_at) * :rate) >= 1,
+                    tokens = MIN(:burst, tokens + (:now - updated_at) * :rate)
+                             - (MIN(:burst, tokens + (:now - updated_at) * :rate) >= 1),
+                    updated_at = :now
+                RETURNING allowed, tokens
+            ''', {'bucket': bucket, 'burst': burst, 'now': now, 'rate': rate}).fetchone()
+            conn.commit()
+            return bool(row['allowed']), row['tokens']
+        finally:
+            conn.close()
+
+    @staticmethod
+    def prune(before):
+        """Drop buckets untouched since ``before`` (they have refilled completely)"""
+        conn = get_db_connection()
+        try:
+            conn.execute('DELETE FROM rate_limits WHERE updated_at < ?', (before,))
+            conn.commit()
+        finally:
+            conn.close()
@@ -1,6 +1,15 @@
 from utils.database import get_db_connection
+from models.skill_stats import SkillStats
+from models.daily_activity import DailyActivity
+
+COLUMNS = ('id', 'user_id', 'skill_id', 'subtopic_id', 'duration_minutes', 'notes', 'session_date')
+# session list rows: every column plus the skill and subtopic names
+LIST_KEYS = COLUMNS + ('skill_name', 'subtopic_title')
+SELECT_LIST = ', '.join(f'ls.{c}' for c in COLUMNS) + ', s.name AS skill_name, st.title AS subtopic_title'
 
 class LearningSession:
+    __slots__ = COLUMNS
+
     def __init__(self, id=None, user_id=None, skill_id=None, subtopic_id=None, 
                  duration_minutes=0, notes=None, session_date=None):
         self.id = id
@@ -12,9 +21,7 @@ class LearningSession:
         self.session_date = session_date
 
     @staticmethod
-    def create_table():
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def create_table(cursor):
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS learning_sessions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -41,8 +48,6 @@ class LearningSession:
                 FOREIGN KEY (skill_id) REFERENCES skills (id)
             )
         ''')
-        conn.commit()
-        conn.close()
 
     def save(self):
         conn = get_db_connection()
@@ -50,10 +55,12 @@ class LearningSession:
         try:
             cursor.execute('''
                 INSERT INTO learning_sessions (user_id, skill_id, subtopic_id, duration_minutes, notes, session_date)
-                VALUES (?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
             ''', (self.user_id, self.skill_id, self.subtopic_id, self.duration_minutes, 
                   self.notes, self.session_date))
             self.id = cursor.lastrowid
+            SkillStats.apply(cursor, self.skill_id, minutes=self.duration_minutes)
+            DailyActivity.add_session(cursor, self.id)
             conn.commit()
             return True
         except Exception as e:
@@ -62,11 +69,27 @@ class LearningSession:
         finally:
             conn.close()
 
+    @staticmethod
+    def insert_many(cursor, sessions):
+        """Bulk insert on the caller's cursor; rollups are left to the caller.
+
+        Returns the highest session id that existed before the insert, so
+        the new rows are exactly those with a larger id (the caller holds
+        the write lock).
+        """
+        last_id = cursor.execute('SELECT COALESCE(MAX(id), 0) FROM learning_sessions').fetchone()[0]
+        cursor.executemany('''
+            INSERT INTO learning_sessions (user_id, skill_id, subtopic_id, duration_minutes, notes, session_date)
+            VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+        ''', [(s.user_id, s.skill_id, s.subtopic_id, s.duration_minutes, s.notes, s.session_date)
+              for s in sessions])
+        return last_id
+
     @staticmethod
     def find_by_user(user_id, limit=10):
         conn = get_db_connection()
-        sessions = conn.execute('''
-            SELECT ls.*, s.name as skill_name, st.title as subtopic_title
+        sessions = conn.execute(f'''
+            SELECT {SELECT_LIST}
             FROM learning_sessions ls
             JOIN skills s ON ls.skill_id = s.id
             LEFT JOIN subtopics st ON ls.subtopic_id = st.id
@@ -75,7 +98,119 @@ class LearningSession:
             LIMIT ?
         ''', (user_id, limit)).fetchall()
         conn.close()
-        return [dict(session) for session in sessions]
+        return [dict(zip(LIST_KEYS, session)) for session in sessions]
+
+    @staticmethod
+    def find_page(user_id, limit, after=None, skill_id=None, category=None,
+                  date_from=None, date_before=None):
+        """One page of a user's sessions, newest first.
+
+        Keyset-paginated on (session_date, id) over the
+        (user_id, session_date, id) index; ``after`` is the pair from the
+        last row of the previous page. Legacy rows without a session_date
+        sort last (their cursor carries a None date) and are skipped when a
+        date range is given. Fetches ``limit + 1`` rows so the caller can
+        tell whether another page follows.
+        """
+        clauses = ['ls.user_id = ?']
+        params = [user_id]
+        if skill_id:
+            clauses.append('ls.skill_id = ?')
+            params.append(skill_id)
+        if category:
+            clauses.append('s.category = ?')
+            params.append(category)
+
+        conn = get_db_connection()
+        query = f'''
+            SELECT {SELECT_LIST}
+            FROM learning_sessions ls
+            JOIN skills s ON ls.skill_id = s.id
+            LEFT JOIN subtopics st ON ls.subtopic_id = st.id
+            WHERE {{}}
+            ORDER BY ls.session_date DESC, ls.id DESC
+            LIMIT ?
+        '''
+
+        rows = []
+        if after is None or after[0] is not None:
+            dated = clauses + ['ls.session_date IS NOT NULL']
+            dated_params = list(params)
+            if after:
+                dated.append('(ls.session_date, ls.id) < (?, ?)')
+                dated_params.extend(after)
+            if date_from:
+                dated.append('ls.session_date >= ?')
+                dated_params.append(date_from)
+            if date_before:
+                dated.append('ls.session_date < ?')
+                dated_params.append(date_before)
+            rows = conn.execute(
+                query.format(' AND '.join(dated)), dated_params + [limit + 1]
+            ).fetchall()
+
+        if len(rows) <= limit and not (date_from or date_before):
+            undated = clauses + ['ls.session_date IS NULL']
+            undated_params = list(params)
+            if after and after[0] is None:
+                undated.append('ls.id < ?')
+                undated_params.append(after[1])
+            rows += conn.execute(
+                query.format(' AND '.join(undated)), undated_params + [limit + 1 - len(rows)]
+            ).fetchall()
+
+        conn.close()
+        return [dict(zip(LIST_KEYS, row)) for row in rows]
+
+    @staticmethod
+    def iter_by_user(user_id, page_size=1000):
+        """Yield pages (lists of row dicts) of all a user's sessions, oldest first.
+
+        Keyset-paginated on (session_date, id) over the (user_id, session_date)
+        index. Legacy rows without a session_date come first.
+        """
+        conn = get_db_connection()
+        last_id = 0
+        while True:
+            rows = conn.execute('''
+                SELECT * FROM learning_sessions
+                WHERE user_id = ? AND session_date IS NULL AND id > ?
+                ORDER BY id
+                LIMIT ?
+            ''', (user_id, last_id, page_size)).fetchall()
+            if not rows:
+                break
+            yield [dict(row) for row in rows]
+            last_id = rows[-1]['id']
+
+        # no lower bound on the first page: a date stored as a number (NUMERIC
+        # affinity) sorts before every text date, so no seed value is safe
+        keyset, params = 'session_date IS NOT NULL', ()
+        while True:
+            rows = conn.execute(f'''
+                SELECT * FROM learning_sessions
+                WHERE user_id = ? AND {keyset}
+                ORDER BY session_date, id
+                LIMIT ?
+            ''', (user_id, *params, page_size)).fetchall()
+            if not rows:
+                break
+            yield [dict(row) for row in rows]
+            keyset, params = '(session_date, id) > (?, ?)', (rows[-1]['session_date'], rows[-1]['id'])
+        conn.close()
+
+    @staticmethod
+    def find_certificates_by_skills(skill_ids):
+        if not skill_ids:
+            return []
+        conn = get_db_connection()
+        placeholders = ', '.join('?' * len(skill_ids))
+        rows = conn.execute(
+            f'SELECT * FROM certificates WHERE skill_id IN ({placeholders}) ORDER BY skill_id, id',
+            tuple(skill_ids)
+        ).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
 
     @staticmethod
     def create_certificate(user_id, skill_id):
@@ -1,6 +1,22 @@
 from utils.database import get_db_connection
+from models.skill_stats import SkillStats
+from models.subtopic import Subtopic
+
+# every column, in the order Skill.from_row unpacks them
+COLUMNS = ('id', 'user_id', 'name', 'resource_type', 'platform', 'status', 'target_hours',
+           'created_at', 'completed_at', 'category', 'description', 'rating', 'course_notes')
+SELECT_COLUMNS = ', '.join(COLUMNS)
+# list rows: the columns plus the skill_stats counters; learned_minutes
+# is selected last and left out of the dict (it becomes learned_hours)
+PROGRESS_KEYS = COLUMNS + ('total_subtopics', 'completed_subtopics')
+SELECT_PROGRESS = ', '.join(f's.{c}' for c in COLUMNS) + ''',
+                   COALESCE(ss.total_subtopics, 0) AS total_subtopics,
+                   COALESCE(ss.completed_subtopics, 0) AS completed_subtopics,
+                   COALESCE(ss.learned_minutes, 0) AS learned_minutes'''
 
 class Skill:
+    __slots__ = COLUMNS
+
     def __init__(
         self,
         id=None,
@@ -32,10 +48,16 @@ class Skill:
         self.course_notes = course_notes
 
     @staticmethod
-    def create_table():
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def from_row(row):
+        """Instance from a row selected as SELECT_COLUMNS, mapped by position"""
+        skill = Skill.__new__(Skill)
+        (skill.id, skill.user_id, skill.name, skill.resource_type, skill.platform, skill.status,
+         skill.target_hours, skill.created_at, skill.completed_at, skill.category, skill.description,
+         skill.rating, skill.course_notes) = row
+        return skill
 
+    @staticmethod
+    def create_table(cursor):
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS skills (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -55,9 +77,6 @@ class Skill:
             )
         ''')
 
-        conn.commit()
-        conn.close()
-
     def save(self):
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -85,28 +104,7 @@ class Skill:
                     )
                 )
             else:
-                cursor.execute(
-                    '''
-                    INSERT INTO skills (
-                        user_id, name, resource_type, platform, status,
-                        target_hours, category, description, rating, course_notes
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''',
-                    (
-                        self.user_id,
-                        self.name,
-                        self.resource_type,
-                        self.platform,
-                        self.status,
-                        self.target_hours,
-                        self.category,
-                        self.description,
-                        self.rating,
-                        self.course_notes
-                    )
-                )
-                self.id = cursor.lastrowid
+                self._insert(cursor)
 
             conn.commit()
             return True
@@ -118,6 +116,53 @@ class Skill:
         finally:
             conn.close()
 
+    def _insert(self, cursor):
+        cursor.execute(
+            '''
+            INSERT INTO skills (
+                user_id, name, resource_type, platform, status,
+                target_hours, category, description, rating, course_notes
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''',
+            (
+                self.user_id,
+                self.name,
+                self.resource_type,
+                self.platform,
+                self.status,
+                self.target_hours,
+                self.category,
+                self.description,
+                self.rating,
+                self.course_notes
+            )
+        )
+        self.id = cursor.lastrowid
+        SkillStats.apply(cursor, self.id)
+
+    def save_with_subtopics(self, subtopics):
+        """Insert this skill and all its subtopics in a single transaction.
+
+        ``subtopics`` are unsaved Subtopic instances. Returns the stored
+        subtopics (with ids), or None if nothing was written.
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            self._insert(cursor)
+            created = Subtopic.insert_many(cursor, self.id, subtopics)
+            conn.commit()
+            return created
+
+        except Exception as e:
+            print("Error saving skill:", e)
+            self.id = None
+            return None
+
+        finally:
+            conn.close()
+
     @staticmethod
     def find_by_id(skill_id, user_id=None):
         conn = get_db_connection()
@@ -125,61 +170,163 @@ class Skill:
 
         if user_id:
             row = cursor.execute(
-                "SELECT * FROM skills WHERE id = ? AND user_id = ?",
+                f"SELECT {SELECT_COLUMNS} FROM skills WHERE id = ? AND user_id = ?",
                 (skill_id, user_id)
             ).fetchone()
         else:
             row = cursor.execute(
-                "SELECT * FROM skills WHERE id = ?",
+                f"SELECT {SELECT_COLUMNS} FROM skills WHERE id = ?",
                 (skill_id,)
             ).fetchone()
 
         conn.close()
-        return Skill(**dict(row)) if row else None
+        return Skill.from_row(row) if row else None
 
     @staticmethod
     def find_by_user(user_id):
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        # counters come from the skill_stats rollup, one row per skill
         rows = cursor.execute(
-            '''
-            SELECT s.*,
-                   COUNT(st.id) AS total_subtopics,
-                   SUM(CASE WHEN st.status = 'completed' THEN 1 ELSE 0 END) AS completed_subtopics
+            f'''
+            SELECT {SELECT_PROGRESS}
             FROM skills s
-            LEFT JOIN subtopics st ON s.id = st.skill_id
+            LEFT JOIN skill_stats ss ON ss.skill_id = s.id
             WHERE s.user_id = ?
-            GROUP BY s.id
             ORDER BY s.created_at DESC
             ''',
             (user_id,)
         ).fetchall()
 
-        result = []
+        conn.close()
+        return [Skill._with_progress(row) for row in rows]
 
-        for row in rows:
-            row_dict = dict(row)
-            total = row_dict.get('total_subtopics') or 0
-            completed = row_dict.get('completed_subtopics') or 0
+    @staticmethod
+    def find_page(user_id, limit, after=None, status=None, category=None,
+                  date_from=None, date_before=None):
+        """One page of a user's skills, newest first, with rollup counters.
 
-            progress = (completed / total * 100) if total > 0 else 0
-            row_dict['progress'] = round(progress, 1)
+        Keyset-paginated on (created_at, id): ``after`` is the pair from the
+        last row of the previous page, so any page is an index range scan
+        no matter how deep it is. Fetches ``limit + 1`` rows so the caller
+        can tell whether another page follows.
+        """
+        clauses = ['s.user_id = ?']
+        params = [user_id]
+        if after:
+            clauses.append('(s.created_at, s.id) < (?, ?)')
+            params.extend(after)
+        if status:
+            clauses.append('s.status = ?')
+            params.append(status)
+        if category:
+            clauses.append('s.category = ?')
+            params.append(category)
+        if date_from:
+            clauses.append('s.created_at >= ?')
+            params.append(date_from)
+        if date_before:
+            clauses.append('s.created_at < ?')
+            params.append(date_before)
+        params.append(limit + 1)
 
-            conn2 = get_db_connection()
-            mins_row = conn2.execute(
-                "SELECT COALESCE(SUM(duration_minutes),0) AS total_minutes FROM learning_sessions WHERE skill_id = ?",
-                (row_dict['id'],)
-            ).fetchone()
-            conn2.close()
+        conn = get_db_connection()
+        rows = conn.execute(
+            f'''
+            SELECT {SELECT_PROGRESS}
+            FROM skills s
+            LEFT JOIN skill_stats ss ON ss.skill_id = s.id
+            WHERE {' AND '.join(clauses)}
+            ORDER BY s.created_at DESC, s.id DESC
+            LIMIT ?
+            ''',
+            params
+        ).fetchall()
+        conn.close()
+        return [Skill._with_progress(row) for row in rows]
+
+    @staticmethod
+    def _with_progress(row):
+        # by position: dict(row) would look each column up by name
+        skill = dict(zip(PROGRESS_KEYS, row))
+        total = skill['total_subtopics']
+        completed = skill['completed_subtopics']
+
+        progress = (completed / total * 100) if total > 0 else 0
+        skill['progress'] = round(progress, 1)
+        skill['learned_hours'] = round(row[-1] / 60, 1)
+        return skill
+
+    @staticmethod
+    def iter_by_user(user_id, page_size=500):
+        """Yield pages (lists of row dicts) of a user's skills, oldest first.
 
-            row_dict['learned_hours'] = round((mins_row['total_minutes'] or 0) / 60, 1)
-            row_dict['target_hours'] = row_dict.get('target_hours', 0)
+        Keyset-paginated on (created_at, id), so each page is an index range
+        scan and memory stays bounded by ``page_size``. Rows without a
+        created_at come first, as in LearningSession.iter_by_user.
+        """
+        conn = get_db_connection()
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                f'''
+                SELECT {SELECT_COLUMNS} FROM skills
+                WHERE user_id = ? AND created_at IS NULL AND id > ?
+                ORDER BY id
+                LIMIT ?
+                ''',
+                (user_id, last_id, page_size)
+            ).fetchall()
+            if not rows:
+                break
+            yield [dict(zip(COLUMNS, row)) for row in rows]
+            last_id = rows[-1]['id']
 
-            result.append(row_dict)
+        # no lower bound on the first page: a timestamp stored as a number
+        # (NUMERIC affinity) sorts before every text one, so no seed value is safe
+        keyset, params = 'created_at IS NOT NULL', ()
+        while True:
+            rows = conn.execute(
+                f'''
+                SELECT {SELECT_COLUMNS} FROM skills
+                WHERE user_id = ? AND {keyset}
+                ORDER BY created_at, id
+                LIMIT ?
+                ''',
+                (user_id, *params, page_size)
+            ).fetchall()
+            if not rows:
+                break
+            yield [dict(zip(COLUMNS, row)) for row in rows]
+            keyset, params = '(created_at, id) > (?, ?)', (rows[-1]['created_at'], rows[-1]['id'])
+        conn.close()
 
+    @staticmethod
+    def iter_all(page_size=500):
+        """Yield pages of (id, user_id, name, description, category) rows over all skills, by id"""
+        conn = get_db_connection()
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                '''
+                SELECT id, user_id, name, description, category FROM skills
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+                ''',
+                (last_id, page_size)
+            ).fetchall()
+            if not rows:
+                break
+            yield [dict(row) for row in rows]
+            last_id = rows[-1]['id']
         conn.close()
-        return result
+
+    @staticmethod
+    def update_categories(cursor, changes):
+        """Set categories from (category, skill_id) pairs on the caller's cursor"""
+        cursor.executemany('UPDATE skills SET category = ? WHERE id = ?', changes)
 
     def mark_completed(self):
         from datetime import datetime
@@ -0,0 +1,132 @@
+from utils.database import get_db_connection
+
+# Recomputes every rollup row from the raw tables (backfill / rebuild / verify)
+COMPUTED_STATS_SQL = '''
+    SELECT s.id AS skill_id,
+           (SELECT COUNT(*) FROM subtopics WHERE skill_id = s.id) AS total_subtopics,
+           (SELECT COUNT(*) FROM subtopics WHERE skill_id = s.id AND status = 'completed') AS completed_subtopics,
+           (SELECT COALESCE(SUM(duration_minutes), 0) FROM learning_sessions WHERE skill_id = s.id) AS learned_minutes
+    FROM skills s
+'''
+
+
+class SkillStats:
+    """Per-skill progress rollup kept in step with subtopics and sessions.
+
+    Writers call ``apply`` on their own cursor before committing, so the
+    rollup changes in the same transaction as the row it summarizes.
+    """
+    __slots__ = ('skill_id', 'total_subtopics', 'completed_subtopics', 'learned_minutes')
+
+    def __init__(self, skill_id=None, total_subtopics=0, completed_subtopics=0, learned_minutes=0):
+        self.skill_id = skill_id
+        self.total_subtopics = total_subtopics
+        self.completed_subtopics = completed_subtopics
+        self.learned_minutes = learned_minutes
+
+    @staticmethod
+    def create_table(cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS skill_stats (
+                skill_id INTEGER PRIMARY KEY,
+                total_subtopics INTEGER NOT NULL DEFAULT 0,
+                completed_subtopics INTEGER NOT NULL DEFAULT 0,
+                learned_minutes INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (skill_id) REFERENCES skills (id)
+            )
+        ''')
+
+    @staticmethod
+    def apply(cursor, skill_id, subtopics=0, completed=0, minutes=0):
+        """Add deltas to a skill's counters, creating its row if needed"""
+        cursor.execute('''
+            INSERT INTO skill_stats (skill_id, total_subtopics, completed_subtopics, learned_minutes)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (skill_id) DO UPDATE SET
+                total_subtopics = total_subtopics + excluded.total_subtopics,
+                completed_subtopics = completed_subtopics + excluded.completed_subtopics,
+                learned_minutes = learned_minutes + excluded.learned_minutes
+        ''', (skill_id, subtopics, completed, minutes))
+
+    @staticmethod
+    def add_sessions_since(cursor, after_id):
+        """Add the minutes of every session with an id above ``after_id`` (bulk inserts)"""
+        cursor.execute('''
+            INSERT INTO skill_stats (skill_id, total_subtopics, completed_subtopics, learned_minutes)
+            SELECT skill_id, 0, 0, SUM(duration_minutes)
+            FROM learning_sessions
+            WHERE id > ?
+            GROUP BY skill_id
+            ON CONFLICT (skill_id) DO UPDATE SET
+                learned_minutes = learned_minutes + excluded.learned_minutes
+        ''', (after_id,))
+
+    @staticmethod
+    def apply_status_change(cursor, subtopic_id, new_status):
+        """Adjust the completed count for a subtopic about to get ``new_status``.
+
+        Must run before the subtopic row itself is updated: the old status is
+        read from the table.
+        """
+        cursor.execute('''
+            UPDATE skill_stats
+            SET completed_subtopics = completed_subtopics
+                + COALESCE(? = 'completed', 0)
+                - COALESCE((SELECT status = 'completed' FROM subtopics WHERE id = ?), 0)
+            WHERE skill_id = (SELECT skill_id FROM subtopics WHERE id = ?)
+        ''', (new_status, subtopic_id, subtopic_id))
+
+    @staticmethod
+    def delete(cursor, skill_id):
+        cursor.execute('DELETE FROM skill_stats WHERE skill_id = ?', (skill_id,))
+
+    @staticmethod
+    def find_by_skill(skill_id):
+        conn = get_db_connection()
+        row = conn.execute(
+            'SELECT skill_id, total_subtopics, completed_subtopics, learned_minutes '
+            'FROM skill_stats WHERE skill_id = ?', (skill_id,)
+        ).fetchone()
+        conn.close()
+        return SkillStats(*row) if row else SkillStats(skill_id=skill_id)
+
+    @staticmethod
+    def rebuild(cursor):
+        """Recompute every row from subtopics and learning_sessions"""
+        cursor.execute('DELETE FROM skill_stats')
+        cursor.execute(f'''
+            INSERT INTO skill_stats (skill_id, total_subtopics, completed_subtopics, learned_minutes)
+            {COMPUTED_STATS_SQL}
+        ''')
+        return cursor.rowcount
+
+    @staticmethod
+    def verify(cursor):
+        """Rows whose stored counters differ from a fresh recomputation"""
+        return [dict(row) for row in cursor.execute(f'''
+            SELECT c.skill_id,
+                   ss.total_subtopics, c.total_subtopics AS expected_total_subtopics,
+                   ss.completed_subtopics, c.completed_subtopics AS expected_completed_subtopics,
+                   ss.learned_minutes, c.learned_minutes AS expected_learned_minutes
+            FROM ({COMPUTED_STATS_SQL}) c
+            LEFT JOIN skill_stats ss ON ss.skill_id = c.skill_id
+            WHERE ss.skill_id IS NULL
+               OR ss.total_subtopics != c.total_subtopics
+               OR ss.completed_subtopics != c.completed_subtopics
+               OR ss.learned_minutes != c.learned_minutes
+        ''')]
+
+    @property
+    def progress(self):
+        if not self.total_subtopics:
+            return 0
+        return round(self.completed_subtopics / self.total_subtopics * 100, 1)
+
+    @property
+    def learned_hours(self):
+        return round((self.learned_minutes or 0) / 60, 1)
+
+    @property
+    def all_completed(self):
+        # same rule as the old all(...) scan, which is also true for no subtopics
+        return self.completed_subtopics == self.total_subtopics
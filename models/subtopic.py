@@ -1,9 +1,24 @@
 from utils.database import get_db_connection
+from models.skill_stats import SkillStats
+
+INSERT_SQL = '''
+    INSERT INTO subtopics (skill_id, title, description, status, hours_spent,
+                           difficulty, notes, started_at, completed_at, order_index, expected_hours,
+                           source)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# every column, in the order Subtopic.from_row unpacks them
+COLUMNS = ('id', 'skill_id', 'title', 'description', 'status', 'hours_spent', 'difficulty',
+           'notes', 'started_at', 'completed_at', 'order_index', 'expected_hours', 'source')
+SELECT_COLUMNS = ', '.join(COLUMNS)
 
 class Subtopic:
+    __slots__ = COLUMNS
+
     def __init__(self, id=None, skill_id=None, title=None, description=None, status='to-learn',
                  hours_spent=0, difficulty='medium', notes=None, started_at=None, 
-                 completed_at=None, order_index=0, expected_hours=0):
+                 completed_at=None, order_index=0, expected_hours=0, source='user'):
         self.id = id
         self.skill_id = skill_id
         self.title = title
@@ -16,12 +31,20 @@ class Subtopic:
         self.completed_at = completed_at
         self.order_index = order_index
         self.expected_hours = expected_hours
+        # 'user' if typed by the user, 'suggested' if the app proposed it
+        self.source = source
 
     @staticmethod
-    def create_table():
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        # create table (expected_hours included for new installs)
+    def from_row(row):
+        """Instance from a row selected as SELECT_COLUMNS, mapped by position"""
+        st = Subtopic.__new__(Subtopic)
+        (st.id, st.skill_id, st.title, st.description, st.status, st.hours_spent, st.difficulty,
+         st.notes, st.started_at, st.completed_at, st.order_index, st.expected_hours, st.source) = row
+        return st
+
+    @staticmethod
+    def create_table(cursor):
+        # create table (expected_hours and source included for new installs)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS subtopics (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -36,27 +59,17 @@ class Subtopic:
                 completed_at TIMESTAMP NULL,
                 order_index INTEGER DEFAULT 0,
                 expected_hours REAL DEFAULT 0,
+                source TEXT DEFAULT 'user',
                 FOREIGN KEY (skill_id) REFERENCES skills (id)
             )
         ''')
-        conn.commit()
-
-        # For existing DBs: attempt to add expected_hours column if it's missing.
-        try:
-            # this will fail if column already exists, so catch exceptions
-            cursor.execute("ALTER TABLE subtopics ADD COLUMN expected_hours REAL DEFAULT 0")
-            conn.commit()
-        except Exception:
-            # column probably exists already — ignore
-            pass
-        finally:
-            conn.close()
 
     def save(self):
         conn = get_db_connection()
         cursor = conn.cursor()
         try:
             if self.id:
+                SkillStats.apply_status_change(cursor, self.id, self.status)
                 cursor.execute('''
                     UPDATE subtopics 
                     SET title=?, description=?, status=?, hours_spent=?, difficulty=?, 
@@ -66,14 +79,10 @@ class Subtopic:
                       self.difficulty, self.notes, self.started_at, self.completed_at,
                       self.order_index, self.expected_hours, self.id))
             else:
-                cursor.execute('''
-                    INSERT INTO subtopics (skill_id, title, description, status, hours_spent, 
-                                         difficulty, notes, started_at, completed_at, order_index, expected_hours)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (self.skill_id, self.title, self.description, self.status, self.hours_spent,
-                      self.difficulty, self.notes, self.started_at, self.completed_at,
-                      self.order_index, self.expected_hours))
+                cursor.execute(INSERT_SQL, self._insert_params())
                 self.id = cursor.lastrowid
+                SkillStats.apply(cursor, self.skill_id, subtopics=1,
+                                 completed=int(self.status == 'completed'))
 
             conn.commit()
             return True
@@ -83,32 +92,105 @@ class Subtopic:
         finally:
             conn.close()
 
+    def _insert_params(self):
+        return (self.skill_id, self.title, self.description, self.status, self.hours_spent,
+                self.difficulty, self.notes, self.started_at, self.completed_at,
+                self.order_index, self.expected_hours, self.source)
+
+    @staticmethod
+    def insert_many(cursor, skill_id, subtopics):
+        """Insert subtopics of a newly created skill with one executemany.
+
+        Runs on the caller's cursor and leaves committing to the caller.
+        Returns the skill's stored subtopics in order.
+        """
+        for st in subtopics:
+            st.skill_id = skill_id
+        cursor.executemany(INSERT_SQL, [st._insert_params() for st in subtopics])
+        SkillStats.apply(cursor, skill_id, subtopics=len(subtopics),
+                         completed=sum(st.status == 'completed' for st in subtopics))
+
+        rows = cursor.execute(
+            f'SELECT {SELECT_COLUMNS} FROM subtopics WHERE skill_id = ? ORDER BY order_index ASC',
+            (skill_id,)
+        ).fetchall()
+        return [Subtopic.from_row(row) for row in rows]
+
+    @staticmethod
+    def add_sessions_time_since(cursor, after_id):
+        """Add the time of every session with an id above ``after_id`` to its subtopic"""
+        cursor.execute('''
+            UPDATE subtopics
+            SET hours_spent = COALESCE(hours_spent, 0) + x.minutes / 60.0
+            FROM (
+                SELECT subtopic_id, SUM(duration_minutes) AS minutes
+                FROM learning_sessions
+                WHERE id > ? AND subtopic_id IS NOT NULL
+                GROUP BY subtopic_id
+            ) AS x
+            WHERE subtopics.id = x.subtopic_id
+        ''', (after_id,))
+
+    @staticmethod
+    def iter_curricula():
+        """Yield (skill_row, [titles in order]) for every skill with user-written subtopics.
+
+        Subtopics the app suggested itself are left out, so suggestions
+        built from this never learn from their own output.
+        """
+        conn = get_db_connection()
+        rows = conn.execute('''
+            SELECT s.id AS skill_id, s.user_id, s.name, s.category, st.title
+            FROM subtopics st
+            JOIN skills s ON s.id = st.skill_id
+            WHERE st.source = 'user'
+            ORDER BY st.skill_id, st.order_index
+        ''')
+        skill, titles = None, []
+        for row in rows:
+            if skill is not None and row['skill_id'] != skill['skill_id']:
+                yield skill, titles
+                titles = []
+            skill = row
+            titles.append(row['title'])
+        if skill is not None:
+            yield skill, titles
+        conn.close()
+
     @staticmethod
     def find_by_skill(skill_id):
         conn = get_db_connection()
-        subtopics = conn.execute(
-            'SELECT * FROM subtopics WHERE skill_id = ? ORDER BY order_index ASC', 
+        rows = conn.execute(
+            f'SELECT {SELECT_COLUMNS} FROM subtopics WHERE skill_id = ? ORDER BY order_index ASC',
             (skill_id,)
         ).fetchall()
         conn.close()
-        # map expected_hours to float and hours_spent to float
-        result = []
-        for sub in subtopics:
-            d = dict(sub)
-            # ensure numeric types are proper
-            d['hours_spent'] = float(d.get('hours_spent') or 0)
-            d['expected_hours'] = float(d.get('expected_hours') or 0)
-            result.append(Subtopic(**d))
-        return result
+        # to_dict() does the float conversion of the hours columns
+        return [Subtopic.from_row(row) for row in rows]
+
+    @staticmethod
+    def find_by_skills(skill_ids):
+        """Row dicts of the subtopics of several skills, grouped by skill in display order"""
+        if not skill_ids:
+            return []
+        conn = get_db_connection()
+        placeholders = ', '.join('?' * len(skill_ids))
+        rows = conn.execute(
+            f'SELECT {SELECT_COLUMNS} FROM subtopics WHERE skill_id IN ({placeholders}) '
+            'ORDER BY skill_id, order_index',
+            tuple(skill_ids)
+        ).fetchall()
+        conn.close()
+        return [dict(zip(COLUMNS, row)) for row in rows]
 
     @staticmethod
     def find_by_id(subtopic_id):
         conn = get_db_connection()
-        subtopic = conn.execute(
-            'SELECT * FROM subtopics WHERE id = ?', (subtopic_id,)
+        row = conn.execute(
+            f'SELECT {SELECT_COLUMNS} FROM subtopics WHERE id = ?', (subtopic_id,)
         ).fetchone()
         conn.close()
-        return Subtopic(**dict(subtopic)) if subtopic else None
+        return Subtopic.from_row(row) if row else None
 
     def update_status(self, new_status):
         from datetime import datetime
@@ -120,15 +202,42 @@ class Subtopic:
         elif new_status == 'completed' and not self.completed_at:
             self.completed_at = current_time
 
-        return self.save()
+        # only the status columns: a full save() would also write back a
+        # possibly stale hours_spent
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            SkillStats.apply_status_change(cursor, self.id, self.status)
+            cursor.execute('''
+                UPDATE subtopics SET status=?, started_at=?, completed_at=? WHERE id=?
+            ''', (self.status, self.started_at, self.completed_at, self.id))
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error updating subtopic status: {e}")
+            return False
+        finally:
+            conn.close()
 
     def add_time(self, minutes):
-        # add minutes as hours (floating)
+        # add minutes as hours (floating), incremented in SQL so concurrent
+        # sessions cannot overwrite each other's time
+        conn = get_db_connection()
         try:
-            self.hours_spent = float(self.hours_spent or 0) + (minutes / 60.0)
-        except Exception:
-            self.hours_spent = (minutes / 60.0)
-        return self.save()
+            row = conn.execute('''
+                UPDATE subtopics SET hours_spent = COALESCE(hours_spent, 0) + ?
+                WHERE id = ?
+                RETURNING hours_spent
+            ''', (minutes / 60.0, self.id)).fetchone()
+            conn.commit()
+            if row:
+                self.hours_spent = row['hours_spent']
+            return True
+        except Exception as e:
+            print(f"Error adding subtopic time: {e}")
+            return False
+        finally:
+            conn.close()
 
     def to_dict(self):
         return {
@@ -1,7 +1,12 @@
 import sqlite3
 from utils.database import get_db_connection
 
+COLUMNS = ('id', 'username', 'email', 'password_hash', 'created_at')
+SELECT_COLUMNS = ', '.join(COLUMNS)
+
 class User:
+    __slots__ = COLUMNS
+
     def __init__(self, id=None, username=None, email=None, password_hash=None, created_at=None):
         self.id = id
         self.username = username
@@ -10,9 +15,14 @@ class User:
         self.created_at = created_at
 
     @staticmethod
-    def create_table():
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    def from_row(row):
+        """Instance from a row selected as SELECT_COLUMNS, mapped by position"""
+        user = User.__new__(User)
+        user.id, user.username, user.email, user.password_hash, user.created_at = row
+        return user
+
+    @staticmethod
+    def create_table(cursor):
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -22,26 +32,40 @@ class User:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        conn.commit()
-        conn.close()
 
     @staticmethod
     def find_by_username(username):
         conn = get_db_connection()
-        user = conn.execute(
-            'SELECT * FROM users WHERE username = ?', (username,)
+        row = conn.execute(
+            f'SELECT {SELECT_COLUMNS} FROM users WHERE username = ?', (username,)
         ).fetchone()
         conn.close()
-        return User(**dict(user)) if user else None
+        return User.from_row(row) if row else None
 
     @staticmethod
     def find_by_email(email):
         conn = get_db_connection()
-        user = conn.execute(
-            'SELECT * FROM users WHERE email = ?', (email,)
+        row = conn.execute(
+            f'SELECT {SELECT_COLUMNS} FROM users WHERE email = ?', (email,)
         ).fetchone()
         conn.close()
-        return User(**dict(user)) if user else None
+        return User.from_row(row) if row else None
+
+    @staticmethod
+    def find_taken(username, email):
+        """Which of ``username`` / ``email`` already belong to a user, in one query"""
+        conn = get_db_connection()
+        rows = conn.execute(
+            'SELECT username, email FROM users WHERE username = ? OR email = ?', (username, email)
+        ).fetchall()
+        conn.close()
+        taken = set()
+        for row in rows:
+            if row['username'] == username:
+                taken.add('username')
+            if row['email'] == email:
+                taken.add('email')
+        return taken
 
     def save(self):
         conn = get_db_connection()
@@ -59,6 +83,21 @@ class User:
         finally:
             conn.close()
 
+    def update_password_hash(self, password_hash):
+        conn = get_db_connection()
+        try:
+            conn.execute(
+                'UPDATE users SET password_hash = ? WHERE id = ?', (password_hash, self.id)
+            )
+            conn.commit()
+            self.password_hash = password_hash
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating password hash: {e}")
+            return False
+        finally:
+            conn.close()
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -0,0 +1,44 @@
+from utils.database import get_db_connection
+
+
+class UserVersion:
+    """Per-user change counter shared by every worker through SQLite.
+
+    Write paths bump it after changing a user's data; readers compare it
+    with the version a cached value was built from.
+    """
+
+    @staticmethod
+    def create_table(cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_versions (
+                user_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        ''')
+
+    @staticmethod
+    def get(user_id):
+        conn = get_db_connection()
+        row = conn.execute(
+            'SELECT version FROM user_versions WHERE user_id = ?', (user_id,)
+        ).fetchone()
+        conn.close()
+        return row['version'] if row else 0
+
+    @staticmethod
+    def bump(user_id):
+        conn = get_db_connection()
+        try:
+            conn.execute('''
+                INSERT INTO user_versions (user_id, version) VALUES (?, 1)
+                ON CONFLICT (user_id) DO UPDATE SET version = version + 1
+            ''', (user_id,))
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error bumping user version: {e}")
+            return False
+        finally:
+            conn.close()
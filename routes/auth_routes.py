@@ -1,10 +1,19 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token
 from controllers.auth_controller import AuthController
+from utils.rate_limit import throttle_auth
 
 auth_bp = Blueprint('auth', __name__)
 
+def password_response(result, status_code):
+    """JSON response; a saturated password executor also sends Retry-After"""
+    response = jsonify(result)
+    if status_code == 503:
+        response.headers['Retry-After'] = '1'
+    return response, status_code
+
 @auth_bp.route('/register', methods=['POST'])
+@throttle_auth
 def register():
     data = request.get_json()
     username = data.get('username')
@@ -20,9 +29,10 @@ def register():
         result['user_id'] = user_data['id']
         result['username'] = user_data['username']
     
-    return jsonify(result), status_code
+    return password_response(result, status_code)
 
 @auth_bp.route('/login', methods=['POST'])
+@throttle_auth
 def login():
     data = request.get_json()
     username = data.get('username')
@@ -33,5 +43,5 @@ def login():
     if status_code == 200:
         access_token = create_access_token(identity=str(result['user_id']))
         result['access_token'] = access_token
-    
-    return jsonify(result), status_code
+
+    return password_response(result, status_code)
@@ -1,12 +1,23 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from controllers.dashboard_controller import DashboardController
+from utils.conditional import etag_by_user_version
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
 @dashboard_bp.route('', methods=['GET'])
 @jwt_required()
+@etag_by_user_version(per_day=True)
 def get_dashboard():
     user_id = int(get_jwt_identity())
     result = DashboardController.get_dashboard_data(user_id)
     return jsonify(result), 200
+
+@dashboard_bp.route('/calendar', methods=['GET'])
+@jwt_required()
+def get_calendar():
+    user_id = int(get_jwt_identity())
+    result, status = DashboardController.get_calendar(
+        user_id, request.args.get('from'), request.args.get('to')
+    )
+    return jsonify(result), status
@@ -0,0 +1,24 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from controllers.export_controller import EXPORT_FORMATS, ExportController
+
+export_bp = Blueprint('export', __name__)
+
+MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+@export_bp.route('', methods=['GET'])
+@jwt_required()
+def export_history():
+    user_id = get_jwt_identity()
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unsupported format, use one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    return Response(
+        stream_with_context(ExportController.stream_export(user_id, fmt)),
+        mimetype=MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename=skillstack-export.{fmt}'}
+    )
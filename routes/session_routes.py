@@ -1,6 +1,9 @@
+import io
+
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from controllers.skill_controller import SkillController
+from controllers.import_controller import ImportController
 
 session_bp = Blueprint('sessions', __name__)
 
@@ -15,3 +18,24 @@ def add_session():
 
     result, status = SkillController.add_learning_session(user_id, data)
     return jsonify(result), status
+
+@session_bp.route('', methods=['GET'])
+@jwt_required()
+def list_sessions():
+    user_id = get_jwt_identity()
+    result, status = SkillController.list_sessions(user_id, request.args)
+    return jsonify(result), status
+
+@session_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_sessions():
+    user_id = get_jwt_identity()
+    fmt = request.args.get('format')
+    if not fmt:
+        fmt = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+
+    # read the body line by line straight off the socket, never all at once;
+    # lines are decoded one by one so a bad byte fails only its own row
+    lines = io.BufferedReader(request.stream)
+    result, status = ImportController.import_sessions(user_id, lines, fmt)
+    return jsonify(result), status
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from controllers.skill_controller import SkillController
+from controllers.skill_controller import SKILL_LIST_ARGS, SkillController
+from utils.conditional import etag_by_user_version
 
 skill_bp = Blueprint('skills', __name__)
 
@@ -14,13 +15,21 @@ def create_skill():
 
 @skill_bp.route('', methods=['GET'])
 @jwt_required()
+@etag_by_user_version
 def get_skills():
     user_id = get_jwt_identity()
-    result, status = SkillController.get_user_skills(user_id)
+    # a paging or filter argument switches to the paginated response; a bare
+    # request (or one with only unrelated arguments, e.g. a cache buster)
+    # keeps returning the full list
+    if any(key in request.args for key in SKILL_LIST_ARGS):
+        result, status = SkillController.list_skills(user_id, request.args)
+    else:
+        result, status = SkillController.get_user_skills(user_id)
     return jsonify(result), status
 
 @skill_bp.route('/<int:skill_id>', methods=['GET'])
 @jwt_required()
+@etag_by_user_version
 def get_skill_detail(skill_id):
     user_id = get_jwt_identity()
     result, status = SkillController.get_skill_detail(user_id, skill_id)
@@ -0,0 +1,65 @@
+import json
+
+BUSY_BODY = json.dumps({'error': 'Server is busy, please try again shortly'}).encode('utf-8')
+
+
+class SlowClientBuffer:
+    """ASGI middleware in front of a thread-pooled WSGI app.
+
+    Request bodies up to ``buffer_bytes`` are read on the event loop before
+    the app is called, so a client trickling its upload holds a coroutine
+    rather than one of the app's threads; larger bodies (bulk imports) are
+    passed through as a stream. At most ``max_pending`` requests may be
+    buffered, queued or running at once; beyond that the request is
+    answered 503 straight from the loop instead of joining an unbounded
+    executor queue.
+    """
+
+    def __init__(self, app, max_pending, buffer_bytes=1024 * 1024):
+        self.app = app
+        self.max_pending = max_pending
+        self.buffer_bytes = buffer_bytes
+        self.pending = 0
+        self.rejected = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return await self._busy(send)
+
+        self.pending += 1
+        try:
+            buffered = []
+            size = 0
+            while size <= self.buffer_bytes:
+                message = await receive()
+                buffered.append(message)
+                if message['type'] != 'http.request' or not message.get('more_body'):
+                    break
+                size += len(message.get('body', b''))
+
+            async def replay():
+                return buffered.pop(0) if buffered else await receive()
+
+            await self.app(scope, replay, send)
+        finally:
+            self.pending -= 1
+
+    @staticmethod
+    async def _busy(send):
+        await send({
+            'type': 'http.response.start',
+            'status': 503,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(BUSY_BODY)).encode()),
+                (b'retry-after', b'1'),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': BUSY_BODY})
+
+    def stats(self):
+        return {'pending': self.pending, 'max_pending': self.max_pending, 'rejected': self.rejected}
@@ -0,0 +1,146 @@
+"""Negotiated gzip / brotli compression of response bodies.
+
+``init_app`` adds an after_request hook. A response is compressed when the
+client's Accept-Encoding allows one of the offered codings and its
+mimetype is JSON or text, and either it is streamed (the export) or its
+body is at least COMPRESS_MIN_BYTES. Streamed responses and bodies over
+COMPRESS_STREAM_BYTES are compressed chunk by chunk as they are sent, so
+neither is ever held compressed in full. Brotli is offered only when the
+``brotli`` package (pinned in requirements.txt) is installed; without it
+``init_app`` logs a warning and gzip is used alone.
+
+Each coding is a separate representation, so a strong ETag gets the coding
+appended (``"u1-v7-br"``); utils.conditional accepts any of these variants
+in If-None-Match. Bytes in and out per endpoint and coding go to
+utils.metrics.
+"""
+import os
+import zlib
+
+from flask import request
+
+from utils.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# offered codings, most preferred first; empty turns compression off
+COMPRESSION = os.environ.get('SKILLSTACK_COMPRESSION', 'br,gzip')
+COMPRESS_MIN_BYTES = int(os.environ.get('SKILLSTACK_COMPRESS_MIN_BYTES', 1024))
+COMPRESS_STREAM_BYTES = int(os.environ.get('SKILLSTACK_COMPRESS_STREAM_BYTES', 1024 * 1024))
+# past these, dashboard-sized JSON costs several times the CPU for a few
+# percent smaller output (benchmarks/bench_compression)
+GZIP_LEVEL = int(os.environ.get('SKILLSTACK_GZIP_LEVEL', 4))
+BROTLI_QUALITY = int(os.environ.get('SKILLSTACK_BROTLI_QUALITY', 2))
+STREAM_CHUNK = 64 * 1024
+
+CODINGS = tuple(c for c in (c.strip() for c in COMPRESSION.split(','))
+                if c == 'gzip' or (c == 'br' and brotli is not None))
+COMPRESSIBLE = ('application/json', 'application/x-ndjson', 'text/')
+
+
+def etag_variants(etag):
+    """``etag`` and the tags the same representation gets once compressed"""
+    return (etag,) + tuple(f'{etag}-{coding}' for coding in CODINGS)
+
+
+def compress(data, coding):
+    if coding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip framing
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compressor(coding):
+    """(compress, sync flush, finish) for one stream"""
+    if coding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _stream(chunks, coding, endpoint, flush_each):
+    """Compress ``chunks`` as they are iterated.
+
+    With ``flush_each`` every chunk the app produced is flushed through, so
+    a streamed view reaches the client as it is generated, not when the
+    compressor's window fills.
+    """
+    process, flush, finish = _compressor(coding)
+    raw = sent = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            raw += len(chunk)
+            out = process(chunk)
+            if flush_each:
+                out += flush()
+            if out:
+                sent += len(out)
+                yield out
+        out = finish()
+        sent += len(out)
+        yield out
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+        metrics.compressed(endpoint, coding, raw, sent)
+
+
+def _slices(data):
+    for i in range(0, len(data), STREAM_CHUNK):
+        yield data[i:i + STREAM_CHUNK]
+
+
+def _after_request(response):
+    if not CODINGS or response.status_code < 200 or response.status_code in (204, 206):
+        return response
+    if response.status_code == 304:
+        response.vary.add('Accept-Encoding')
+        return response
+    if (response.direct_passthrough or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(COMPRESSIBLE)):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if response.cache_control.no_transform:
+        return response
+    coding = request.accept_encodings.best_match(CODINGS)
+    if coding is None:
+        return response
+    endpoint = request.endpoint or 'unmatched'
+
+    if response.is_streamed:
+        response.response = _stream(response.response, coding, endpoint, flush_each=True)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return response
+        if len(data) > COMPRESS_STREAM_BYTES:
+            response.response = _stream(_slices(data), coding, endpoint, flush_each=False)
+            response.headers.pop('Content-Length', None)
+        else:
+            out = compress(data, coding)
+            if len(out) >= len(data):
+                return response
+            response.set_data(out)
+            metrics.compressed(endpoint, coding, len(data), len(out))
+
+    response.headers['Content-Encoding'] = coding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{coding}', weak)
+    return response
+
+
+def init_app(app):
+    if brotli is None and 'br' in (c.strip() for c in COMPRESSION.split(',')):
+        app.logger.warning("SKILLSTACK_COMPRESSION offers 'br' but the brotli package is not installed; "
+                           "serving gzip only")
+    app.after_request(_after_request)
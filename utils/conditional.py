@@ -0,0 +1,53 @@
+from datetime import date
+from functools import partial, wraps
+
+from flask import make_response, request
+from flask_jwt_extended import get_jwt_identity
+
+from models.user_version import UserVersion
+from utils.compression import etag_variants
+
+
+def user_etag(user_id, version, day=None):
+    """Strong ETag for anything built from one user's data at ``version``"""
+    etag = f'u{int(user_id)}-v{version}'
+    return f'{etag}-d{day}' if day else etag
+
+
+def etag_by_user_version(view=None, *, per_day=False):
+    """Conditional GET for views that depend only on the caller's own data.
+
+    The ETag comes from the user_versions counter, which every write path
+    bumps, so a matching ``If-None-Match`` is answered with 304 after a
+    single primary-key lookup and the view is never called. The version is
+    read before the view runs: a concurrent write can only make the tag
+    look older than the body, which costs a refetch, never a stale 304.
+    Views whose output also depends on today's date (a "last 30 days"
+    window) pass ``per_day=True`` so the tag rolls over at midnight.
+    Must be applied inside ``jwt_required``.
+    """
+    if view is None:
+        return partial(etag_by_user_version, per_day=per_day)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = get_jwt_identity()
+        etag = user_etag(user_id, UserVersion.get(user_id),
+                         date.today().isoformat() if per_day else None)
+
+        # the client may hold a compressed representation (utils.compression)
+        held = next((tag for tag in etag_variants(etag) if request.if_none_match.contains(tag)), None)
+        if held:
+            response = make_response('', 304)
+            etag = held
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.vary.add('Authorization')
+        return response
+
+    return wrapper
@@ -1,20 +1,308 @@
+import os
+import queue
 import sqlite3
+import threading
+import time
+
+from flask import current_app, g, has_app_context
+
+from utils.slow_queries import slow_query_log
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.environ.get('SKILLSTACK_DB_PATH', os.path.join(BASE_DIR, 'skillstack.db'))
+
+# Connection-level settings, applied once when a connection is opened
+CONNECTION_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('busy_timeout', int(os.environ.get('SKILLSTACK_DB_BUSY_TIMEOUT_MS', 5000))),
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 256 * 1024 * 1024),
+    ('cache_size', -16000),  # negative = KiB, i.e. ~16 MB page cache
+    ('foreign_keys', 'ON'),
+)
+
+POOL_SIZE = int(os.environ.get('SKILLSTACK_DB_POOL_SIZE', 8))
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that adds its statements and time spent in SQLite to its connection's counters.
+
+    Execution and the fetch* calls are timed; rows read by iterating the
+    cursor directly (the export iterators) are not. With the slow-query
+    log enabled every timing is reported to it as well.
+    """
+
+    def execute(self, sql, parameters=()):
+        t0 = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._timed(time.perf_counter() - t0, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._timed(time.perf_counter() - t0, sql, seq_of_parameters, many=True)
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._timed(time.perf_counter() - t0)
+
+    def fetchmany(self, size=None):
+        t0 = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._timed(time.perf_counter() - t0)
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._timed(time.perf_counter() - t0)
+
+    def _timed(self, seconds, sql=None, parameters=None, many=False):
+        if sql is None:
+            self.connection.sql_seconds += seconds
+        else:
+            self.connection.count_statement(seconds)
+        if slow_query_log.enabled:
+            slow_query_log.observe(self, seconds, sql, parameters, many)
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection that is handed back to its pool instead of closed.
+
+    Models keep calling ``conn.close()`` as before; here that only discards
+    an unfinished transaction (what a real close would have done) so the
+    connection can be reused by the next caller. While a ``UnitOfWork`` is
+    open both ``commit()`` and ``close()`` are deferred to it.
+    """
+
+    unit_of_work = None
+    # statements run and seconds spent in SQLite since the connection was
+    # last acquired from its pool, i.e. during the current request
+    statements = 0
+    sql_seconds = 0.0
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # sqlite3.Connection.execute would bypass TimedCursor.execute
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def count_statement(self, seconds):
+        self.statements += 1
+        self.sql_seconds += seconds
+
+    def commit(self):
+        if self.unit_of_work is None and self.in_transaction:
+            t0 = time.perf_counter()
+            super().commit()
+            self.count_statement(time.perf_counter() - t0)
+
+    def close(self):
+        if self.unit_of_work is None and self.in_transaction:
+            self.rollback()
+
+    def dispose(self):
+        sqlite3.Connection.close(self)
+
+
+class ConnectionPool:
+    """Small LIFO pool of pre-configured connections to one database file"""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            factory=PooledConnection,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in CONNECTION_PRAGMAS:
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        conn.statements = 0
+        conn.sql_seconds = 0.0
+        return conn
+
+    def release(self, conn):
+        conn.close()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.dispose()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().dispose()
+            except queue.Empty:
+                break
+
+
+class UnitOfWork:
+    """Run a block of model calls as one ``BEGIN IMMEDIATE`` transaction.
+
+    The write lock is taken up front, so everything read inside the block
+    stays current until it commits; the models' own commit/close calls are
+    deferred until the block exits. Leaving the block with an exception,
+    or after ``rollback()``, discards every write made in it. Nested units
+    join the outermost one.
+
+        with UnitOfWork() as uow:
+            if not session.save():
+                uow.rollback()
+                return {"error": "..."}, 500
+    """
+
+    def __init__(self):
+        self.conn = None
+        self.rolled_back = False
+        self._outermost = False
+
+    def __enter__(self):
+        self.conn = get_db_connection()
+        if self.conn.unit_of_work is None:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            self.conn.execute('BEGIN IMMEDIATE')
+            self.conn.unit_of_work = self
+            self._outermost = True
+        return self
+
+    def rollback(self):
+        self.conn.unit_of_work.rolled_back = True
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self._outermost:
+            return False
+        self.conn.unit_of_work = None
+        if exc_type is not None or self.rolled_back:
+            self.conn.rollback()
+        else:
+            self.conn.commit()
+        return False
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_db_path():
+    """Database file in use: app config inside an app context, else env/default"""
+    if has_app_context():
+        return current_app.config.get('DATABASE', DEFAULT_DB_PATH)
+    return DEFAULT_DB_PATH
+
+
+def get_pool(path=None):
+    path = path or get_db_path()
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(path, ConnectionPool(path))
+    return pool
+
 
 def get_db_connection():
-    """Get database connection with row factory"""
-    conn = sqlite3.connect('skillstack.db')
-    conn.row_factory = sqlite3.Row
+    """Get database connection with row factory.
+
+    Inside a Flask app context the same connection is reused for the whole
+    request and returned to the pool on teardown; outside of one (scripts,
+    shells) each thread keeps its own connection.
+    """
+    if has_app_context():
+        conn = g.get('_db_conn')
+        if conn is None:
+            conn = g._db_conn = get_pool().acquire()
+        return conn
+
+    path = get_db_path()
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = conns[path] = get_pool(path)._connect()
     return conn
 
+
+def release_db_connection(exc=None):
+    """App-context teardown: give the request's connection back to the pool"""
+    conn = g.pop('_db_conn', None)
+    if conn is not None:
+        get_pool().release(conn)
+
+
+def close_all_connections():
+    """Drop every pooled and thread-local connection held by this process"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+    conns = getattr(_local, 'conns', None) or {}
+    for conn in conns.values():
+        conn.dispose()
+    conns.clear()
+
+
+# connections inherited across a fork, kept referenced so they are never closed
+_abandoned = []
+
+
+def reset_after_fork():
+    """Forget every connection inherited from the parent process.
+
+    SQLite connections must not be used or closed in a forked child: closing
+    one may checkpoint or remove the WAL the parent is still using. They are
+    parked, unclosed, in ``_abandoned`` and the child starts with empty pools
+    and a fresh lock (the parent's may have been held by another thread at
+    fork time).
+    """
+    global _pools, _pools_lock, _local
+    for pool in _pools.values():
+        while True:
+            try:
+                _abandoned.append(pool._idle.get_nowait())
+            except queue.Empty:
+                break
+    _abandoned.extend((getattr(_local, 'conns', None) or {}).values())
+    _pools = {}
+    _pools_lock = threading.Lock()
+    _local = threading.local()
+
+
+def init_app(app):
+    app.config.setdefault('DATABASE', DEFAULT_DB_PATH)
+    app.teardown_appcontext(release_db_connection)
+
+
 def init_database():
-    """Initialize all database tables"""
-    from models.user import User
-    from models.skill import Skill
-    from models.subtopic import Subtopic
-    from models.session import LearningSession
-    
-    User.create_table()
-    Skill.create_table()
-    Subtopic.create_table()
-    LearningSession.create_table()
-    print("✅ Database tables initialized successfully!")
\ No newline at end of file
+    """Initialize all database tables by applying pending schema migrations"""
+    from utils.migrations import migrate
+
+    applied = migrate(get_db_connection())
+    if applied:
+        print(f"✅ Database migrated to schema version {applied[-1]}")
+    print("✅ Database tables initialized successfully!")
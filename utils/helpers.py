@@ -1,82 +1,164 @@
+import os
+import re
+
 import bcrypt
 
-def hash_password(password):
+# bcrypt work factor for new hashes; existing hashes are upgraded on login
+BCRYPT_ROUNDS = int(os.environ.get('SKILLSTACK_BCRYPT_ROUNDS', 12))
+
+def hash_password(password, rounds=None):
     """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 def check_password(password, hashed):
     """Check password against hash"""
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
+def password_needs_rehash(hashed, rounds=None):
+    """True if ``hashed`` ('$2b$<cost>$...') was made with a different work factor"""
+    try:
+        return int(hashed.split('$')[2]) != (rounds or BCRYPT_ROUNDS)
+    except (IndexError, ValueError):
+        return True
+
+# Category keywords in priority order: when keywords of several categories
+# appear, the category listed first wins.
+CATEGORY_KEYWORDS = {
+    'Web Development': ['react', 'javascript', 'html', 'css', 'node', 'vue', 'angular', 'frontend', 'backend', 'web',
+                        'reactjs', 'nodejs', 'vuejs'],
+    'Data Science': ['python', 'machine learning', 'data analysis', 'pandas', 'numpy', 'statistics', 'ai', 'artificial intelligence'],
+    'Mobile Development': ['android', 'ios', 'flutter', 'react native', 'mobile', 'swift', 'kotlin'],
+    'Cloud Computing': ['aws', 'azure', 'google cloud', 'docker', 'kubernetes', 'cloud'],
+    'Programming': ['java', 'c++', 'c#', 'programming', 'algorithm', 'data structure', 'coding'],
+    'Design': ['ui', 'ux', 'figma', 'adobe', 'design', 'photoshop'],
+    'Business': ['marketing', 'management', 'finance', 'business', 'entrepreneurship'],
+    'Language': ['english', 'spanish', 'language', 'communication']
+}
+
+_CATEGORY_ORDER = list(CATEGORY_KEYWORDS)
+
+
+def _keyword_priorities():
+    """keyword -> index of the best category it implies.
+
+    A multi-word keyword also implies every keyword it starts with, since a
+    match of 'react native' is a match of 'react' too.
+    """
+    own = {
+        keyword: priority
+        for priority, keywords in enumerate(CATEGORY_KEYWORDS.values())
+        for keyword in keywords
+    }
+    return {
+        keyword: min(p for k, p in own.items() if k == keyword or keyword.startswith(k + ' '))
+        for keyword in own
+    }
+
+
+def _trie_pattern(keywords):
+    """Regex alternation of ``keywords`` factored by common prefix.
+
+    Python's re tries alternatives one by one; as a trie each position costs
+    one branch per character instead of one attempt per keyword. Longer
+    keywords are preferred, backtracking to shorter ones.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+_KEYWORD_PRIORITY = _keyword_priorities()
+# Compiled once: at every word start, the longest keyword found there (whole
+# words only, optionally plural or with a version suffix such as "html5",
+# "c++17" or "kotlin1.9", so 'ai' no longer matches "email" nor 'ui'
+# "build"). The lookahead keeps a match from consuming the start of another.
+_KEYWORD_PATTERN = re.compile(
+    r'(?<![a-z0-9])(?=(' + _trie_pattern(_KEYWORD_PRIORITY) + r')(?:s|\d+(?:\.\d+)*)?(?![a-z0-9]))'
+)
+
+
 def categorize_skill(skill_name, description=""):
     """Simple AI categorizer for skills"""
-    text = f"{skill_name} {description}".lower()
-    
-    categories = {
-        'Web Development': ['react', 'javascript', 'html', 'css', 'node', 'vue', 'angular', 'frontend', 'backend', 'web'],
-        'Data Science': ['python', 'machine learning', 'data analysis', 'pandas', 'numpy', 'statistics', 'ai', 'artificial intelligence'],
-        'Mobile Development': ['android', 'ios', 'flutter', 'react native', 'mobile', 'swift', 'kotlin'],
-        'Cloud Computing': ['aws', 'azure', 'google cloud', 'docker', 'kubernetes', 'cloud'],
-        'Programming': ['java', 'c++', 'c#', 'programming', 'algorithm', 'data structure', 'coding'],
-        'Design': ['ui', 'ux', 'figma', 'adobe', 'design', 'photoshop'],
-        'Business': ['marketing', 'management', 'finance', 'business', 'entrepreneurship'],
-        'Language': ['english', 'spanish', 'language', 'communication']
-    }
-    
-    for category, keywords in categories.items():
-        for keyword in keywords:
-            if keyword in text:
-                return category
-    
-    return "Other"
+    text = f"{skill_name} {description or ''}".lower()
+
+    best = len(_CATEGORY_ORDER)
+    for match in _KEYWORD_PATTERN.finditer(text):
+        priority = _KEYWORD_PRIORITY[match.group(1)]
+        if priority < best:
+            best = priority
+            if best == 0:
+                break
+
+    return _CATEGORY_ORDER[best] if best < len(_CATEGORY_ORDER) else "Other"
+
+def categorize_skills(skills):
+    """Batch form of categorize_skill for an iterable of (name, description) pairs"""
+    return [categorize_skill(name, description) for name, description in skills]
+
+# Fallback subtopic suggestions per category, used when the suggestion index
+# (utils.suggestions) has nothing better for a skill
+SUBTOPIC_SUGGESTIONS = {
+    'Web Development': [
+        "Introduction and Setup",
+        "Basic Concepts and Syntax",
+        "Components and Props",
+        "State Management",
+        "Routing and Navigation",
+        "API Integration",
+        "Testing and Debugging",
+        "Deployment"
+    ],
+    'Data Science': [
+        "Introduction to Concepts",
+        "Data Preprocessing",
+        "Exploratory Data Analysis",
+        "Machine Learning Algorithms",
+        "Model Evaluation",
+        "Data Visualization",
+        "Real-world Projects"
+    ],
+    'Programming': [
+        "Basic Syntax and Setup",
+        "Data Types and Variables",
+        "Control Structures",
+        "Functions and Methods",
+        "Object-Oriented Programming",
+        "Error Handling",
+        "Advanced Topics and Best Practices"
+    ],
+    'Mobile Development': [
+        "Environment Setup",
+        "UI Components and Layouts",
+        "Navigation and Routing",
+        "State Management",
+        "API Integration",
+        "Device Features Access",
+        "Testing and Publishing"
+    ]
+}
+
+DEFAULT_SUBTOPIC_SUGGESTIONS = [
+    "Introduction and Overview",
+    "Basic Concepts",
+    "Intermediate Topics",
+    "Advanced Concepts",
+    "Practical Projects",
+    "Best Practices and Optimization"
+]
 
 def suggest_subtopics(skill_name, category):
     """Suggest subtopics based on skill category"""
-    suggestions = {
-        'Web Development': [
-            "Introduction and Setup",
-            "Basic Concepts and Syntax",
-            "Components and Props",
-            "State Management",
-            "Routing and Navigation",
-            "API Integration",
-            "Testing and Debugging",
-            "Deployment"
-        ],
-        'Data Science': [
-            "Introduction to Concepts",
-            "Data Preprocessing",
-            "Exploratory Data Analysis",
-            "Machine Learning Algorithms",
-            "Model Evaluation",
-            "Data Visualization",
-            "Real-world Projects"
-        ],
-        'Programming': [
-            "Basic Syntax and Setup",
-            "Data Types and Variables",
-            "Control Structures",
-            "Functions and Methods",
-            "Object-Oriented Programming",
-            "Error Handling",
-            "Advanced Topics and Best Practices"
-        ],
-        'Mobile Development': [
-            "Environment Setup",
-            "UI Components and Layouts",
-            "Navigation and Routing",
-            "State Management",
-            "API Integration",
-            "Device Features Access",
-            "Testing and Publishing"
-        ]
-    }
-    
-    return suggestions.get(category, [
-        "Introduction and Overview",
-        "Basic Concepts",
-        "Intermediate Topics",
-        "Advanced Concepts",
-        "Practical Projects",
-        "Best Practices and Optimization"
-    ])
\ No newline at end of file
+    return list(SUBTOPIC_SUGGESTIONS.get(category, DEFAULT_SUBTOPIC_SUGGESTIONS))
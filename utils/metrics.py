@@ -0,0 +1,218 @@
+"""Per-endpoint request and SQL metrics, rendered in Prometheus text format.
+
+``init_app`` hooks every request: latency goes into a histogram per
+endpoint, the status code into a counter, and the statements and time the
+request's pooled connection spent in SQLite (utils.database.TimedCursor)
+into their own histogram and counter, so an N+1 regression shows up as a
+jump in statements per request on one route. Compressed responses
+(utils.compression) add their bytes in and out and the size ratio per
+endpoint and coding. Components that already keep
+``stats()`` (dashboard cache, password executor, rate limiters, the ASGI
+buffer) are exported as gauges through ``add_collector``.
+
+Every worker process keeps its own numbers; with several gunicorn workers
+a scrape sees whichever one answered, so scrape each worker or compare
+rates rather than absolute values.
+"""
+import bisect
+import os
+import threading
+import time
+
+from flask import g, request
+
+# seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# statements per request
+SQL_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+# compressed size / original size
+RATIO_BUCKETS = (0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0)
+
+# when set, /api/metrics requires ``Authorization: Bearer <token>``
+METRICS_TOKEN = os.environ.get('SKILLSTACK_METRICS_TOKEN')
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            yield f'{name}_bucket', {**labels, 'le': str(bound)}, cumulative
+        yield f'{name}_sum', labels, self.total
+        yield f'{name}_count', labels, self.count
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}
+        self.sql_statements = {}
+        self.sql_seconds = {}
+        self.responses = {}
+        self.in_flight = {}
+        self.compression = {}
+        self.compression_ratio = {}
+        self._collectors = []
+
+    def add_collector(self, name, stats, **labels):
+        """Export the numeric values of ``stats()`` as ``skillstack_<name>_<key>`` gauges"""
+        self._collectors.append((name, stats, labels))
+
+    def started(self, endpoint):
+        with self._lock:
+            self.in_flight[endpoint] = self.in_flight.get(endpoint, 0) + 1
+
+    def finished(self, endpoint, method, status, seconds, statements, sql_seconds):
+        with self._lock:
+            self.in_flight[endpoint] -= 1
+            key = (endpoint, method)
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.sql_statements[key] = Histogram(SQL_BUCKETS)
+                self.sql_seconds[key] = 0.0
+            self.latency[key].observe(seconds)
+            self.sql_statements[key].observe(statements)
+            self.sql_seconds[key] += sql_seconds
+            status_key = (endpoint, method, status)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def compressed(self, endpoint, coding, raw_bytes, sent_bytes):
+        with self._lock:
+            key = (endpoint, coding)
+            if key not in self.compression:
+                self.compression[key] = [0, 0, 0]  # responses, bytes in, bytes out
+                self.compression_ratio[key] = Histogram(RATIO_BUCKETS)
+            totals = self.compression[key]
+            totals[0] += 1
+            totals[1] += raw_bytes
+            totals[2] += sent_bytes
+            self.compression_ratio[key].observe(sent_bytes / raw_bytes if raw_bytes else 1.0)
+
+    def render(self):
+        """The current values in Prometheus text exposition format"""
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for sample, labels, value in samples:
+                lines.append(f'{sample}{_labels(labels)} {_number(value)}')
+
+        with self._lock:
+            family('skillstack_request_duration_seconds', 'histogram', 'Request latency by endpoint.',
+                   [s for k, h in sorted(self.latency.items())
+                    for s in h.samples('skillstack_request_duration_seconds', _endpoint(k))])
+            family('skillstack_request_sql_statements', 'histogram',
+                   'SQL statements run per request, by endpoint.',
+                   [s for k, h in sorted(self.sql_statements.items())
+                    for s in h.samples('skillstack_request_sql_statements', _endpoint(k))])
+            family('skillstack_request_sql_seconds_total', 'counter',
+                   'Time spent in SQLite, by endpoint.',
+                   [('skillstack_request_sql_seconds_total', _endpoint(k), v)
+                    for k, v in sorted(self.sql_seconds.items())])
+            family('skillstack_responses_total', 'counter', 'Responses by endpoint and status code.',
+                   [('skillstack_responses_total', {**_endpoint(k[:2]), 'status': str(k[2])}, v)
+                    for k, v in sorted(self.responses.items())])
+            family('skillstack_requests_in_flight', 'gauge', 'Requests being handled right now.',
+                   [('skillstack_requests_in_flight', {'endpoint': k}, v)
+                    for k, v in sorted(self.in_flight.items())])
+            compression = sorted(self.compression.items())
+            family('skillstack_compressed_responses_total', 'counter',
+                   'Compressed responses by endpoint and coding.',
+                   [('skillstack_compressed_responses_total', _coding(k), v[0]) for k, v in compression])
+            family('skillstack_compression_input_bytes_total', 'counter', 'Response bytes before compression.',
+                   [('skillstack_compression_input_bytes_total', _coding(k), v[1]) for k, v in compression])
+            family('skillstack_compression_output_bytes_total', 'counter', 'Response bytes sent compressed.',
+                   [('skillstack_compression_output_bytes_total', _coding(k), v[2]) for k, v in compression])
+            family('skillstack_compression_ratio', 'histogram', 'Compressed size over original size.',
+                   [s for k, h in sorted(self.compression_ratio.items())
+                    for s in h.samples('skillstack_compression_ratio', _coding(k))])
+
+        gauges = {}
+        for name, stats, labels in self._collectors:
+            for key, value in stats().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauges.setdefault(f'skillstack_{name}_{key}', []).append(
+                        (f'skillstack_{name}_{key}', labels, value)
+                    )
+        for name, samples in gauges.items():
+            family(name, 'gauge', f'{name[len("skillstack_"):].replace("_", " ")}.', samples)
+
+        return '\n'.join(lines) + '\n'
+
+
+def _endpoint(key):
+    return {'endpoint': key[0], 'method': key[1]}
+
+
+def _coding(key):
+    return {'endpoint': key[0], 'encoding': key[1]}
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in labels.items()
+    )
+    return '{' + pairs + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+metrics = Metrics()
+
+
+def _request_endpoint():
+    # the route's endpoint name keeps label values bounded, unlike the URL
+    return request.endpoint or 'unmatched'
+
+
+def _before_request():
+    g._metrics_start = time.perf_counter()
+    g._metrics_endpoint = _request_endpoint()
+    metrics.started(g._metrics_endpoint)
+
+
+def _after_request(response):
+    g._metrics_status = response.status_code
+    return response
+
+
+def _teardown_request(exc=None):
+    start = g.pop('_metrics_start', None)
+    if start is None:
+        return
+    conn = g.get('_db_conn')
+    metrics.finished(
+        g.pop('_metrics_endpoint'),
+        request.method,
+        g.pop('_metrics_status', 500),
+        time.perf_counter() - start,
+        conn.statements if conn is not None else 0,
+        conn.sql_seconds if conn is not None else 0.0,
+    )
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
@@ -0,0 +1,172 @@
+"""Versioned schema migrations, tracked in ``PRAGMA user_version``.
+
+Each migration is ``(version, description, apply)`` where ``apply`` takes a
+cursor. Pending migrations run in order, each in its own ``BEGIN IMMEDIATE``
+transaction together with the version bump, so a crash never leaves a
+half-applied step and concurrently booting workers apply each one once.
+Append new migrations to the end of ``MIGRATIONS``; never edit shipped ones.
+
+A process that finds the schema current reads the version stamp once and
+returns, without DDL or a write lock. Processes that do have work to do
+queue on a lock file next to the database rather than on SQLite's
+busy_timeout, which a long rebuild can outlast.
+"""
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: BEGIN IMMEDIATE alone still serializes each step
+    fcntl = None
+
+
+def _column_exists(cursor, table, column):
+    return any(row[1] == column for row in cursor.execute(f'PRAGMA table_info({table})'))
+
+
+def _initial_schema(cursor):
+    from models.user import User
+    from models.skill import Skill
+    from models.subtopic import Subtopic
+    from models.session import LearningSession
+
+    User.create_table(cursor)
+    Skill.create_table(cursor)
+    Subtopic.create_table(cursor)
+    LearningSession.create_table(cursor)
+
+    # databases created before expected_hours existed
+    if not _column_exists(cursor, 'subtopics', 'expected_hours'):
+        cursor.execute('ALTER TABLE subtopics ADD COLUMN expected_hours REAL DEFAULT 0')
+
+
+def _query_indexes(cursor):
+    # skills listed per user, newest first
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_skills_user_created ON skills (user_id, created_at)')
+    # subtopics of a skill in display order; status makes the progress counts covering
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_subtopics_skill_order ON subtopics (skill_id, order_index, status)')
+    # recent activity, calendar window and per-user minute totals
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_sessions_user_date '
+        'ON learning_sessions (user_id, session_date, duration_minutes)'
+    )
+    # learned minutes per skill, and skill deletion
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_skill ON learning_sessions (skill_id, duration_minutes)')
+    # foreign key checks when subtopics are deleted
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_subtopic ON learning_sessions (subtopic_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_certificates_skill ON certificates (skill_id)')
+
+
+def _skill_stats(cursor):
+    from models.skill_stats import SkillStats
+
+    SkillStats.create_table(cursor)
+    SkillStats.rebuild(cursor)
+
+
+def _user_versions(cursor):
+    from models.user_version import UserVersion
+
+    UserVersion.create_table(cursor)
+
+
+def _daily_activity(cursor):
+    from models.daily_activity import DailyActivity
+
+    DailyActivity.create_table(cursor)
+    DailyActivity.rebuild(cursor)
+
+
+def _session_keyset_index(cursor):
+    # (session_date, id) keyset pages need id right after session_date;
+    # duration_minutes stays last so per-user totals remain covered
+    cursor.execute('DROP INDEX IF EXISTS idx_sessions_user_date')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_sessions_user_date_id '
+        'ON learning_sessions (user_id, session_date, id, duration_minutes)'
+    )
+
+
+def _rate_limits(cursor):
+    from models.rate_limit import RateLimitBucket
+
+    RateLimitBucket.create_table(cursor)
+
+
+def _subtopic_source(cursor):
+    from utils.helpers import DEFAULT_SUBTOPIC_SUGGESTIONS, SUBTOPIC_SUGGESTIONS
+
+    if not _column_exists(cursor, 'subtopics', 'source'):
+        cursor.execute("ALTER TABLE subtopics ADD COLUMN source TEXT DEFAULT 'user'")
+
+    # existing rows carry no marker; titles from the built-in lists were
+    # almost certainly added by the app rather than typed by the user
+    generated = sorted({t for titles in SUBTOPIC_SUGGESTIONS.values() for t in titles}
+                       | set(DEFAULT_SUBTOPIC_SUGGESTIONS))
+    cursor.execute(
+        f"UPDATE subtopics SET source = 'suggested' WHERE title IN ({', '.join('?' * len(generated))})",
+        generated
+    )
+
+
+def _rate_limit_prune_index(cursor):
+    # RateLimitBucket.prune deletes by updated_at on the auth request path
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_rate_limits_updated_at ON rate_limits (updated_at)')
+
+
+MIGRATIONS = [
+    (1, 'initial schema', _initial_schema),
+    (2, 'indexes for model and controller queries', _query_indexes),
+    (3, 'skill_stats progress rollup', _skill_stats),
+    (4, 'per-user change counters', _user_versions),
+    (5, 'daily_activity calendar rollup', _daily_activity),
+    (6, 'session index usable for (session_date, id) keyset pages', _session_keyset_index),
+    (7, 'shared token buckets for auth rate limiting', _rate_limits),
+    (8, 'mark subtopics as user-written or suggested', _subtopic_source),
+    (9, 'index for pruning idle rate-limit buckets', _rate_limit_prune_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+@contextmanager
+def _migration_lock(conn):
+    """Exclusive lock on ``<database>-migrate.lock`` for the duration of the block"""
+    path = conn.execute('PRAGMA database_list').fetchone()[2]
+    if fcntl is None or not path:
+        yield
+        return
+    with open(f'{path}-migrate.lock', 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def migrate(conn):
+    """Apply every pending migration; returns the list of versions applied"""
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        return []
+
+    applied = []
+    with _migration_lock(conn):
+        for version, description, apply in MIGRATIONS:
+            # another process may have applied it while we waited for the lock
+            if get_schema_version(conn) >= version:
+                continue
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if get_schema_version(conn) < version:
+                    apply(conn.cursor())
+                    conn.execute(f'PRAGMA user_version = {version}')
+                    applied.append(version)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    return applied
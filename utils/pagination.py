@@ -0,0 +1,74 @@
+import base64
+import json
+import math
+from datetime import datetime, timedelta
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values):
+    """Opaque cursor for the last row of a page, e.g. (created_at, id)"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Inverse of encode_cursor; raises ValueError for anything malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    # floats too: a session_date stored as a number is a valid sort key
+    if not all(value is None or isinstance(value, (str, int))
+               or (isinstance(value, float) and math.isfinite(value)) for value in values):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def parse_page_args(args, columns):
+    """Parse ``limit`` / ``cursor`` / ``from`` / ``to`` query arguments.
+
+    ``columns`` is the number of values in the keyset cursor. Dates are
+    inclusive 'YYYY-MM-DD' days; ``to`` is returned as the (exclusive) next
+    day so it compares correctly against full timestamps. Raises ValueError
+    with a message fit for a 400 response.
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+
+    cursor = args.get('cursor')
+    after = decode_cursor(cursor, columns) if cursor else None
+
+    try:
+        date_from = datetime.strptime(args['from'], '%Y-%m-%d').date() if args.get('from') else None
+        date_to = datetime.strptime(args['to'], '%Y-%m-%d').date() if args.get('to') else None
+    except ValueError:
+        raise ValueError('Dates must be formatted as YYYY-MM-DD')
+    if date_from and date_to and date_from > date_to:
+        raise ValueError('"from" must not be after "to"')
+
+    return {
+        'limit': limit,
+        'after': after,
+        'date_from': date_from.isoformat() if date_from else None,
+        'date_before': (date_to + timedelta(days=1)).isoformat() if date_to else None
+    }
+
+
+def page_response(rows, limit, key):
+    """Trim the look-ahead row fetched past ``limit`` and build the page body"""
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    return {
+        'items': items,
+        'next_cursor': encode_cursor(key(items[-1])) if has_more else None,
+        'limit': limit
+    }
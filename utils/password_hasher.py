@@ -0,0 +1,85 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.helpers import check_password, hash_password
+
+HASH_WORKERS = int(os.environ.get('SKILLSTACK_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+HASH_QUEUE_DEPTH = int(os.environ.get('SKILLSTACK_HASH_QUEUE_DEPTH', HASH_WORKERS * 4))
+
+
+class HasherBusy(Exception):
+    """Raised instead of queueing when the password executor is saturated"""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool with a bounded backlog.
+
+    At most ``workers`` hashes run at once and at most ``queue_depth`` more
+    wait for a thread; any request beyond that gets HasherBusy straight
+    away instead of piling up behind a login storm. bcrypt releases the GIL
+    while it works, so other request threads keep being served meanwhile.
+    The pool is created lazily and again after a fork (threads do not
+    survive one), which keeps it safe with a preloading server.
+    """
+
+    def __init__(self, workers=HASH_WORKERS, queue_depth=HASH_QUEUE_DEPTH):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self.completed = 0
+        self.rejected = 0
+
+    def hash(self, password):
+        return self._run(hash_password, password)
+
+    def check(self, password, hashed):
+        return self._run(check_password, password, hashed)
+
+    def _run(self, fn, *args):
+        executor, slots = self._get_executor()
+        if not slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HasherBusy()
+
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: self._done(slots))
+        return future.result()
+
+    def _done(self, slots):
+        slots.release()
+        with self._lock:
+            self.completed += 1
+
+    def _get_executor(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hash')
+                    self._slots = threading.BoundedSemaphore(self.workers + self.queue_depth)
+                    self._pid = pid
+        return self._executor, self._slots
+
+    def stats(self):
+        capacity = self.workers + self.queue_depth
+        in_flight = capacity - self._slots._value if self._slots else 0
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_depth': self.queue_depth,
+                'in_flight': in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,119 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import jsonify, request
+
+from models.rate_limit import RateLimitBucket
+
+# requests per minute (also the burst size); 0 disables a limiter
+AUTH_IP_PER_MINUTE = int(os.environ.get('SKILLSTACK_AUTH_IP_PER_MINUTE', 30))
+AUTH_USERNAME_PER_MINUTE = int(os.environ.get('SKILLSTACK_AUTH_USERNAME_PER_MINUTE', 10))
+# 'memory' keeps buckets per worker process, 'sqlite' shares them across workers
+RATE_LIMIT_BACKEND = os.environ.get('SKILLSTACK_RATE_LIMIT_BACKEND', 'memory')
+
+
+class TokenBucketLimiter:
+    """Token-bucket rate limiter keyed by an arbitrary string (IP, username).
+
+    Every key gets ``burst`` tokens refilled at ``rate`` tokens per second;
+    a hit takes one token or is rejected. With the 'memory' backend buckets
+    live in this process (least recently used ones are dropped beyond
+    ``max_keys``); with 'sqlite' they live in the rate_limits table so the
+    limit holds across workers, at the cost of one small write per hit.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, name, per_minute, backend=RATE_LIMIT_BACKEND, max_keys=100_000):
+        self.name = name
+        self.burst = per_minute
+        self.rate = per_minute / 60
+        self.backend = backend
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self):
+        return self.burst > 0
+
+    def hit(self, key):
+        """Take a token for ``key``; returns 0 if allowed, else seconds to wait"""
+        if not self.enabled:
+            return 0
+
+        now = time.time()
+        if self.backend == 'sqlite':
+            allowed, tokens = RateLimitBucket.take(f'{self.name}:{key}', self.rate, self.burst, now)
+        else:
+            allowed, tokens = self._take(key, now)
+
+        with self._lock:
+            if allowed:
+                self.allowed += 1
+            else:
+                self.rejected += 1
+            prune = self.backend == 'sqlite' and (self.allowed + self.rejected) % self.PRUNE_EVERY == 0
+
+        if prune:
+            RateLimitBucket.prune(now - self.burst / self.rate)
+        return 0 if allowed else max(1, math.ceil((1 - tokens) / self.rate))
+
+    def _take(self, key, now):
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, tokens
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': self.backend,
+                'per_minute': self.burst,
+                'allowed': self.allowed,
+                'rejected': self.rejected
+            }
+
+
+ip_limiter = TokenBucketLimiter('ip', AUTH_IP_PER_MINUTE)
+username_limiter = TokenBucketLimiter('username', AUTH_USERNAME_PER_MINUTE)
+
+
+def throttle_auth(view):
+    """Reject over-limit auth requests with 429 before any DB or bcrypt work.
+
+    The client IP is checked first, then the username in the JSON body, so
+    a flood from one address does not also drain its victims' buckets.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        retry_after = ip_limiter.hit(request.remote_addr or 'unknown')
+        if not retry_after:
+            data = request.get_json(silent=True)
+            username = data.get('username') if isinstance(data, dict) else None
+            if isinstance(username, str) and username:
+                retry_after = username_limiter.hit(username.lower())
+
+        if retry_after:
+            response = jsonify({'error': 'Too many attempts, please try again later'})
+            response.headers['Retry-After'] = str(retry_after)
+            return response, 429
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def rate_limit_stats():
+    return {'ip': ip_limiter.stats(), 'username': username_limiter.stats()}
@@ -0,0 +1,191 @@
+"""Opt-in slow-query log for the pooled connections (utils.database).
+
+Set ``SKILLSTACK_SLOW_QUERY_MS`` to enable it. Every statement is then
+aggregated by its normalized SQL (calls, total and worst time, including
+the time spent fetching its rows), and any single execution slower than
+the threshold is logged to the ``skillstack.slow_query`` logger with the
+types of its parameters, the endpoint, the model or controller line that
+issued it and its ``EXPLAIN QUERY PLAN``, captured once per distinct
+statement. ``slow_query_log.report()`` ranks statements by total time; it
+is served at /api/metrics/slow-queries.
+"""
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+from flask import has_request_context, request
+
+logger = logging.getLogger('skillstack.slow_query')
+
+SLOW_QUERY_MS = float(os.environ.get('SKILLSTACK_SLOW_QUERY_MS', 0))
+# distinct statements tracked; the least recently seen is dropped beyond this
+MAX_STATEMENTS = 500
+TOP_N = 20
+
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CALLER_DIRS = tuple(os.path.join(_BASE_DIR, d) + os.sep for d in ('models', 'controllers', 'commands', 'routes'))
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+_NAMED = re.compile(r':(\w+)')
+_PLANNED = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+
+
+def normalize(sql):
+    """One line, literals as ``?`` and ``IN (?, ?, ...)`` lists of any length folded"""
+    sql = _LITERAL.sub('?', ' '.join(sql.split()))
+    return _PLACEHOLDER_LIST.sub('?, ...', sql)
+
+
+def parameter_shape(parameters, many=False):
+    """Types of the bound values, never the values themselves"""
+    if many:
+        return 'executemany'
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{k}: {type(v).__name__}' for k, v in parameters.items()) + '}'
+    return '(' + ', '.join(type(v).__name__ for v in parameters) + ')'
+
+
+def _caller():
+    """file:line of the innermost models/controllers/commands/routes frame"""
+    frame = sys._getframe(3)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_CALLER_DIRS):
+            return f'{os.path.relpath(filename, _BASE_DIR)}:{frame.f_lineno} {frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+
+def _explain(conn, sql):
+    """Plan lines, bound with NULLs (as benchmarks/check_query_plans does)"""
+    if not sql.lstrip().upper().startswith(_PLANNED):
+        return []
+    names = _NAMED.findall(sql)
+    params = dict.fromkeys(names) if names else (None,) * sql.count('?')
+    try:
+        # the base class method: not timed, not fed back into this log
+        rows = sqlite3.Connection.execute(conn, f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+    except sqlite3.Error as e:
+        return [f'(no plan: {e})']
+    return [row[3] for row in rows]
+
+
+def _full_scans(plan):
+    derived = {m.group(1) for d in plan for m in [re.match(r'(?:MATERIALIZE|CO-ROUTINE) (\S+)', d)] if m}
+    return [d for d in plan
+            if d.startswith('SCAN ') and 'USING' not in d and d.split()[1] not in derived]
+
+
+class _Statement:
+    __slots__ = ('sql', 'calls', 'total', 'worst', 'slow', 'plan', 'endpoints')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.slow = 0
+        self.plan = None
+        self.endpoints = set()
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms=SLOW_QUERY_MS, max_statements=MAX_STATEMENTS):
+        self.threshold = threshold_ms / 1000
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._statements = OrderedDict()
+        self._normalized = {}
+
+    @property
+    def enabled(self):
+        return self.threshold > 0
+
+    def configure(self, threshold_ms):
+        self.threshold = threshold_ms / 1000
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+
+    def observe(self, cursor, seconds, sql=None, parameters=None, many=False):
+        """Add ``seconds`` to the statement ``cursor`` runs (``sql`` starts a new one)"""
+        if sql is not None:
+            key = self._normalized.get(sql)
+            if key is None:
+                if len(self._normalized) > 4 * self.max_statements:
+                    self._normalized.clear()
+                key = self._normalized[sql] = normalize(sql)
+            with self._lock:
+                stmt = self._statements.get(key)
+                if stmt is None:
+                    stmt = self._statements[key] = _Statement(key)
+                    if len(self._statements) > self.max_statements:
+                        self._statements.popitem(last=False)
+                else:
+                    self._statements.move_to_end(key)
+                stmt.calls += 1
+            cursor.slow_query_state = [stmt, 0.0, sql, parameters, many, False]
+        state = getattr(cursor, 'slow_query_state', None)
+        if state is None:
+            return
+
+        stmt = state[0]
+        state[1] += seconds
+        with self._lock:
+            stmt.total += seconds
+            if state[1] > stmt.worst:
+                stmt.worst = state[1]
+        if state[1] >= self.threshold and not state[5]:
+            state[5] = True
+            self._log_slow(cursor.connection, stmt, state)
+
+    def _log_slow(self, conn, stmt, state):
+        _, elapsed, sql, parameters, many, _ = state
+        endpoint = (request.endpoint or 'unmatched') if has_request_context() else '-'
+        if stmt.plan is None:
+            stmt.plan = _explain(conn, sql)
+        with self._lock:
+            stmt.slow += 1
+            stmt.endpoints.add(endpoint)
+        logger.warning('slow query %s', json.dumps({
+            'ms': round(elapsed * 1000, 2),
+            'endpoint': endpoint,
+            'caller': _caller(),
+            'sql': stmt.sql,
+            'params': parameter_shape(parameters, many),
+            'plan': stmt.plan,
+            'full_scans': _full_scans(stmt.plan),
+        }))
+
+    def report(self, top=TOP_N):
+        """The ``top`` statements by total time"""
+        with self._lock:
+            ranked = sorted(self._statements.values(), key=lambda s: -s.total)[:top]
+            return [{
+                'sql': s.sql,
+                'calls': s.calls,
+                'total_ms': round(s.total * 1000, 2),
+                'avg_ms': round(s.total * 1000 / s.calls, 3) if s.calls else 0.0,
+                'max_ms': round(s.worst * 1000, 2),
+                'slow_calls': s.slow,
+                'endpoints': sorted(s.endpoints),
+                'plan': s.plan,
+                'full_scans': _full_scans(s.plan) if s.plan else None,
+            } for s in ranked]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'threshold_ms': self.threshold * 1000,
+                'statements': len(self._statements),
+                'slow_calls': sum(s.slow for s in self._statements.values()),
+            }
+
+
+slow_query_log = SlowQueryLog()
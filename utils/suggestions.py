@@ -0,0 +1,183 @@
+"""Subtopic suggestions learned from the curricula users have written.
+
+``build_index`` (run offline through ``flask suggestions build``) scans the
+user-written subtopics once and keeps, for every skill-name token and every
+category, only the ``top`` titles most often used with it, together with
+where in a curriculum they typically sit. The result is a small JSON file
+that each worker loads once; a lookup touches only the entries for the
+tokens of one skill name, so its cost does not depend on how many skills
+the index was built from.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import current_app, has_app_context
+
+from utils.database import BASE_DIR
+from utils.helpers import suggest_subtopics as fallback_subtopics
+
+INDEX_FORMAT = 1
+DEFAULT_INDEX_PATH = os.environ.get(
+    'SKILLSTACK_SUGGESTIONS_PATH', os.path.join(BASE_DIR, 'subtopic_suggestions.json')
+)
+SUGGESTION_LIMIT = 8
+
+logger = logging.getLogger('skillstack.suggestions')
+
+_TOKEN = re.compile(r'[a-z0-9+#]+')
+# words that say nothing about what a course covers
+_STOPWORDS = {
+    'a', 'an', 'and', 'the', 'of', 'for', 'to', 'in', 'on', 'with', 'from', 'by', 'my',
+    'course', 'class', 'tutorial', 'bootcamp', 'guide', 'complete', 'ultimate', 'learn',
+    'learning', 'intro', 'introduction', 'basics', 'beginner', 'beginners', 'advanced',
+    'intermediate', 'fundamentals', 'masterclass', 'zero', 'hero', 'part', 'vol', '101',
+}
+
+
+def name_tokens(name):
+    """Normalized, de-duplicated tokens of a skill name"""
+    return list(dict.fromkeys(t for t in _TOKEN.findall((name or '').lower()) if t not in _STOPWORDS))
+
+
+def _title_key(title):
+    return ' '.join(title.split()).lower()
+
+
+def build_index(curricula, top=20, min_users=3):
+    """Aggregate (skill_row, titles) pairs into the index structure.
+
+    A title is kept for a token or category only once ``min_users``
+    different users have used it there, so nobody's private notes are ever
+    suggested to someone else.
+    """
+    # (scope, key) -> title key -> [users, position sum, uses]
+    stats = defaultdict(lambda: defaultdict(lambda: [set(), 0.0, 0]))
+    # scope/key -> number of skills seen, for turning counts into shares
+    skills_seen = Counter()
+    spellings = defaultdict(Counter)
+    total = 0
+
+    for skill, titles in curricula:
+        total += 1
+        scopes = [('tokens', t) for t in name_tokens(skill['name'])]
+        if skill['category']:
+            scopes.append(('categories', skill['category']))
+        last = max(len(titles) - 1, 1)
+
+        for scope in scopes:
+            skills_seen[scope] += 1
+        for position, title in enumerate(titles):
+            key = _title_key(title)
+            if not key:
+                continue
+            spellings[key][' '.join(title.split())] += 1
+            for scope in scopes:
+                entry = stats[scope][key]
+                entry[0].add(skill['user_id'])
+                entry[1] += position / last
+                entry[2] += 1
+
+    index = {'format': INDEX_FORMAT, 'built_at': int(time.time()), 'skills': total,
+             'tokens': {}, 'categories': {}}
+    for (scope, key), titles in stats.items():
+        kept = [
+            (title, len(users), pos_sum / uses)
+            for title, (users, pos_sum, uses) in titles.items()
+            if len(users) >= min_users
+        ]
+        kept.sort(key=lambda item: -item[1])
+        if kept:
+            seen = skills_seen[(scope, key)]
+            index[scope][key] = [
+                [spellings[title].most_common(1)[0][0], round(users / seen, 4), round(position, 3)]
+                for title, users, position in kept[:top]
+            ]
+    return index
+
+
+class SuggestionIndex:
+    """Read-only view over a built index"""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.tokens = data.get('tokens', {})
+        self.categories = data.get('categories', {})
+        self.skills = data.get('skills', 0)
+
+    def suggest(self, skill_name, category, limit=SUGGESTION_LIMIT):
+        """Titles ranked by how often they go with the name's tokens, in curriculum order.
+
+        Falls back to the category's entries, then to the built-in lists.
+        """
+        scores = {}
+        positions = {}
+        for entries in (self.tokens.get(t) for t in name_tokens(skill_name)):
+            for title, share, position in entries or ():
+                scores[title] = scores.get(title, 0) + share
+                positions.setdefault(title, position)
+
+        if len(scores) < limit:
+            for title, share, position in self.categories.get(category, ()):
+                if title not in scores:
+                    # category-wide titles rank below anything name-specific
+                    scores[title] = share / 10
+                    positions[title] = position
+
+        if not scores:
+            return fallback_subtopics(skill_name, category)
+
+        best = sorted(scores, key=lambda title: -scores[title])[:limit]
+        return sorted(best, key=lambda title: positions[title])
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index_path():
+    if has_app_context():
+        return current_app.config.get('SUGGESTIONS_INDEX', DEFAULT_INDEX_PATH)
+    return DEFAULT_INDEX_PATH
+
+
+def get_index():
+    """The index at the configured path, loaded once per process (empty if not built yet)"""
+    path = get_index_path()
+    index = _indexes.get(path)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(path)
+            if index is None:
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        data = json.load(f)
+                except FileNotFoundError:
+                    data = None
+                except (OSError, ValueError) as e:
+                    # unreadable or corrupt: serve the fallback rather than fail every request
+                    logger.warning('ignoring suggestion index %s: %s', path, e)
+                    data = None
+                if data is not None and not (isinstance(data, dict) and data.get('format') == INDEX_FORMAT):
+                    logger.warning('ignoring suggestion index %s: not a format %d index', path, INDEX_FORMAT)
+                    data = None
+                index = _indexes[path] = SuggestionIndex(data)
+    return index
+
+
+def write_index(index, path):
+    """Write atomically, so workers never load a half-written file"""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(tmp, path)
+    with _indexes_lock:
+        _indexes.pop(path, None)
+
+
+def suggest_subtopics(skill_name, category, limit=SUGGESTION_LIMIT):
+    return get_index().suggest(skill_name, category, limit)